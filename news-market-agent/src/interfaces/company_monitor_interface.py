@@ -3,11 +3,16 @@ Company Monitor Interface - Connects to company data sources to monitor specific
 """
 import requests
 import logging
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import List, Dict, Any, Optional, Tuple, Callable
 from datetime import datetime, timedelta
 import os
 from dotenv import load_dotenv
 
+from ..storage.company_reference import CompanyReference, get_company_reference
+from ..storage.news_store import CompanyNewsStore
+
 load_dotenv()
 
 logger = logging.getLogger(__name__)
@@ -18,14 +23,39 @@ class CompanyMonitorInterface:
     # For demo purposes, we'll mock the API endpoints
     BASE_URL = "https://api.companymonitor.io/v1"
     
-    def __init__(self, api_key: Optional[str] = None):
+    # Fields available from get_companies_bulk
+    BULK_FIELDS = ("profile", "financials", "news", "insider_trading", "competitors")
+    DEFAULT_BULK_FIELDS = ("profile", "financials", "news")
+    
+    def __init__(self, api_key: Optional[str] = None, reference: Optional[CompanyReference] = None,
+                 bulk_endpoint: bool = True, bulk_batch_size: int = 25, max_workers: int = 8,
+                 news_scorer: Optional[Callable[[List[str]], List[Dict[str, Any]]]] = None):
         """
         Initialize the Company Monitor interface
         
         Args:
             api_key: Optional API key (defaults to env variable)
+            reference: Optional company reference table (defaults to the shared one)
+            bulk_endpoint: Whether the backend has a batch endpoint for company data
+            bulk_batch_size: Maximum number of tickers per batch request
+            max_workers: Maximum number of requests sent in parallel
+            news_scorer: Optional batch sentiment function for company news
+                         (e.g. BatchSentimentAnalyzer.analyze_batch)
         """
         self.api_key = api_key or os.getenv('COMPANY_MONITOR_API_KEY', 'demo_api_key')
+        self.bulk_endpoint = bulk_endpoint
+        self.bulk_batch_size = max(1, bulk_batch_size)
+        self.max_workers = max(1, max_workers)
+        self.reference = reference or get_company_reference()
+        self.peer_graph = self.reference.peer_graph
+        
+        # Articles listed for several tickers are kept once and shared
+        self.news_store = CompanyNewsStore(scorer=news_scorer)
+        
+        # Demo data caches: generated competitors for tickers without listed
+        # ones, and comparative metrics per (ticker, competitor) pair
+        self._generated_competitors: Dict[str, List[str]] = {}
+        self._pair_metrics: Dict[Tuple[str, str], Dict[str, float]] = {}
         self.headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
@@ -42,16 +72,7 @@ class CompanyMonitorInterface:
             Dictionary with company profile data
         """
         try:
-            # Simulated API call
-            # response = requests.get(
-            #     f"{self.BASE_URL}/company/{ticker}/profile",
-            #     headers=self.headers
-            # )
-            # response.raise_for_status()
-            # return response.json()
-            
-            # Mock data for demo
-            return self._get_mock_company_profile(ticker)
+            return self._request_company_profile(ticker)
         except Exception as e:
             logger.error(f"Error retrieving company profile for {ticker}: {e}")
             return {}
@@ -68,17 +89,7 @@ class CompanyMonitorInterface:
             List of news articles about the company
         """
         try:
-            # Simulated API call
-            # response = requests.get(
-            #     f"{self.BASE_URL}/company/{ticker}/news",
-            #     params={"days": days},
-            #     headers=self.headers
-            # )
-            # response.raise_for_status()
-            # return response.json()
-            
-            # Mock data for demo
-            return self._get_mock_company_news(ticker, days)
+            return self._request_company_news(ticker, days)
         except Exception as e:
             logger.error(f"Error retrieving company news for {ticker}: {e}")
             return []
@@ -94,16 +105,7 @@ class CompanyMonitorInterface:
             Dictionary with financial metrics
         """
         try:
-            # Simulated API call
-            # response = requests.get(
-            #     f"{self.BASE_URL}/company/{ticker}/financials",
-            #     headers=self.headers
-            # )
-            # response.raise_for_status()
-            # return response.json()
-            
-            # Mock data for demo
-            return self._get_mock_financial_metrics(ticker)
+            return self._request_financial_metrics(ticker)
         except Exception as e:
             logger.error(f"Error retrieving financial metrics for {ticker}: {e}")
             return {}
@@ -120,17 +122,7 @@ class CompanyMonitorInterface:
             List of insider trading activities
         """
         try:
-            # Simulated API call
-            # response = requests.get(
-            #     f"{self.BASE_URL}/company/{ticker}/insider-trading",
-            #     params={"months": months},
-            #     headers=self.headers
-            # )
-            # response.raise_for_status()
-            # return response.json()
-            
-            # Mock data for demo
-            return self._get_mock_insider_trading(ticker, months)
+            return self._request_insider_trading(ticker, months)
         except Exception as e:
             logger.error(f"Error retrieving insider trading for {ticker}: {e}")
             return []
@@ -146,118 +138,259 @@ class CompanyMonitorInterface:
             Dictionary with competitor data
         """
         try:
-            # Simulated API call
-            # response = requests.get(
-            #     f"{self.BASE_URL}/company/{ticker}/competitors",
-            #     headers=self.headers
-            # )
-            # response.raise_for_status()
-            # return response.json()
-            
-            # Mock data for demo
-            return self._get_mock_competitors(ticker)
+            return self._request_competitors(ticker)
         except Exception as e:
             logger.error(f"Error retrieving competitors for {ticker}: {e}")
             return {}
     
-    def _get_mock_company_profile(self, ticker: str) -> Dict[str, Any]:
-        """Generate mock company profile data for demo purposes"""
-        # Company profiles based on common tech tickers
-        company_profiles = {
-            "AAPL": {
-                "name": "Apple Inc.",
-                "sector": "Technology",
-                "industry": "Consumer Electronics",
-                "description": "Apple designs, manufactures, and markets smartphones, personal computers, tablets, wearables, and accessories, and sells a variety of related services.",
-                "ceo": "Tim Cook",
-                "employees": 161000,
-                "founded": 1976,
-                "headquarters": "Cupertino, California",
-                "website": "https://www.apple.com"
-            },
-            "MSFT": {
-                "name": "Microsoft Corporation",
-                "sector": "Technology",
-                "industry": "Software—Infrastructure",
-                "description": "Microsoft develops, licenses, and supports software, services, devices, and solutions worldwide.",
-                "ceo": "Satya Nadella",
-                "employees": 221000,
-                "founded": 1975,
-                "headquarters": "Redmond, Washington",
-                "website": "https://www.microsoft.com"
-            },
-            "GOOGL": {
-                "name": "Alphabet Inc.",
-                "sector": "Technology",
-                "industry": "Internet Content & Information",
-                "description": "Alphabet provides web-based search, advertisements, maps, software applications, mobile operating systems, consumer content, enterprise solutions, commerce, and hardware products.",
-                "ceo": "Sundar Pichai",
-                "employees": 190234,
-                "founded": 1998,
-                "headquarters": "Mountain View, California",
-                "website": "https://www.abc.xyz"
-            },
-            "AMZN": {
-                "name": "Amazon.com, Inc.",
-                "sector": "Consumer Cyclical",
-                "industry": "Internet Retail",
-                "description": "Amazon engages in the retail sale of consumer products and subscriptions in North America and internationally.",
-                "ceo": "Andy Jassy",
-                "employees": 1540000,
-                "founded": 1994,
-                "headquarters": "Seattle, Washington",
-                "website": "https://www.amazon.com"
-            },
-            "META": {
-                "name": "Meta Platforms, Inc.",
-                "sector": "Technology",
-                "industry": "Internet Content & Information",
-                "description": "Meta builds technologies that help people connect, find communities, and grow businesses.",
-                "ceo": "Mark Zuckerberg",
-                "employees": 77805,
-                "founded": 2004,
-                "headquarters": "Menlo Park, California",
-                "website": "https://about.meta.com"
-            }
-        }
+    def get_companies_bulk(self, tickers: List[str], fields: Optional[List[str]] = None,
+                           news_days: int = 3, insider_months: int = 3) -> Dict[str, Dict[str, Any]]:
+        """
+        Get several kinds of data for several companies at once
         
-        # Default profile for tickers not in our mock database
-        default_profile = {
-            "name": f"{ticker} Corporation",
-            "sector": "Unknown",
-            "industry": "Unknown",
-            "description": f"A company trading under the ticker {ticker}.",
-            "ceo": "Unknown",
-            "employees": 0,
-            "founded": 0,
-            "headquarters": "Unknown",
-            "website": f"https://www.{ticker.lower()}.com"
-        }
+        Tickers are requested in batches of bulk_batch_size from the batch
+        endpoint, asking only for the requested fields. The tickers of a
+        failed batch are fetched from the per-company endpoints concurrently,
+        and if the backend answers that it has no batch endpoint (HTTP 404 or
+        405), later calls go straight to the per-company endpoints. A field
+        that could not be retrieved is left out of its ticker's dictionary,
+        so failures can be told apart from empty results.
         
-        # Get the profile or default
-        profile = company_profiles.get(ticker.upper(), default_profile).copy()
+        Args:
+            tickers: Company stock ticker symbols
+            fields: Data to include, from BULK_FIELDS (defaults to DEFAULT_BULK_FIELDS)
+            news_days: Number of days of news to retrieve
+            insider_months: Number of months of insider trading data to retrieve
+            
+        Returns:
+            Dictionary mapping tickers to dictionaries with the requested fields
+        """
+        fields = list(dict.fromkeys(fields or self.DEFAULT_BULK_FIELDS))
+        unknown = [field for field in fields if field not in self.BULK_FIELDS]
+        if unknown:
+            logger.warning(f"Ignoring unknown company data fields: {unknown}")
+            fields = [field for field in fields if field in self.BULK_FIELDS]
+        
+        tickers = list(dict.fromkeys(tickers))
+        if not tickers or not fields:
+            return {ticker: {} for ticker in tickers}
+        
+        params = {"news_days": news_days, "insider_months": insider_months}
+        
+        if not self.bulk_endpoint:
+            return self._fetch_companies_concurrently(tickers, fields, params)
+        
+        batches = [tickers[i:i + self.bulk_batch_size]
+                   for i in range(0, len(tickers), self.bulk_batch_size)]
+        
+        def fetch(batch: List[str]) -> Tuple[List[str], Optional[Dict[str, Dict[str, Any]]]]:
+            try:
+                return batch, self._fetch_companies_batch(batch, fields, params)
+            except Exception as e:
+                if self._is_unsupported(e):
+                    logger.warning(f"Batch company endpoint unavailable ({e}); using per-company requests")
+                    self.bulk_endpoint = False
+                else:
+                    logger.warning(f"Batch company request failed ({e}); retrying its tickers one by one")
+                return batch, None
+        
+        result = {}
+        failed = []
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(batches))) as executor:
+            for batch, batch_result in executor.map(fetch, batches):
+                if batch_result is None:
+                    failed.extend(batch)
+                    continue
+                for ticker in batch:
+                    data = batch_result.get(ticker, {})
+                    if "news" in data:
+                        data["news"] = self.news_store.add(ticker, data["news"])
+                    result[ticker] = data
+        
+        if failed:
+            result.update(self._fetch_companies_concurrently(failed, fields, params))
+        return {ticker: result.get(ticker, {}) for ticker in tickers}
+    
+    def get_peers(self, ticker: str, hops: int = 1) -> Dict[str, int]:
+        """
+        Get companies within a number of competitor relationships of a company
         
-        # Add additional fields
-        profile.update({
-            "ticker": ticker.upper(),
-            "exchange": "NASDAQ",
+        Args:
+            ticker: Company stock ticker symbol
+            hops: Maximum number of competitor relationships to follow
+            
+        Returns:
+            Dictionary mapping peer tickers to their distance in hops, closest first
+        """
+        return self.peer_graph.peers(ticker, hops)
+    
+    def _request_company_profile(self, ticker: str) -> Dict[str, Any]:
+        """Request a company profile; raises on failure"""
+        # Simulated API call
+        # response = requests.get(
+        #     f"{self.BASE_URL}/company/{ticker}/profile",
+        #     headers=self.headers
+        # )
+        # response.raise_for_status()
+        # return response.json()
+        
+        # Mock data for demo
+        return self._get_mock_company_profile(ticker)
+    
+    def _request_company_news(self, ticker: str, days: int) -> List[Dict[str, Any]]:
+        """Request recent company news and store it; raises on failure"""
+        # Simulated API call
+        # response = requests.get(
+        #     f"{self.BASE_URL}/company/{ticker}/news",
+        #     params={"days": days},
+        #     headers=self.headers
+        # )
+        # response.raise_for_status()
+        # articles = response.json()
+        
+        # Mock data for demo
+        articles = self._get_mock_company_news(ticker, days)
+        
+        return self.news_store.add(ticker, articles)
+    
+    def _request_financial_metrics(self, ticker: str) -> Dict[str, Any]:
+        """Request financial metrics; raises on failure"""
+        # Simulated API call
+        # response = requests.get(
+        #     f"{self.BASE_URL}/company/{ticker}/financials",
+        #     headers=self.headers
+        # )
+        # response.raise_for_status()
+        # return response.json()
+        
+        # Mock data for demo
+        return self._get_mock_financial_metrics(ticker)
+    
+    def _request_insider_trading(self, ticker: str, months: int) -> List[Dict[str, Any]]:
+        """Request insider trading activity; raises on failure"""
+        # Simulated API call
+        # response = requests.get(
+        #     f"{self.BASE_URL}/company/{ticker}/insider-trading",
+        #     params={"months": months},
+        #     headers=self.headers
+        # )
+        # response.raise_for_status()
+        # return response.json()
+        
+        # Mock data for demo
+        return self._get_mock_insider_trading(ticker, months)
+    
+    def _request_competitors(self, ticker: str) -> Dict[str, Any]:
+        """Request competitor information; raises on failure"""
+        # Simulated API call
+        # response = requests.get(
+        #     f"{self.BASE_URL}/company/{ticker}/competitors",
+        #     headers=self.headers
+        # )
+        # response.raise_for_status()
+        # return response.json()
+        
+        # Mock data for demo
+        return self._get_mock_competitors(ticker)
+    
+    def _fetch_companies_batch(self, tickers: List[str], fields: List[str],
+                               params: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """
+        Send one batch request for company data
+        
+        Raises on failure so the caller can fall back to per-company requests.
+        
+        Returns:
+            Dictionary mapping tickers to their requested fields
+        """
+        # Simulated API call
+        # response = requests.post(
+        #     f"{self.BASE_URL}/companies/bulk",
+        #     json={"tickers": tickers, "fields": fields, **params},
+        #     headers=self.headers
+        # )
+        # response.raise_for_status()
+        # return response.json()["companies"]
+        
+        # Mock data for demo
+        return self._get_mock_companies_bulk(tickers, fields, params)
+    
+    def _fetch_companies_concurrently(self, tickers: List[str], fields: List[str],
+                                      params: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Get company data through the per-company endpoints, in parallel, leaving out failed fields"""
+        requesters = self._field_requesters(params)
+        requests_to_send = [(ticker, field) for ticker in tickers for field in fields]
+        
+        def fetch(request: Tuple[str, str]) -> Tuple[bool, Any]:
+            ticker, field = request
+            try:
+                return True, requesters[field](ticker)
+            except Exception as e:
+                logger.error(f"Error retrieving {field} for {ticker}: {e}")
+                return False, None
+        
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(requests_to_send))) as executor:
+            values = executor.map(fetch, requests_to_send)
+            
+            result = {ticker: {} for ticker in tickers}
+            for (ticker, field), (succeeded, value) in zip(requests_to_send, values):
+                if succeeded:
+                    result[ticker][field] = value
+        
+        return result
+    
+    def _field_requesters(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Map bulk fields to the per-company requests that retrieve them (raising on failure)"""
+        return {
+            "profile": self._request_company_profile,
+            "financials": self._request_financial_metrics,
+            "news": partial(self._request_company_news, days=params["news_days"]),
+            "insider_trading": partial(self._request_insider_trading, months=params["insider_months"]),
+            "competitors": self._request_competitors
+        }
+    
+    @staticmethod
+    def _is_unsupported(error: Exception) -> bool:
+        """Check whether a batch request failed because the backend has no batch endpoint"""
+        response = getattr(error, "response", None)
+        return isinstance(error, requests.HTTPError) and response is not None and response.status_code in (404, 405)
+    
+    def _get_mock_companies_bulk(self, tickers: List[str], fields: List[str],
+                                 params: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Generate mock batch company data for demo purposes"""
+        generators = {
+            "profile": self._get_mock_company_profile,
+            "financials": self._get_mock_financial_metrics,
+            "news": lambda ticker: self._get_mock_company_news(ticker, params["news_days"]),
+            "insider_trading": lambda ticker: self._get_mock_insider_trading(ticker, params["insider_months"]),
+            "competitors": self._get_mock_competitors
+        }
+        return {ticker: {field: generators[field](ticker) for field in fields} for ticker in tickers}
+    
+    def _get_mock_company_profile(self, ticker: str) -> Dict[str, Any]:
+        """Generate mock company profile data for demo purposes"""
+        record = self.reference.get(ticker)
+        
+        return {
+            **record["profile"],
+            "ticker": record["ticker"],
+            "exchange": record["exchange"],
             "market_cap": self._get_mock_market_cap(ticker),
-            "pe_ratio": round(20 + (sum(ord(c) for c in ticker) % 30), 2),
-            "dividend_yield": round((sum(ord(c) for c in ticker) % 35) / 10, 2),
+            "pe_ratio": round(20 + (self.reference.seed(ticker) % 30), 2),
+            "dividend_yield": round((self.reference.seed(ticker) % 35) / 10, 2),
             "source": "company_monitor",
             "last_updated": datetime.now().isoformat()
-        })
-        
-        return profile
+        }
     
     def _get_mock_market_cap(self, ticker: str) -> Dict[str, Any]:
         """Generate mock market cap data for demo purposes"""
         # Generate a consistent market cap based on ticker
-        ticker_seed = sum(ord(c) for c in ticker)
+        record = self.reference.get(ticker)
+        ticker_seed = self.reference.seed(ticker)
         base_value = 10 + (ticker_seed % 990)  # 10-1000 billion
         
         value_billions = base_value
-        if ticker.upper() in ["AAPL", "MSFT", "GOOGL", "AMZN", "META"]:
+        if record["mega_cap"]:
             # For big tech, use higher values
             value_billions = 1000 + (ticker_seed % 2000)
         
@@ -271,8 +404,9 @@ class CompanyMonitorInterface:
     
     def _get_mock_company_news(self, ticker: str, days: int) -> List[Dict[str, Any]]:
         """Generate mock company news data for demo purposes"""
-        company_name = self._get_mock_company_profile(ticker)["name"]
-        ticker_seed = sum(ord(c) for c in ticker)
+        record = self.reference.get(ticker)
+        company_name = record["profile"]["name"]
+        ticker_seed = self.reference.seed(ticker)
         
         news_templates = [
             "{company} Reports Strong Q{quarter} Earnings, Exceeding Analyst Expectations",
@@ -290,6 +424,8 @@ class CompanyMonitorInterface:
         partners = ["Microsoft", "Google", "Amazon", "IBM", "Oracle", "Salesforce"]
         startups = ["TechFusion", "DataNova", "AIWorks", "CloudPeak", "QuantumSoft", "NexGen"]
         
+        related_tickers = self._get_mock_related_tickers(ticker, 3)
+        
         news_items = []
         for i in range(min(days, len(news_templates))):
             template_index = (ticker_seed + i) % len(news_templates)
@@ -321,7 +457,7 @@ class CompanyMonitorInterface:
                     "score": round(((ticker_seed + i) % 20 - 10) / 10, 1),  # -1.0 to 1.0
                     "label": "positive" if (ticker_seed + i) % 3 != 0 else "negative"
                 },
-                "related_tickers": self._get_mock_related_tickers(ticker, 3),
+                "related_tickers": list(related_tickers),
                 "source": "company_monitor"
             })
         
@@ -329,14 +465,15 @@ class CompanyMonitorInterface:
     
     def _get_mock_financial_metrics(self, ticker: str) -> Dict[str, Any]:
         """Generate mock financial metrics data for demo purposes"""
-        ticker_seed = sum(ord(c) for c in ticker)
+        record = self.reference.get(ticker)
+        ticker_seed = self.reference.seed(ticker)
         
         # Generate semi-realistic financial data based on ticker seed
         revenue_base = 10 + (ticker_seed % 90)  # 10-100 billion
         profit_margin = 10 + (ticker_seed % 30)  # 10-40%
         
         # Higher revenue for big tech
-        if ticker.upper() in ["AAPL", "MSFT", "GOOGL", "AMZN", "META"]:
+        if record["mega_cap"]:
             revenue_base = 100 + (ticker_seed % 300)  # 100-400 billion
         
         return {
@@ -380,11 +517,11 @@ class CompanyMonitorInterface:
     
     def _get_mock_insider_trading(self, ticker: str, months: int) -> List[Dict[str, Any]]:
         """Generate mock insider trading data for demo purposes"""
-        ticker_seed = sum(ord(c) for c in ticker)
-        company = self._get_mock_company_profile(ticker)
+        record = self.reference.get(ticker)
+        ticker_seed = self.reference.seed(ticker)
         
         # Generate insider names based on company
-        ceo_name = company.get("ceo", "CEO")
+        ceo_name = record["profile"].get("ceo", "CEO")
         insiders = [
             ceo_name,
             f"Jane Smith, CFO",
@@ -398,25 +535,31 @@ class CompanyMonitorInterface:
         # Transaction types and their probabilities
         transaction_types = ["Buy", "Sell", "Sell"]  # Sell is more common
         
+        # Trades fall on a fixed 10-day grid (offset per ticker), so the same
+        # trade keeps its date, details and ID from one day's call to the next
+        anchor = datetime(2024, 1, 1) + timedelta(days=ticker_seed % 10)
+        latest_slot = (datetime.now() - anchor).days // 10
+        
         activities = []
         for i in range(min(months * 3, 12)):  # 3 activities per month, max 12
-            insider_index = (ticker_seed + i) % len(insiders)
+            slot = latest_slot - i
+            insider_index = (ticker_seed + slot) % len(insiders)
             insider = insiders[insider_index]
             
             # Transaction type
-            tx_type_index = (ticker_seed + i) % len(transaction_types)
+            tx_type_index = (ticker_seed + slot) % len(transaction_types)
             tx_type = transaction_types[tx_type_index]
             
-            # Generate a date within the specified range
-            date = (datetime.now() - timedelta(days=i*10)).isoformat()
+            # Date of the trade's grid slot
+            date = (anchor + timedelta(days=slot * 10)).isoformat()
             
             # Transaction details
-            shares = (ticker_seed + i*100) % 10000 + 1000  # 1000-11000 shares
+            shares = (ticker_seed + slot*100) % 10000 + 1000  # 1000-11000 shares
             price = round(50 + (ticker_seed % 950), 2)  # $50-$1000 per share
             value = round(shares * price, 2)
             
             activities.append({
-                "id": f"insider-{ticker}-{i}",
+                "id": f"insider-{record['ticker']}-{date[:10]}",  # Stable across calls, like real filing IDs
                 "date": date,
                 "insider_name": insider,
                 "title": insider.split(", ")[1] if ", " in insider else "Unknown",
@@ -424,7 +567,7 @@ class CompanyMonitorInterface:
                 "shares": shares,
                 "price_per_share": price,
                 "total_value": value,
-                "shares_owned_after": (ticker_seed + i*1000) % 100000 + 10000,  # 10k-110k shares
+                "shares_owned_after": (ticker_seed + slot*1000) % 100000 + 10000,  # 10k-110k shares
                 "form_type": "Form 4",
                 "source": "company_monitor"
             })
@@ -433,40 +576,18 @@ class CompanyMonitorInterface:
     
     def _get_mock_competitors(self, ticker: str) -> Dict[str, Any]:
         """Generate mock competitor data for demo purposes"""
-        # Define competitor relationships for common tickers
-        competitor_map = {
-            "AAPL": ["MSFT", "GOOGL", "SSNLF", "HPQ"],
-            "MSFT": ["AAPL", "GOOGL", "ORCL", "IBM"],
-            "GOOGL": ["MSFT", "META", "AAPL", "AMZN"],
-            "AMZN": ["WMT", "EBAY", "TGT", "BABA"],
-            "META": ["SNAP", "GOOGL", "TWTR", "PINS"]
-        }
-        
-        # Get competitors for the ticker
         ticker_upper = ticker.upper()
-        competitors = competitor_map.get(ticker_upper, [])
-        
-        # If no predefined competitors, generate some
-        if not competitors:
-            ticker_seed = sum(ord(c) for c in ticker)
-            all_tickers = list(competitor_map.keys())
-            
-            # Select random tickers as competitors
-            for i in range(3):
-                idx = (ticker_seed + i) % len(all_tickers)
-                competitor = all_tickers[idx]
-                if competitor != ticker_upper and competitor not in competitors:
-                    competitors.append(competitor)
+        competitors = self._get_competitor_tickers(ticker)
         
         # Generate competitor details
         competitor_details = []
         for comp_ticker in competitors:
-            profile = self._get_mock_company_profile(comp_ticker)
+            profile = self.reference.profile(comp_ticker)
             
             competitor_details.append({
                 "ticker": comp_ticker,
                 "name": profile["name"],
-                "market_cap_billions": profile["market_cap"]["value_billions"],
+                "market_cap_billions": self._get_mock_market_cap(comp_ticker)["value_billions"],
                 "sector": profile["sector"],
                 "industry": profile["industry"]
             })
@@ -482,7 +603,7 @@ class CompanyMonitorInterface:
     
     def _get_mock_market_share(self, ticker: str, competitors: List[str]) -> Dict[str, float]:
         """Generate mock market share data for demo purposes"""
-        ticker_seed = sum(ord(c) for c in ticker)
+        ticker_seed = self.reference.seed(ticker)
         
         # Assign market shares
         market_shares = {ticker.upper(): 20 + (ticker_seed % 30)}  # 20-50%
@@ -504,7 +625,7 @@ class CompanyMonitorInterface:
     
     def _get_mock_comparative_metrics(self, ticker: str, competitors: List[str]) -> Dict[str, Dict[str, float]]:
         """Generate mock comparative metrics data for demo purposes"""
-        ticker_seed = sum(ord(c) for c in ticker)
+        ticker_seed = self.reference.seed(ticker)
         
         metrics = {
             "revenue_growth": {},
@@ -520,17 +641,49 @@ class CompanyMonitorInterface:
         metrics["price_to_sales"][ticker.upper()] = round(2 + (ticker_seed % 8), 1)  # 2-10
         
         # Generate metrics for competitors
-        for i, comp in enumerate(competitors):
-            comp_seed = ticker_seed + sum(ord(c) for c in comp)
-            
-            metrics["revenue_growth"][comp] = round(5 + (comp_seed % 25), 1)  # 5-30%
-            metrics["profit_margin"][comp] = round(10 + (comp_seed % 30), 1)  # 10-40%
-            metrics["pe_ratio"][comp] = round(15 + (comp_seed % 35), 1)  # 15-50
-            metrics["price_to_sales"][comp] = round(2 + (comp_seed % 8), 1)  # 2-10
+        for comp in competitors:
+            for name, value in self._get_mock_pair_metrics(ticker, comp).items():
+                metrics[name][comp] = value
         
         return metrics
     
+    def _get_mock_pair_metrics(self, ticker: str, competitor: str) -> Dict[str, float]:
+        """Generate (once) mock metrics for a competitor as compared against a ticker"""
+        key = (ticker.upper(), competitor.upper())
+        pair_metrics = self._pair_metrics.get(key)
+        if pair_metrics is None:
+            comp_seed = self.reference.seed(ticker) + self.reference.seed(competitor)
+            pair_metrics = self._pair_metrics[key] = {
+                "revenue_growth": round(5 + (comp_seed % 25), 1),  # 5-30%
+                "profit_margin": round(10 + (comp_seed % 30), 1),  # 10-40%
+                "pe_ratio": round(15 + (comp_seed % 35), 1),  # 15-50
+                "price_to_sales": round(2 + (comp_seed % 8), 1)  # 2-10
+            }
+        return pair_metrics
+    
     def _get_mock_related_tickers(self, ticker: str, count: int) -> List[str]:
         """Generate mock related tickers for demo purposes"""
-        related = self._get_mock_competitors(ticker)["competitors"]
-        return [comp["ticker"] for comp in related[:count]]
+        return self._get_competitor_tickers(ticker)[:count]
+    
+    def _get_competitor_tickers(self, ticker: str) -> List[str]:
+        """Get a ticker's listed competitors, or generated ones if it has none"""
+        competitors = self.peer_graph.competitors(ticker)
+        if competitors:
+            return competitors
+        
+        ticker_upper = ticker.upper()
+        generated = self._generated_competitors.get(ticker_upper)
+        if generated is None:
+            ticker_seed = self.reference.seed(ticker)
+            all_tickers = self.reference.tickers
+            
+            # Select pseudo-random listed tickers as competitors
+            generated = []
+            for i in range(3):
+                idx = (ticker_seed + i) % len(all_tickers)
+                competitor = all_tickers[idx]
+                if competitor != ticker_upper and competitor not in generated:
+                    generated.append(competitor)
+            self._generated_competitors[ticker_upper] = generated
+        
+        return list(generated)
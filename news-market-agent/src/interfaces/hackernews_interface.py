@@ -3,7 +3,9 @@ HackerNews Interface - Connects to HackerNews API to retrieve tech news stories
 """
 import requests
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator
+
+from ..utils.keyword_matcher import get_matcher
 
 logger = logging.getLogger(__name__)
 
@@ -69,17 +71,23 @@ class HackerNewsInterface:
         Returns:
             List of story details
         """
-        story_ids = self.get_top_story_ids()
-        stories = []
+        return list(self.iter_top_stories(filter_keywords))
+        
+    def iter_top_stories(self, filter_keywords: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yield top stories from HackerNews as each one is retrieved
+        
+        Args:
+            filter_keywords: Optional list of keywords to filter stories by
+        
+        Yields:
+            Story details, in top story order
+        """
+        matcher = get_matcher(filter_keywords)
         
-        for story_id in story_ids:
+        for story_id in self.get_top_story_ids():
             story = self.get_story_details(story_id)
             if story:
                 # Apply keyword filtering if provided
-                if filter_keywords:
-                    if any(keyword.lower() in story['title'].lower() for keyword in filter_keywords):
-                        stories.append(story)
-                else:
-                    stories.append(story)
-                    
-        return stories
+                if matcher is None or matcher.matches(story['title']):
+                    yield story
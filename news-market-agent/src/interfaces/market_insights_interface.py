@@ -3,12 +3,24 @@ Market Insights Interface - Connects to Market Insights data source for market t
 """
 import requests
 import logging
+import copy
 import json
-from typing import List, Dict, Any, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import List, Dict, Any, Optional, Callable, Tuple
 from datetime import datetime, timedelta
 import os
 from dotenv import load_dotenv
 
+# Local imports
+from ..utils.items import item_key
+from ..utils.annotations import annotate
+from ..storage.quote_buffer import QuoteRingBuffer
+from ..storage.company_reference import get_company_reference
+from .quote_stream import QuoteStream
+
 load_dotenv()
 
 logger = logging.getLogger(__name__)
@@ -18,19 +30,63 @@ class MarketInsightsInterface:
     
     # For demo purposes, we'll mock the API endpoints
     BASE_URL = "https://api.marketinsights.io/v1"
+    STREAM_URL = "https://stream.marketinsights.io/v1/quotes"
+    
+    # How long each dataset stays fresh, in seconds. Economic indicators only
+    # change when a new figure is published, so they follow the release calendar.
+    FRESHNESS_TIERS = {
+        "market_summary": 15,
+        "stock_data": 60,
+        "sector_performance": 300,
+        "economic_indicators": "release_calendar"
+    }
+    
+    # Day of month on which the monthly indicators are published
+    # (jobs report, CPI, retail sales, GDP/PCE) and the release time
+    INDICATOR_RELEASE_DAYS = [5, 12, 15, 26]
+    INDICATOR_RELEASE_TIME = (8, 30)
+    
+    # Fields of a news item used by the impact model; everything else
+    # (expanded content, related articles, entities) stays local
+    IMPACT_FIELDS = ("title", "url", "source", "score", "timestamp")
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, freshness: Optional[Dict[str, Any]] = None,
+                 background_refresh: bool = False, impact_chunk_size: int = 50,
+                 max_workers: int = 4):
         """
         Initialize the Market Insights interface
         
         Args:
             api_key: Optional API key (defaults to env variable)
+            freshness: Optional overrides for FRESHNESS_TIERS (seconds or "release_calendar")
+            background_refresh: Refresh cached datasets in a background thread before they expire
+            impact_chunk_size: Maximum number of news items per news impact request
+            max_workers: Maximum number of news impact requests sent in parallel
         """
         self.api_key = api_key or os.getenv('MARKET_INSIGHTS_API_KEY', 'demo_api_key')
         self.headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
+        
+        self.freshness = {**self.FRESHNESS_TIERS, **(freshness or {})}
+        self.impact_chunk_size = max(1, impact_chunk_size)
+        self.max_workers = max(1, max_workers)
+        
+        # Cache entries: key -> (expires_at, tier, fetch function, value, stored_at)
+        self._cache: Dict[str, Tuple[float, str, Callable[[], Any], Any, float]] = {}
+        # Last time each cached key was read
+        self._last_read: Dict[str, float] = {}
+        self._cache_lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._refresh_stop = threading.Event()
+        
+        # Live quotes, populated once a quote stream is started
+        self.quotes: Optional[QuoteRingBuffer] = None
+        self._quote_stream: Optional[QuoteStream] = None
+        
+        if background_refresh:
+            self.start_background_refresh()
     
     def get_market_summary(self) -> Dict[str, Any]:
         """
@@ -40,16 +96,7 @@ class MarketInsightsInterface:
             Dictionary with market summary data
         """
         try:
-            # Simulated API call
-            # response = requests.get(
-            #     f"{self.BASE_URL}/market/summary",
-            #     headers=self.headers
-            # )
-            # response.raise_for_status()
-            # return response.json()
-            
-            # Mock data for demo
-            return self._get_mock_market_summary()
+            return self._get_fresh("market_summary", "market_summary", self._fetch_market_summary)
         except Exception as e:
             logger.error(f"Error retrieving market summary: {e}")
             return {}
@@ -66,17 +113,8 @@ class MarketInsightsInterface:
             Dictionary mapping symbols to their historical data
         """
         try:
-            # Simulated API call
-            # response = requests.get(
-            #     f"{self.BASE_URL}/stocks/historical",
-            #     params={"symbols": ",".join(symbols), "days": days},
-            #     headers=self.headers
-            # )
-            # response.raise_for_status()
-            # return response.json()
-            
-            # Mock data for demo
-            return self._get_mock_stock_data(symbols, days)
+            key = f"stock_data:{','.join(symbols)}:{days}"
+            return self._get_fresh(key, "stock_data", lambda: self._fetch_stock_data(symbols, days))
         except Exception as e:
             logger.error(f"Error retrieving stock data for {symbols}: {e}")
             return {symbol: [] for symbol in symbols}
@@ -89,16 +127,7 @@ class MarketInsightsInterface:
             List of sector performance data
         """
         try:
-            # Simulated API call
-            # response = requests.get(
-            #     f"{self.BASE_URL}/market/sectors",
-            #     headers=self.headers
-            # )
-            # response.raise_for_status()
-            # return response.json()
-            
-            # Mock data for demo
-            return self._get_mock_sector_performance()
+            return self._get_fresh("sector_performance", "sector_performance", self._fetch_sector_performance)
         except Exception as e:
             logger.error(f"Error retrieving sector performance: {e}")
             return []
@@ -111,16 +140,7 @@ class MarketInsightsInterface:
             Dictionary with economic indicator data
         """
         try:
-            # Simulated API call
-            # response = requests.get(
-            #     f"{self.BASE_URL}/economy/indicators",
-            #     headers=self.headers
-            # )
-            # response.raise_for_status()
-            # return response.json()
-            
-            # Mock data for demo
-            return self._get_mock_economic_indicators()
+            return self._get_fresh("economic_indicators", "economic_indicators", self._fetch_economic_indicators)
         except Exception as e:
             logger.error(f"Error retrieving economic indicators: {e}")
             return {}
@@ -129,6 +149,9 @@ class MarketInsightsInterface:
         """
         Analyze the potential market impact of news items
         
+        Only the fields in IMPACT_FIELDS are sent. Items are sent in chunks of
+        impact_chunk_size, in parallel, and the results are joined back by item key.
+        
         Args:
             news_items: List of news items to analyze
             
@@ -136,21 +159,301 @@ class MarketInsightsInterface:
             List of news items with added market impact analysis
         """
         try:
-            # In a real implementation, this would send the news items to the API
-            # and get back impact analysis
+            keys = [item_key(item, i) for i, item in enumerate(news_items)]
+            payload = [self._project_for_impact(key, item) for key, item in zip(keys, news_items)]
+            chunks = [payload[i:i + self.impact_chunk_size]
+                      for i in range(0, len(payload), self.impact_chunk_size)]
+            
+            impacts = {}
+            if len(chunks) > 1 and self.max_workers > 1:
+                with ThreadPoolExecutor(max_workers=min(self.max_workers, len(chunks))) as executor:
+                    for chunk_result in executor.map(self._analyze_impact_chunk, chunks):
+                        impacts.update(chunk_result)
+            else:
+                for chunk in chunks:
+                    impacts.update(self._analyze_impact_chunk(chunk))
+            
+            # Join the analysis back as an overlay on the original items
+            return [annotate(item, market_impact=impacts[key]) if key in impacts else item
+                    for key, item in zip(keys, news_items)]
+        except Exception as e:
+            logger.error(f"Error analyzing news impact: {e}")
+            return news_items  # Return original items without analysis
+    
+    def _project_for_impact(self, key: str, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Reduce a news item to the fields used by the impact model"""
+        projected = {field: item[field] for field in self.IMPACT_FIELDS if field in item}
+        projected["id"] = key
+        return projected
+    
+    def _analyze_impact_chunk(self, chunk: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Send one chunk of projected news items for impact analysis
+        
+        Returns:
+            Dictionary mapping item keys to their market impact analysis
+        """
+        try:
+            # In a real implementation, this would send the chunk to the API
+            # and get back impact analysis for each item ID
             # response = requests.post(
             #     f"{self.BASE_URL}/analysis/news-impact",
-            #     json={"news_items": news_items},
+            #     json={"news_items": chunk},
             #     headers=self.headers
             # )
             # response.raise_for_status()
-            # return response.json()
+            # results = response.json()
             
             # Mock data for demo
-            return self._get_mock_news_impact(news_items)
+            results = self._get_mock_news_impact(chunk)
+            
+            return {result["id"]: result["market_impact"] for result in results}
         except Exception as e:
-            logger.error(f"Error analyzing news impact: {e}")
-            return news_items  # Return original items without analysis
+            logger.error(f"Error analyzing news impact for a chunk of {len(chunk)} items: {e}")
+            return {}
+    
+    def start_quote_stream(self, symbols: List[str], capacity: int = 4096,
+                           url: Optional[str] = None) -> QuoteRingBuffer:
+        """
+        Start ingesting live quotes for symbols into ring buffers
+        
+        Args:
+            symbols: Symbols to subscribe to
+            capacity: Number of most recent ticks kept per symbol
+            url: Quote feed URL (defaults to MARKET_INSIGHTS_STREAM_URL or STREAM_URL);
+                 point this at a QuoteReplayServer to replay recorded quotes
+            
+        Returns:
+            The ring buffer the quotes are written to
+        """
+        self.stop_quote_stream()
+        
+        self.quotes = QuoteRingBuffer(symbols, capacity=capacity)
+        # Bound to this buffer, so a previous stream still winding down can't write to it
+        self._quote_stream = QuoteStream(
+            url or os.getenv('MARKET_INSIGHTS_STREAM_URL', self.STREAM_URL),
+            symbols,
+            partial(self._on_quote, self.quotes),
+            headers={"Authorization": self.headers["Authorization"]}
+        )
+        self._quote_stream.start()
+        return self.quotes
+    
+    def stop_quote_stream(self) -> None:
+        """Stop ingesting live quotes (buffered ticks are kept)"""
+        if self._quote_stream:
+            self._quote_stream.stop()
+            self._quote_stream = None
+    
+    def get_latest_quote(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the most recent streamed quote for a symbol
+        
+        Args:
+            symbol: Stock symbol
+            
+        Returns:
+            Dictionary with price, size and timestamp, or None if no quote was received
+        """
+        return self.quotes.latest(symbol) if self.quotes else None
+    
+    def get_quote_window(self, symbol: str, ticks: Optional[int] = None,
+                         seconds: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Aggregate the most recent streamed quotes for a symbol
+        
+        Args:
+            symbol: Stock symbol
+            ticks: Number of most recent ticks to include
+            seconds: Include ticks within this many seconds of the latest tick
+            
+        Returns:
+            Dictionary with mean price, VWAP, volume and price change, or None if no quote was received
+        """
+        return self.quotes.window(symbol, ticks=ticks, seconds=seconds) if self.quotes else None
+    
+    def _on_quote(self, buffer: QuoteRingBuffer, quote: Dict[str, Any]) -> None:
+        """Store a quote received from the stream in the stream's buffer"""
+        buffer.append(
+            quote['symbol'],
+            float(quote['price']),
+            float(quote.get('size', 0)),
+            float(quote.get('timestamp') or time.time())
+        )
+    
+    def start_background_refresh(self, interval: float = 5.0) -> None:
+        """
+        Start a background thread that refreshes cached datasets before they expire
+        
+        Args:
+            interval: Seconds between checks for entries that are about to expire
+        """
+        if self._refresh_thread and self._refresh_thread.is_alive():
+            return
+        
+        self._refresh_stop.clear()
+        self._refresh_thread = threading.Thread(
+            target=self._refresh_loop,
+            args=(interval,),
+            name="market-insights-refresh",
+            daemon=True
+        )
+        self._refresh_thread.start()
+        logger.info("Started background refresh of market data")
+    
+    def stop_background_refresh(self) -> None:
+        """Stop the background refresh thread"""
+        self._refresh_stop.set()
+        if self._refresh_thread:
+            self._refresh_thread.join()
+            self._refresh_thread = None
+    
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """
+        Drop cached data so the next call fetches it again
+        
+        Args:
+            key: Cache key to drop (e.g. "market_summary"); drops everything if omitted
+        """
+        with self._cache_lock:
+            if key is None:
+                self._cache.clear()
+                self._last_read.clear()
+            else:
+                self._cache.pop(key, None)
+                self._last_read.pop(key, None)
+    
+    def _get_fresh(self, key: str, tier: str, fetch: Callable[[], Any]) -> Any:
+        """Return a copy of cached data for key while it is fresh, otherwise fetch and cache it"""
+        now = time.time()
+        with self._cache_lock:
+            entry = self._cache.get(key)
+        
+        if entry and entry[0] > now:
+            value = entry[3]
+        else:
+            value = fetch()
+            self._store(key, tier, fetch, value)
+        
+        # Stamped after storing, so the read that fetched the value counts as a read of it
+        with self._cache_lock:
+            self._last_read[key] = time.time()
+        
+        # Callers annotate the returned data, so they must not share the cached object
+        return copy.deepcopy(value)
+    
+    def _store(self, key: str, tier: str, fetch: Callable[[], Any], value: Any) -> None:
+        """Cache a fetched value until its tier expires"""
+        now = time.time()
+        expires_at = self._get_expiry(tier, now)
+        with self._cache_lock:
+            self._cache[key] = (expires_at, tier, fetch, value, now)
+    
+    def _get_expiry(self, tier: str, now: float) -> float:
+        """Get the expiry timestamp for data fetched now in the given freshness tier"""
+        ttl = self.freshness.get(tier, 0)
+        if ttl == "release_calendar":
+            return self._next_indicator_release(datetime.fromtimestamp(now)).timestamp()
+        return now + float(ttl)
+    
+    def _next_indicator_release(self, now: datetime) -> datetime:
+        """Get the next scheduled economic indicator release after now"""
+        hour, minute = self.INDICATOR_RELEASE_TIME
+        month_start = now.replace(day=1, hour=hour, minute=minute, second=0, microsecond=0)
+        
+        # Check this month's releases, then next month's
+        for month_offset in range(2):
+            year = month_start.year + (month_start.month - 1 + month_offset) // 12
+            month = (month_start.month - 1 + month_offset) % 12 + 1
+            for day in sorted(self.INDICATOR_RELEASE_DAYS):
+                release = month_start.replace(year=year, month=month, day=day)
+                if release > now:
+                    return release
+        
+        # Not reachable with a non-empty calendar; fall back to one day
+        return now + timedelta(days=1)
+    
+    def _refresh_loop(self, interval: float) -> None:
+        """
+        Refresh entries that will expire before the next check
+        
+        Only entries read since they were last stored are refreshed; the
+        others are evicted once they expire, so keys nobody asks for anymore
+        (e.g. one-off stock_data symbol lists) stop being fetched.
+        """
+        while not self._refresh_stop.wait(interval):
+            now = time.time()
+            horizon = now + interval
+            due = []
+            with self._cache_lock:
+                for key, (expires_at, tier, fetch, _, stored_at) in list(self._cache.items()):
+                    if expires_at > horizon:
+                        continue
+                    if self._last_read.get(key, 0) >= stored_at:
+                        due.append((key, tier, fetch))
+                    elif expires_at <= now:
+                        del self._cache[key]
+                        self._last_read.pop(key, None)
+            
+            for key, tier, fetch in due:
+                try:
+                    self._store(key, tier, fetch, fetch())
+                except Exception as e:
+                    # Keep serving the previous value; the next call will retry
+                    logger.warning(f"Background refresh failed for {key}: {e}")
+    
+    def _fetch_market_summary(self) -> Dict[str, Any]:
+        """Fetch the market summary from the API"""
+        # Simulated API call
+        # response = requests.get(
+        #     f"{self.BASE_URL}/market/summary",
+        #     headers=self.headers
+        # )
+        # response.raise_for_status()
+        # return response.json()
+        
+        # Mock data for demo
+        return self._get_mock_market_summary()
+    
+    def _fetch_stock_data(self, symbols: List[str], days: int) -> Dict[str, List[Dict[str, Any]]]:
+        """Fetch historical stock data from the API"""
+        # Simulated API call
+        # response = requests.get(
+        #     f"{self.BASE_URL}/stocks/historical",
+        #     params={"symbols": ",".join(symbols), "days": days},
+        #     headers=self.headers
+        # )
+        # response.raise_for_status()
+        # return response.json()
+        
+        # Mock data for demo
+        return self._get_mock_stock_data(symbols, days)
+    
+    def _fetch_sector_performance(self) -> List[Dict[str, Any]]:
+        """Fetch sector performance from the API"""
+        # Simulated API call
+        # response = requests.get(
+        #     f"{self.BASE_URL}/market/sectors",
+        #     headers=self.headers
+        # )
+        # response.raise_for_status()
+        # return response.json()
+        
+        # Mock data for demo
+        return self._get_mock_sector_performance()
+    
+    def _fetch_economic_indicators(self) -> Dict[str, Any]:
+        """Fetch economic indicators from the API"""
+        # Simulated API call
+        # response = requests.get(
+        #     f"{self.BASE_URL}/economy/indicators",
+        #     headers=self.headers
+        # )
+        # response.raise_for_status()
+        # return response.json()
+        
+        # Mock data for demo
+        return self._get_mock_economic_indicators()
     
     def _get_mock_market_summary(self) -> Dict[str, Any]:
         """Generate mock market summary data for demo purposes"""
@@ -203,7 +506,7 @@ class MarketInsightsInterface:
         for symbol in symbols:
             # Generate somewhat realistic price data based on the symbol
             # This ensures the mock data is consistent for the same symbol
-            symbol_seed = sum(ord(c) for c in symbol)
+            symbol_seed = get_company_reference().seed(symbol)
             base_price = 100 + (symbol_seed % 900)  # Base price between 100 and 1000
             volatility = (symbol_seed % 10) / 100  # Volatility between 0.01 and 0.09
             
@@ -316,7 +619,7 @@ class MarketInsightsInterface:
         }
     
     def _get_mock_news_impact(self, news_items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Generate mock news impact analysis for demo purposes"""
+        """Generate mock news impact analysis, keyed by projected item ID, for demo purposes"""
         result = []
         
         impact_types = ["high", "medium", "low", "negligible"]
@@ -326,10 +629,10 @@ class MarketInsightsInterface:
         ]
         directions = ["positive", "negative", "mixed", "neutral"]
         
-        for i, item in enumerate(news_items):
+        for item in news_items:
             # Generate somewhat consistent impact analysis based on the news title
             title = item.get('title', '')
-            title_seed = sum(ord(c) for c in title) if title else i
+            title_seed = sum(ord(c) for c in title) if title else sum(ord(c) for c in item['id'])
             
             # Determine impact level
             impact_index = title_seed % len(impact_types)
@@ -344,9 +647,8 @@ class MarketInsightsInterface:
             direction_index = (title_seed // 2) % len(directions)
             direction = directions[direction_index]
             
-            # Add impact analysis to the news item
-            item_with_analysis = item.copy()
-            item_with_analysis.update({
+            result.append({
+                "id": item['id'],
                 "market_impact": {
                     "impact_level": impact_level,
                     "direction": direction,
@@ -355,7 +657,5 @@ class MarketInsightsInterface:
                     "timeframe": "short-term" if title_seed % 3 == 0 else "long-term"
                 }
             })
-            
-            result.append(item_with_analysis)
         
         return result
@@ -0,0 +1,215 @@
+"""
+Quote Stream - Consumes a live quote feed delivered as Server-Sent Events
+"""
+import logging
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlencode, urlparse, parse_qs
+from urllib.request import Request, urlopen
+from typing import List, Dict, Any, Optional, Callable
+
+logger = logging.getLogger(__name__)
+
+class QuoteStream:
+    """
+    Background consumer for an SSE quote feed
+    
+    Each event's data is a JSON quote ({"symbol", "price", "size", "timestamp"})
+    or a list of quotes. The consumer reconnects with backoff until stopped.
+    
+    The feed is read line by line with the standard library's HTTP client so
+    each event is handled as soon as its line arrives, rather than when a
+    read buffer fills up.
+    """
+    
+    def __init__(self, url: str, symbols: List[str], on_quote: Callable[[Dict[str, Any]], None],
+                 headers: Optional[Dict[str, str]] = None, max_backoff: float = 30.0,
+                 read_timeout: float = 30.0):
+        """
+        Initialize the quote stream
+        
+        Args:
+            url: SSE endpoint of the quote feed (or of a local replay server)
+            symbols: Symbols to subscribe to
+            on_quote: Called with every quote received
+            headers: Optional request headers (e.g. authorization)
+            max_backoff: Maximum seconds to wait between reconnection attempts
+            read_timeout: Seconds without data (including keep-alives) before reconnecting
+        """
+        self.url = url
+        self.symbols = symbols
+        self.on_quote = on_quote
+        self.headers = {**(headers or {}), "Accept": "text/event-stream"}
+        self.max_backoff = max_backoff
+        self.read_timeout = read_timeout
+        
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self) -> None:
+        """Start consuming the feed in a background thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="quote-stream", daemon=True)
+        self._thread.start()
+        logger.info(f"Started quote stream for {len(self.symbols)} symbols from {self.url}")
+    
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Stop consuming the feed
+        
+        The reader thread exits after the next line or read timeout, and no
+        quote is passed to on_quote once this returns unless the thread is
+        still blocked on a read after timeout seconds (it is a daemon
+        thread, so it never blocks interpreter shutdown).
+        
+        Args:
+            timeout: Maximum seconds to wait for the reader thread to exit
+        """
+        self._stop.set()
+        thread, self._thread = self._thread, None
+        if thread and thread is not threading.current_thread():
+            thread.join(timeout)
+            if thread.is_alive():
+                logger.warning(f"Quote stream reader did not exit within {timeout:.0f}s")
+    
+    def _run(self) -> None:
+        """Connect, read events and reconnect on failure until stopped"""
+        backoff = 1.0
+        separator = "&" if "?" in self.url else "?"
+        request = Request(
+            f"{self.url}{separator}{urlencode({'symbols': ','.join(self.symbols)})}",
+            headers=self.headers
+        )
+        
+        while not self._stop.is_set():
+            try:
+                with urlopen(request, timeout=self.read_timeout) as response:
+                    backoff = 1.0
+                    self._read_events(line.decode("utf-8").rstrip("\r\n") for line in response)
+            except Exception as e:
+                if self._stop.is_set():
+                    break
+                logger.warning(f"Quote stream disconnected: {e}; reconnecting in {backoff:.0f}s")
+            
+            if self._stop.wait(backoff):
+                break
+            backoff = min(backoff * 2, self.max_backoff)
+    
+    def _read_events(self, lines) -> None:
+        """Parse SSE lines and dispatch quotes"""
+        data_lines = []
+        for line in lines:
+            if self._stop.is_set():
+                return
+            
+            if line:
+                # Comments (":") and non-data fields (event, id, retry) are ignored
+                if line.startswith("data:"):
+                    data_lines.append(line[5:].lstrip())
+                continue
+            
+            # A blank line ends the event
+            if data_lines:
+                self._dispatch("\n".join(data_lines))
+                data_lines = []
+    
+    def _dispatch(self, data: str) -> None:
+        """Decode an event payload and pass each quote on"""
+        try:
+            payload = json.loads(data)
+        except ValueError:
+            logger.warning(f"Skipping malformed quote event: {data[:100]}")
+            return
+        
+        for quote in payload if isinstance(payload, list) else [payload]:
+            if self._stop.is_set():
+                return
+            if "symbol" in quote and "price" in quote:
+                self.on_quote(quote)
+
+
+class QuoteReplayServer:
+    """
+    Local SSE server that replays recorded quotes, for development and testing
+    
+    Quotes are read from a newline-delimited JSON file and sent with the same
+    spacing as their timestamps, divided by `speed`.
+    """
+    
+    def __init__(self, path: str, host: str = "127.0.0.1", port: int = 8765, speed: float = 1.0):
+        """
+        Initialize the replay server
+        
+        Args:
+            path: Newline-delimited JSON file of quotes ordered by timestamp
+            host: Host to bind to
+            port: Port to listen on (0 picks a free port)
+            speed: Replay speed multiplier (0 sends everything at once)
+        """
+        with open(path) as f:
+            self.quotes = [json.loads(line) for line in f if line.strip()]
+        self.speed = speed
+        self.stopped = threading.Event()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def url(self) -> str:
+        """URL of the replay feed"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/quotes"
+    
+    def start(self) -> None:
+        """Serve the replay in a background thread"""
+        self._thread = threading.Thread(target=self._server.serve_forever, name="quote-replay", daemon=True)
+        self._thread.start()
+    
+    def stop(self) -> None:
+        """Shut the server down"""
+        self.stopped.set()
+        self._server.shutdown()
+        self._server.server_close()
+    
+    def _make_handler(self):
+        """Build the request handler bound to this server's quotes"""
+        replay = self
+        
+        class ReplayHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                params = parse_qs(urlparse(self.path).query)
+                wanted = set(",".join(params.get("symbols", [])).split(",")) - {""}
+                
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+                
+                previous = None
+                try:
+                    for quote in replay.quotes:
+                        if wanted and quote.get("symbol") not in wanted:
+                            continue
+                        timestamp = quote.get("timestamp", 0)
+                        if previous is not None and replay.speed > 0:
+                            time.sleep(max(0.0, (timestamp - previous) / replay.speed))
+                        previous = timestamp
+                        
+                        self.wfile.write(f"data: {json.dumps(quote)}\n\n".encode())
+                        self.wfile.flush()
+                    
+                    # Keep the connection open so clients don't reconnect and replay again
+                    while not replay.stopped.wait(15):
+                        self.wfile.write(b": keep-alive\n\n")
+                        self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+            
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+        
+        return ReplayHandler
@@ -3,11 +3,13 @@ Reddit Interface - Connects to Reddit API to retrieve news and discussions
 """
 import praw
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator
 from datetime import datetime
 import os
 from dotenv import load_dotenv
 
+from ..utils.keyword_matcher import get_matcher
+
 load_dotenv()
 
 logger = logging.getLogger(__name__)
@@ -92,23 +94,29 @@ class RedditInterface:
         Returns:
             List of post details
         """
-        all_posts = []
+        # Sort by score (descending)
+        return sorted(self.iter_hot_posts(filter_keywords), key=lambda x: x['score'], reverse=True)
+    
+    def iter_hot_posts(self, filter_keywords: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yield hot posts from all monitored subreddits as each subreddit is retrieved
+        
+        Args:
+            filter_keywords: Optional list of keywords to filter posts by
+        
+        Yields:
+            Post details, in subreddit order
+        """
+        matcher = get_matcher(filter_keywords)
         
         for subreddit in self.subreddits:
             posts = self.get_hot_posts(subreddit)
             
             # Apply keyword filtering if provided
-            if filter_keywords:
-                filtered_posts = []
-                for post in posts:
-                    if any(keyword.lower() in post['title'].lower() for keyword in filter_keywords):
-                        filtered_posts.append(post)
-                all_posts.extend(filtered_posts)
+            if matcher:
+                yield from (post for post in posts if matcher.matches(post['title']))
             else:
-                all_posts.extend(posts)
-                
-        # Sort by score (descending)
-        return sorted(all_posts, key=lambda x: x['score'], reverse=True)
+                yield from posts
     
     def search_posts(self, query: str, subreddits: Optional[List[str]] = None, time_filter: str = 'week') -> List[Dict[str, Any]]:
         """
@@ -23,7 +23,9 @@ from interfaces.market_insights_interface import MarketInsightsInterface
 from interfaces.company_monitor_interface import CompanyMonitorInterface
 from processors.news_processor import NewsProcessor
 from processors.market_processor import MarketProcessor
+from processors.watchlist_monitor import WatchlistMonitor
 from reports.report_generator import ReportGenerator
+from storage.mention_index import MentionIndex
 
 # Load environment variables
 load_dotenv()
@@ -59,7 +61,7 @@ class NewsMarketAgent:
         
         # Initialize processors
         self.news_processor = NewsProcessor()
-        self.market_processor = MarketProcessor()
+        self.market_processor = MarketProcessor(sentiment=self.news_processor.sentiment)
         
         # Initialize report generator
         self.report_generator = ReportGenerator(output_dir=output_dir)
@@ -92,14 +94,18 @@ class NewsMarketAgent:
         
         # Step 4: Correlate news with market data
         logger.info("Correlating news with market data")
-        correlation_data = self.market_processor.correlate_news_with_market(enriched_news, market_data)
+        mention_index = MentionIndex(enriched_news)
+        correlation_data = self.market_processor.correlate_news_with_market(
+            enriched_news, market_data, index=mention_index
+        )
         
         # Step 5: Generate daily digest report
         logger.info("Generating report")
         report = self.report_generator.generate_daily_digest(
             news_data=enriched_news,
             market_data=market_data,
-            correlation_data=correlation_data
+            correlation_data=correlation_data,
+            mention_index=mention_index
         )
         
         logger.info(f"Daily digest completed: {report.get('report_id')}")
@@ -160,14 +166,7 @@ class NewsMarketAgent:
         
         # Step 3: Extract news related to the sector
         # This is a simple approach - in a real implementation, we'd use NLP for better extraction
-        related_news = []
-        for item in enriched_news:
-            title = item.get('title', '').lower()
-            content = item.get('content', '').lower()
-            text = title + " " + content
-            
-            if sector.lower() in text:
-                related_news.append(item)
+        related_news = MentionIndex(enriched_news).items_matching(sector)
         
         # Step 4: Generate sector report
         report = self.report_generator.generate_sector_report(
@@ -194,6 +193,34 @@ class NewsMarketAgent:
         while True:
             schedule.run_pending()
             time.sleep(60)
+    
+    def monitor_watchlist(self, tickers: List[str], once: bool = False, tick: float = 30.0) -> None:
+        """
+        Poll company data for a watchlist and record what changes
+        
+        Changes (new news and insider trades, changed profile and financial
+        fields) are appended to data/watchlist_changes.jsonl.
+        
+        Args:
+            tickers: Watchlist tickers
+            once: Poll a single time instead of running until interrupted
+            tick: Seconds between checks for due endpoints
+        """
+        monitor = WatchlistMonitor(self.market_processor.company_monitor, tickers)
+        
+        if once:
+            changes = monitor.poll()
+            logger.info(f"Detected {len(changes)} watchlist changes")
+            return
+        
+        try:
+            monitor.run(tick=tick)
+        except KeyboardInterrupt:
+            logger.info("Watchlist monitor stopped")
+    
+    def close(self) -> None:
+        """Save pending state and release resources"""
+        self.market_processor.close()
 
 def parse_args():
     """Parse command line arguments"""
@@ -223,6 +250,13 @@ def parse_args():
     schedule_parser.add_argument("--minute", type=int, default=0, help="Minute to run")
     schedule_parser.add_argument("--output", default="reports", help="Output directory for reports")
     
+    # Watchlist monitor command
+    watch_parser = subparsers.add_parser("watch", help="Monitor a watchlist for company data changes")
+    watch_parser.add_argument("--tickers", nargs="+", default=[], help="Watchlist tickers")
+    watch_parser.add_argument("--watchlist", help="File with one ticker per line")
+    watch_parser.add_argument("--once", action="store_true", help="Poll once and exit")
+    watch_parser.add_argument("--interval", type=float, default=30.0, help="Seconds between checks for due endpoints")
+    
     return parser.parse_args()
 
 def main():
@@ -233,23 +267,36 @@ def main():
     agent = NewsMarketAgent(output_dir=args.output if hasattr(args, 'output') else 'reports')
     
     # Execute the requested command
-    if args.command == "daily":
-        report = agent.generate_daily_digest(topics=args.topics)
-        print(f"Daily digest generated: {report.get('report_id')}")
-    elif args.command == "company":
-        report = agent.generate_company_analysis(args.ticker)
-        print(f"Company analysis generated: {report.get('report_id')}")
-    elif args.command == "sector":
-        report = agent.generate_sector_analysis(args.sector)
-        print(f"Sector analysis generated: {report.get('report_id')}")
-    elif args.command == "schedule":
-        print(f"Scheduling daily digest at {args.hour:02d}:{args.minute:02d}")
-        agent.schedule_daily_digest(hour=args.hour, minute=args.minute)
-    else:
-        # Default action if no command is provided
-        print("Generating a sample daily digest...")
-        report = agent.generate_daily_digest()
-        print(f"Daily digest generated: {report.get('report_id')}")
+    try:
+        if args.command == "daily":
+            report = agent.generate_daily_digest(topics=args.topics)
+            print(f"Daily digest generated: {report.get('report_id')}")
+        elif args.command == "company":
+            report = agent.generate_company_analysis(args.ticker)
+            print(f"Company analysis generated: {report.get('report_id')}")
+        elif args.command == "sector":
+            report = agent.generate_sector_analysis(args.sector)
+            print(f"Sector analysis generated: {report.get('report_id')}")
+        elif args.command == "schedule":
+            print(f"Scheduling daily digest at {args.hour:02d}:{args.minute:02d}")
+            agent.schedule_daily_digest(hour=args.hour, minute=args.minute)
+        elif args.command == "watch":
+            tickers = list(args.tickers)
+            if args.watchlist:
+                with open(args.watchlist) as f:
+                    tickers.extend(line.strip() for line in f if line.strip() and not line.startswith("#"))
+            if not tickers:
+                print("No tickers to monitor; use --tickers or --watchlist")
+                return
+            print(f"Monitoring {len(tickers)} tickers for changes")
+            agent.monitor_watchlist(tickers, once=args.once, tick=args.interval)
+        else:
+            # Default action if no command is provided
+            print("Generating a sample daily digest...")
+            report = agent.generate_daily_digest()
+            print(f"Daily digest generated: {report.get('report_id')}")
+    finally:
+        agent.close()
 
 if __name__ == "__main__":
     main()
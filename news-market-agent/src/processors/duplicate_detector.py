@@ -0,0 +1,209 @@
+"""
+Duplicate Detector - Groups news items about the same story across sources
+"""
+import logging
+import re
+import zlib
+from typing import List, Dict, Any, Set
+
+import numpy as np
+
+from ..utils.items import canonical_url
+from ..utils.annotations import annotate
+
+logger = logging.getLogger(__name__)
+
+# Words that say nothing about which story an item is about
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have how in into is it its new of on or says said that the their this
+to was were what when why will with after over about up out than amid vs via just now more
+""".split())
+
+# Largest prime below 2^32 keeps (a * x + b) within 64 bits for 32-bit shingle hashes
+_PRIME = np.uint64(4294967291)
+
+
+class _UnionFind:
+    """Disjoint sets over item positions"""
+    
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+    
+    def find(self, i: int) -> int:
+        root = i
+        while self.parent[root] != root:
+            root = self.parent[root]
+        # Path compression
+        while self.parent[i] != root:
+            self.parent[i], i = root, self.parent[i]
+        return root
+    
+    def union(self, i: int, j: int) -> None:
+        root_i, root_j = self.find(i), self.find(j)
+        if root_i != root_j:
+            # The earlier item stays the root, so clusters are keyed by their first member
+            self.parent[max(root_i, root_j)] = min(root_i, root_j)
+
+
+class NearDuplicateDetector:
+    """
+    Clusters near-duplicate news items with MinHash and LSH banding
+    
+    Each item's title and the start of its summary are reduced to a set of
+    content words, and a MinHash signature estimates the Jaccard similarity
+    of those sets. Signatures are split into bands; items sharing a band
+    bucket are candidates, verified against the exact Jaccard similarity,
+    and merged with union-find. Items with the same canonical URL are
+    always merged. Only items landing in the same bucket are compared, so
+    clustering is roughly linear in the number of items rather than
+    quadratic.
+    """
+    
+    def __init__(self, threshold: float = 0.5, num_perm: int = 64, bands: int = 16,
+                 summary_words: int = 30, seed: int = 1):
+        """
+        Initialize the detector
+        
+        Args:
+            threshold: Minimum Jaccard similarity of two items' word sets to be duplicates
+            num_perm: Number of MinHash permutations (must be divisible by bands)
+            bands: Number of LSH bands; more bands find less similar candidates
+            summary_words: Number of leading summary words added to the title
+            seed: Seed of the hash permutations
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.summary_words = summary_words
+        
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 2 ** 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 2 ** 32, size=num_perm, dtype=np.uint64)
+    
+    def cluster(self, items: List[Dict[str, Any]]) -> List[List[int]]:
+        """
+        Group items into story clusters
+        
+        Args:
+            items: News items
+        
+        Returns:
+            Clusters as lists of item positions, each in item order, ordered by first member
+        """
+        shingles = [self.shingles(item) for item in items]
+        sets = _UnionFind(len(items))
+        
+        # Exact duplicates by canonical URL
+        by_url: Dict[str, int] = {}
+        for i, item in enumerate(items):
+            if item.get('url'):
+                url = canonical_url(item['url'])
+                if url in by_url:
+                    sets.union(by_url[url], i)
+                else:
+                    by_url[url] = i
+        
+        # Near duplicates from LSH band buckets
+        signatures = self.signatures(shingles)
+        rows = self.num_perm // self.bands
+        for band in range(self.bands):
+            buckets: Dict[bytes, List[int]] = {}
+            for i, signature in enumerate(signatures):
+                if shingles[i]:
+                    buckets.setdefault(signature[band * rows:(band + 1) * rows].tobytes(), []).append(i)
+            
+            # Each member is compared with one representative per cluster found in
+            # the bucket so far, not with every other member; members already in
+            # the representative's set are skipped
+            for members in buckets.values():
+                representatives: List[int] = []
+                for i in members:
+                    matched = False
+                    for j in representatives:
+                        if sets.find(i) == sets.find(j):
+                            matched = True
+                        elif self.jaccard(shingles[i], shingles[j]) >= self.threshold:
+                            sets.union(i, j)
+                            matched = True
+                    if not matched:
+                        representatives.append(i)
+        
+        clusters: Dict[int, List[int]] = {}
+        for i in range(len(items)):
+            clusters.setdefault(sets.find(i), []).append(i)
+        return list(clusters.values())
+    
+    def collapse(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Keep one representative item per story cluster
+        
+        The first item of each cluster (the highest ranked, when items are
+        sorted) represents it, as an annotated view (the given items are not
+        modified). Its 'duplicates' field lists the source, ID, URL, title
+        and score of the other items, and 'cluster_size' counts all of them.
+        
+        Args:
+            items: News items, best first
+        
+        Returns:
+            Representative items, in item order
+        """
+        representatives = []
+        for members in self.cluster(items):
+            representatives.append(annotate(
+                items[members[0]],
+                cluster_size=len(members),
+                duplicates=[
+                    {key: items[i].get(key) for key in ('source', 'id', 'url', 'title', 'score')}
+                    for i in members[1:]
+                ]
+            ))
+        
+        if len(representatives) < len(items):
+            logger.info(f"Collapsed {len(items)} news items into {len(representatives)} stories")
+        return representatives
+    
+    def shingles(self, item: Dict[str, Any]) -> Set[str]:
+        """Content words of an item's title and the start of its summary"""
+        summary = item.get('summary') or item.get('selftext') or ""
+        words = re.findall(r"[a-z0-9]+", f"{item.get('title') or ''} {summary}".lower())
+        title_words = len(re.findall(r"[a-z0-9]+", (item.get('title') or "").lower()))
+        
+        shingles = set()
+        for word in words[:title_words + self.summary_words]:
+            if word in STOPWORDS or len(word) < 2:
+                continue
+            # Crude plural folding ("shares" and "share" are the same word here)
+            if len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+                word = word[:-1]
+            shingles.add(word)
+        return shingles
+    
+    def signatures(self, shingles: List[Set[str]]) -> np.ndarray:
+        """
+        MinHash signatures of shingle sets
+        
+        Args:
+            shingles: Shingle set per item
+        
+        Returns:
+            Array of shape (items, num_perm); rows of empty sets are all max values
+        """
+        signatures = np.full((len(shingles), self.num_perm), np.iinfo(np.uint64).max, dtype=np.uint64)
+        for i, words in enumerate(shingles):
+            if words:
+                hashes = np.fromiter((zlib.crc32(word.encode("utf-8")) for word in words),
+                                     dtype=np.uint64, count=len(words))
+                permuted = (np.outer(hashes, self._a) + self._b) % _PRIME
+                signatures[i] = permuted.min(axis=0)
+        return signatures
+    
+    @staticmethod
+    def jaccard(first: Set[str], second: Set[str]) -> float:
+        """Jaccard similarity of two sets"""
+        if not first or not second:
+            return 0.0
+        return len(first & second) / len(first | second)
@@ -0,0 +1,215 @@
+"""
+Event Study - Measures abnormal stock returns around news events
+"""
+import logging
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import datetime
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+class EventStudy:
+    """
+    Vectorized event study over a daily price matrix
+    
+    Abnormal returns are daily log returns minus the expected return. The
+    expected return is either the equal-weighted market return
+    ("market_adjusted") or alpha + beta * market return fitted per symbol over
+    the estimation period ("market_model"). Cumulative abnormal returns (CAR)
+    are computed for every event and window at once with a cumulative sum over
+    the abnormal return matrix.
+    """
+    
+    # Event windows in trading days relative to the event day
+    DEFAULT_WINDOWS = {
+        "event_day": (0, 0),
+        "around_event": (-1, 1),
+        "post_event": (0, 5)
+    }
+    
+    def __init__(self, windows: Optional[Dict[str, Tuple[int, int]]] = None,
+                 estimation_days: int = 30, model: str = "market_adjusted"):
+        """
+        Initialize the event study
+        
+        Args:
+            windows: Mapping of window name to (start, end) offsets in trading days
+            estimation_days: Number of leading returns used to estimate the return model
+            model: "market_adjusted" or "market_model"
+        """
+        if model not in ("market_adjusted", "market_model"):
+            raise ValueError(f"Unknown event study model: {model}")
+        
+        self.windows = windows or self.DEFAULT_WINDOWS
+        self.estimation_days = estimation_days
+        self.model = model
+    
+    @property
+    def history_days(self) -> int:
+        """Days of price history needed to cover the estimation period and windows"""
+        max_offset = max(end for _, end in self.windows.values())
+        return self.estimation_days + max_offset + 2
+    
+    def build_price_matrix(self, stock_data: Dict[str, List[Dict[str, Any]]]) -> Tuple[np.ndarray, List[str], np.ndarray]:
+        """
+        Align per-symbol price histories into a single matrix
+        
+        Args:
+            stock_data: Dictionary mapping symbols to daily bars (as returned by get_stock_data)
+        
+        Returns:
+            Tuple of (trading dates as datetime64[D], symbols, close prices with
+            shape (dates, symbols) and NaN where a symbol has no bar)
+        """
+        symbols = [symbol for symbol, bars in stock_data.items() if bars]
+        all_dates = sorted({bar['date'] for symbol in symbols for bar in stock_data[symbol]})
+        dates = np.array(all_dates, dtype='datetime64[D]')
+        
+        prices = np.full((len(dates), len(symbols)), np.nan)
+        for col, symbol in enumerate(symbols):
+            bars = stock_data[symbol]
+            rows = np.searchsorted(dates, np.array([bar['date'] for bar in bars], dtype='datetime64[D]'))
+            prices[rows, col] = [bar['close'] for bar in bars]
+        
+        return dates, symbols, prices
+    
+    def run(self, stock_data: Dict[str, List[Dict[str, Any]]],
+            events: List[Tuple[str, float]],
+            sectors: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        Run the event study
+        
+        Args:
+            stock_data: Dictionary mapping symbols to daily bars
+            events: List of (symbol, unix timestamp) news events
+            sectors: Optional mapping of symbol to sector for sector aggregates
+        
+        Returns:
+            Dictionary with abnormal return statistics by ticker and sector
+        """
+        dates, symbols, prices = self.build_price_matrix(stock_data)
+        result = {
+            "model": self.model,
+            "windows": {name: list(bounds) for name, bounds in self.windows.items()},
+            "events": 0,
+            "by_ticker": {},
+            "by_sector": {},
+            "source": "event_study"
+        }
+        
+        if len(dates) < 2 or not symbols or not events:
+            return result
+        
+        abnormal = self._abnormal_returns(prices)
+        return_dates = dates[1:]
+        
+        # Map events onto (row, column) in the abnormal return matrix
+        column_lookup = {symbol: col for col, symbol in enumerate(symbols)}
+        known = [(symbol, ts) for symbol, ts in events if symbol in column_lookup]
+        if not known:
+            return result
+        
+        event_cols = np.array([column_lookup[symbol] for symbol, _ in known])
+        event_days = np.array([datetime.fromtimestamp(ts).date().isoformat() for _, ts in known],
+                              dtype='datetime64[D]')
+        # News on a non-trading day is priced in on the next trading day
+        event_rows = np.searchsorted(return_dates, event_days, side='left')
+        
+        # Cumulative sums with a leading zero row so CAR(a, b) = C[b + 1] - C[a]
+        cumulative = np.vstack([np.zeros((1, abnormal.shape[1])), np.cumsum(np.nan_to_num(abnormal), axis=0)])
+        sigma = self._estimation_sigma(abnormal)
+        
+        ticker_codes = event_cols
+        sector_names = sorted({(sectors or {}).get(symbol, "Unknown") for symbol in symbols})
+        sector_lookup = {name: code for code, name in enumerate(sector_names)}
+        symbol_sector = np.array([sector_lookup[(sectors or {}).get(symbol, "Unknown")] for symbol in symbols])
+        sector_codes = symbol_sector[event_cols]
+        
+        num_rows = abnormal.shape[0]
+        any_valid = np.zeros(len(known), dtype=bool)
+        
+        for name, (start, end) in self.windows.items():
+            first = event_rows + start
+            last = event_rows + end
+            valid = (first >= 0) & (last < num_rows)
+            any_valid |= valid
+            
+            rows_end = np.clip(last + 1, 0, num_rows)
+            rows_start = np.clip(first, 0, num_rows)
+            car = cumulative[rows_end, event_cols] - cumulative[rows_start, event_cols]
+            standardized = car / (sigma[event_cols] * np.sqrt(end - start + 1))
+            
+            self._aggregate(result["by_ticker"], name, symbols, ticker_codes, car, standardized, valid)
+            self._aggregate(result["by_sector"], name, sector_names, sector_codes, car, standardized, valid)
+        
+        result["events"] = int(any_valid.sum())
+        return result
+    
+    def _abnormal_returns(self, prices: np.ndarray) -> np.ndarray:
+        """Compute the abnormal daily log return matrix"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = np.diff(np.log(prices), axis=0)
+        
+        # Equal-weighted market return over the symbols trading each day
+        observed = ~np.isnan(returns)
+        market = np.nansum(returns, axis=1, keepdims=True) / np.maximum(observed.sum(axis=1, keepdims=True), 1)
+        
+        if self.model == "market_adjusted":
+            return returns - market
+        
+        # Market model: fit alpha and beta per symbol over the estimation period
+        estimation = slice(0, min(self.estimation_days, returns.shape[0]))
+        x = market[estimation]
+        y = returns[estimation]
+        x_mean = x.mean()
+        y_mean = np.nansum(y, axis=0) / np.maximum((~np.isnan(y)).sum(axis=0), 1)
+        variance = ((x - x_mean) ** 2).sum()
+        beta = np.nansum((x - x_mean) * (y - y_mean), axis=0) / variance if variance > 0 else np.ones(y.shape[1])
+        alpha = y_mean - beta * x_mean
+        
+        return returns - (alpha + beta * market)
+    
+    def _estimation_sigma(self, abnormal: np.ndarray) -> np.ndarray:
+        """Standard deviation of abnormal returns per symbol over the estimation period"""
+        estimation = abnormal[:min(self.estimation_days, abnormal.shape[0])]
+        observed = (~np.isnan(estimation)).sum(axis=0)
+        mean = np.nansum(estimation, axis=0) / np.maximum(observed, 1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sigma = np.sqrt(np.nansum((estimation - mean) ** 2, axis=0) / (observed - 1))
+        
+        # Symbols without a usable estimate are not standardized
+        return np.where(np.isfinite(sigma) & (sigma > 0), sigma, np.nan)
+    
+    def _aggregate(self, target: Dict[str, Dict[str, Any]], window: str, names: List[str],
+                   codes: np.ndarray, car: np.ndarray, standardized: np.ndarray, valid: np.ndarray) -> None:
+        """Aggregate per-event CARs into per-group statistics for one window"""
+        codes = codes[valid]
+        car = car[valid]
+        standardized = standardized[valid]
+        size = len(names)
+        
+        counts = np.bincount(codes, minlength=size)
+        car_sum = np.bincount(codes, weights=car, minlength=size)
+        car_sq_sum = np.bincount(codes, weights=car ** 2, minlength=size)
+        positive = np.bincount(codes, weights=(car > 0).astype(float), minlength=size)
+        
+        finite = np.isfinite(standardized)
+        scar_counts = np.bincount(codes[finite], minlength=size)
+        scar_sum = np.bincount(codes[finite], weights=standardized[finite], minlength=size)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean_car = car_sum / counts
+            variance = (car_sq_sum - counts * mean_car ** 2) / (counts - 1)
+            t_stat = mean_car / np.sqrt(variance / counts)
+            # Standardized CARs are unit variance under the null, so their
+            # scaled mean is a test statistic even for a single event
+            z_stat = scar_sum / np.sqrt(scar_counts)
+        
+        for code in np.nonzero(counts)[0]:
+            target.setdefault(names[code], {})[window] = {
+                "events": int(counts[code]),
+                "mean_car_percent": round(float(mean_car[code]) * 100, 3),
+                "positive_ratio": round(float(positive[code] / counts[code]), 2),
+                "t_stat": round(float(t_stat[code]), 2) if np.isfinite(t_stat[code]) else None,
+                "z_stat": round(float(z_stat[code]), 2) if np.isfinite(z_stat[code]) else None
+            }
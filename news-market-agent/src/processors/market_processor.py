@@ -2,22 +2,47 @@
 Market Processor - Analyzes market data and correlates with news
 """
 import logging
-from typing import List, Dict, Any, Optional
+import os
+from typing import List, Dict, Any, Optional, Tuple, Union
 from datetime import datetime, timedelta
 
 # Local imports
 from ..interfaces.market_insights_interface import MarketInsightsInterface
 from ..interfaces.company_monitor_interface import CompanyMonitorInterface
+from ..storage.bar_store import BarStore
+from ..storage.screening_table import ScreeningTable
+from ..storage.insider_store import InsiderTradingStore
+from ..storage.entity_dictionary import get_entity_dictionary
+from ..storage.mention_index import MentionIndex
+from .event_study import EventStudy
+from .sentiment import BatchSentimentAnalyzer
+from .sector_correlation import RollingSectorCorrelation
 
 logger = logging.getLogger(__name__)
 
 class MarketProcessor:
     """Processes market data and correlates with news"""
     
-    def __init__(self):
-        """Initialize market processor and its dependencies"""
+    def __init__(self, data_dir: str = 'data', sentiment: Optional[BatchSentimentAnalyzer] = None):
+        """
+        Initialize market processor and its dependencies
+        
+        Args:
+            data_dir: Directory for locally maintained market history
+            sentiment: Optional sentiment analyzer for company news (e.g. the news
+                       processor's, to share its cache); an in-memory one by default
+        """
+        self.sentiment = sentiment or BatchSentimentAnalyzer()
         self.market_insights = MarketInsightsInterface()
-        self.company_monitor = CompanyMonitorInterface()
+        self.company_monitor = CompanyMonitorInterface(news_scorer=self.sentiment.analyze_batch)
+        self.event_study = EventStudy()
+        self.sector_correlation = RollingSectorCorrelation(
+            state_path=os.path.join(data_dir, 'sector_correlation.json')
+        )
+        self.bar_store = BarStore(path=os.path.join(data_dir, 'bars.npz'))
+        self.screening_table = ScreeningTable(path=os.path.join(data_dir, 'screening.npz'))
+        self.insider_store = InsiderTradingStore(path=os.path.join(data_dir, 'insider_trading.db'))
+        self.entities = get_entity_dictionary()
     
     def get_market_overview(self) -> Dict[str, Any]:
         """
@@ -29,8 +54,8 @@ class MarketProcessor:
         # Get market summary
         market_summary = self.market_insights.get_market_summary()
         
-        # Get sector performance
-        sector_performance = self.market_insights.get_sector_performance()
+        # Get sector performance, with weekly and monthly changes from local history
+        sector_performance = self._apply_local_sector_trends(self.market_insights.get_sector_performance())
         
         # Get economic indicators
         economic_indicators = self.market_insights.get_economic_indicators()
@@ -57,49 +82,24 @@ class MarketProcessor:
         # Use market insights to analyze impact
         return self.market_insights.analyze_news_impact(news_items)
     
-    def extract_company_mentions(self, news_items: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    def extract_company_mentions(self, news_items: List[Dict[str, Any]],
+                                 index: Optional[MentionIndex] = None) -> Dict[str, List[Dict[str, Any]]]:
         """
         Extract company mentions from news items
         
+        Titles and content are matched against the company alias dictionary
+        (whole words; tickers and ambiguous names case-sensitively). Each
+        item is listed at most once per company, identified by its item key.
+        
         Args:
             news_items: List of news items to analyze
+            index: Optional mention index of news_items, to avoid rescanning their text
             
         Returns:
             Dictionary mapping company tickers to news items
         """
-        # Common tech company tickers for demo
-        tech_companies = {
-            "AAPL": ["Apple", "iPhone", "iPad", "Mac", "Tim Cook"],
-            "MSFT": ["Microsoft", "Windows", "Azure", "Office", "Nadella", "Satya"],
-            "GOOGL": ["Google", "Alphabet", "Android", "Pixel", "Pichai"],
-            "AMZN": ["Amazon", "AWS", "Bezos", "Jassy"],
-            "META": ["Meta", "Facebook", "Instagram", "WhatsApp", "Zuckerberg"],
-            "TSLA": ["Tesla", "Musk", "Elon"],
-            "NVDA": ["Nvidia", "GPU", "Jensen Huang"],
-            "NFLX": ["Netflix", "streaming"],
-            "IBM": ["IBM", "International Business Machines"],
-            "ORCL": ["Oracle", "Ellison"]
-        }
-        
-        # Initialize result
-        company_mentions = {ticker: [] for ticker in tech_companies}
-        
-        # Analyze each news item
-        for item in news_items:
-            title = item.get('title', '')
-            content = item.get('content', '')
-            text = title + " " + content
-            
-            # Check for company mentions
-            for ticker, keywords in tech_companies.items():
-                for keyword in keywords:
-                    if keyword in text:
-                        if item not in company_mentions[ticker]:
-                            company_mentions[ticker].append(item)
-                        break
-        
-        # Remove companies with no mentions
-        return {ticker: mentions for ticker, mentions in company_mentions.items() if mentions}
+        index = index or MentionIndex(news_items, self.entities)
+        return index.company_mentions()
     
     def get_companies_data(self, tickers: List[str]) -> Dict[str, Dict[str, Any]]:
         """
@@ -111,28 +111,138 @@ class MarketProcessor:
         Returns:
             Dictionary mapping tickers to company data
         """
-        result = {}
+        # One bulk request for profiles, financials and recent news
+        bulk = self.company_monitor.get_companies_bulk(
+            tickers, fields=["profile", "financials", "news"], news_days=3
+        )
         
+        result = {}
         for ticker in tickers:
-            # Get company profile
-            profile = self.company_monitor.get_company_profile(ticker)
-            
-            # Get financial metrics
-            financials = self.company_monitor.get_financial_metrics(ticker)
-            
-            # Get recent news
-            news = self.company_monitor.get_company_news(ticker, days=3)
+            data = bulk.get(ticker, {})
             
             # Compile the data
             result[ticker] = {
-                "profile": profile,
-                "financials": financials,
-                "recent_news": news,
+                "profile": data.get("profile", {}),
+                "financials": data.get("financials", {}),
+                "recent_news": data.get("news", []),
                 "source": "company_monitor"
             }
         
         return result
     
+    def refresh_screening_table(self, tickers: List[str], max_age_hours: float = 24) -> int:
+        """
+        Fetch financial metrics for tickers missing from or stale in the screening table
+        
+        Args:
+            tickers: Tickers the table should cover
+            max_age_hours: Age after which a ticker's metrics are fetched again
+        
+        Returns:
+            Number of tickers refreshed
+        """
+        stale = self.screening_table.stale(tickers, max_age_hours * 3600)
+        if not stale:
+            return 0
+        
+        bulk = self.company_monitor.get_companies_bulk(stale, fields=["financials"])
+        refreshed = 0
+        for ticker, data in bulk.items():
+            if data.get("financials"):
+                self.screening_table.update(ticker, data["financials"])
+                refreshed += 1
+        
+        self.screening_table.save()
+        return refreshed
+    
+    def screen_companies(self, filters: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None,
+                         rank_by: Optional[Union[str, Dict[str, float]]] = None, ascending: bool = False,
+                         limit: Optional[int] = 50, tickers: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Screen companies on financial metrics, e.g. for building a watchlist
+        
+        Args:
+            filters: Dictionary mapping metrics to (minimum, maximum) bounds,
+                     e.g. {"pe_ratio": (None, 25), "roe": (15, None)}
+            rank_by: Metric to sort by, or dictionary mapping metrics to weights
+                     for a composite percentile score, e.g. {"roe": 1, "pe_ratio": -1}
+            ascending: Sort order for rank_by
+            limit: Maximum number of results
+            tickers: Optional universe; missing or stale tickers are fetched first
+        
+        Returns:
+            List of matching companies with their metrics (see ScreeningTable.METRICS)
+        """
+        if tickers:
+            self.refresh_screening_table(tickers)
+        
+        return self.screening_table.screen(filters, rank_by=rank_by, ascending=ascending,
+                                           limit=limit, tickers=tickers)
+    
+    def sync_insider_trading(self, tickers: List[str], months: int = 3, max_age_hours: float = 12) -> int:
+        """
+        Add new insider transactions for tickers to the insider trading store
+        
+        Tickers synced within max_age_hours are skipped; the others only
+        request the months since their last sync.
+        
+        Args:
+            tickers: Tickers to sync
+            months: Months of history to request for tickers never synced
+            max_age_hours: Age after which a ticker is synced again
+        
+        Returns:
+            Number of new transactions stored
+        """
+        now = datetime.now().timestamp()
+        
+        # Group tickers by how many months they need so each group is one request
+        due: Dict[int, List[str]] = {}
+        for ticker in tickers:
+            synced_at = self.insider_store.last_synced(ticker)
+            if synced_at is not None and now - synced_at < max_age_hours * 3600:
+                continue
+            needed = months if synced_at is None else min(months, int((now - synced_at) // (30 * 86400)) + 1)
+            due.setdefault(needed, []).append(ticker)
+        
+        added = 0
+        for needed, group in due.items():
+            bulk = self.company_monitor.get_companies_bulk(group, fields=["insider_trading"], insider_months=needed)
+            for ticker, data in bulk.items():
+                # A failed fetch leaves the field out; don't record it as a sync so it's retried
+                if "insider_trading" not in data:
+                    logger.warning(f"Insider trading sync failed for {ticker}; will retry")
+                    continue
+                added += self.insider_store.add(ticker, data["insider_trading"])
+        
+        return added
+    
+    def get_insider_activity(self, tickers: List[str], start: Optional[str] = None, end: Optional[str] = None,
+                             transaction_type: Optional[str] = None,
+                             min_value: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Get insider transactions and net buy/sell activity across tickers
+        
+        For example, all insider sells over $1M across a watchlist this quarter:
+        get_insider_activity(watchlist, start="2024-04-01", transaction_type="Sell", min_value=1_000_000)
+        
+        Args:
+            tickers: Tickers to include (synced first if stale)
+            start: Optional first ISO date to include
+            end: Optional last ISO date to include
+            transaction_type: Optional type to include ("Buy" or "Sell")
+            min_value: Optional minimum total value per transaction
+        
+        Returns:
+            Dictionary with matching transactions and net activity per ticker
+        """
+        self.sync_insider_trading(tickers)
+        
+        return {
+            "transactions": self.insider_store.query(tickers, start, end, transaction_type, min_value),
+            "net_activity": self.insider_store.net_activity(tickers, start, end, min_value)
+        }
+    
     def analyze_top_performers(self, sector: Optional[str] = None) -> Dict[str, Any]:
         """
         Analyze top performing companies/sectors in the market
@@ -169,19 +279,110 @@ class MarketProcessor:
         return {
             "top_sectors": top_sectors,
             "trending_companies": companies_data,
+            "stock_trends": self.get_stock_trends(ticker_symbols[:5]),
             "market_mood": market_summary.get('market_mood', {}),
             "timestamp": datetime.now().isoformat(),
             "source": "market_processor"
         }
     
+    def sync_stock_bars(self, symbols: List[str], days: int = 90) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Bring the local bar store up to date and return recent daily bars
+        
+        Only the days missing since each symbol's last stored bar are requested
+        from the market data API.
+        
+        Args:
+            symbols: Stock symbols to sync
+            days: Number of days of history to return
+        
+        Returns:
+            Dictionary mapping symbols to their daily bars, oldest first
+        """
+        today = datetime.now().date()
+        
+        # Group symbols by how many days they need so each group is one request
+        missing: Dict[int, List[str]] = {}
+        for symbol in symbols:
+            last_date = self.bar_store.last_date(symbol)
+            gap = days if last_date is None else min(days, (today - last_date).days)
+            if gap > 0:
+                missing.setdefault(gap, []).append(symbol)
+        
+        for gap, group in missing.items():
+            # Include the last stored day again in case it was still in progress
+            fetched = self.market_insights.get_stock_data(group, days=gap + 1)
+            for symbol, bars in fetched.items():
+                self.bar_store.ingest(symbol, bars)
+        
+        if missing:
+            self.bar_store.save()
+        
+        start = (today - timedelta(days=days - 1)).isoformat()
+        return {symbol: self.bar_store.get_bars(symbol, "D", start=start) for symbol in symbols}
+    
+    def get_stock_trends(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get daily, weekly and monthly price trends for stocks from local bars
+        
+        Args:
+            symbols: Stock symbols to get trends for
+        
+        Returns:
+            Dictionary mapping symbols to their latest close and period changes
+        """
+        self.sync_stock_bars(symbols)
+        
+        trends = {}
+        for symbol in symbols:
+            bars = self.bar_store.get_bars(symbol, "D")
+            if not bars:
+                continue
+            
+            weekly_change = self.bar_store.change_percent(symbol, "W")
+            trends[symbol] = {
+                "last_close": bars[-1]['close'],
+                "daily_change_percent": self.bar_store.change_percent(symbol, "D"),
+                "weekly_change_percent": weekly_change,
+                "monthly_change_percent": self.bar_store.change_percent(symbol, "M"),
+                "trend": "up" if weekly_change and weekly_change > 0 else
+                         "down" if weekly_change and weekly_change < 0 else
+                         "flat"
+            }
+        
+        return trends
+    
+    def get_intraday_snapshot(self, symbols: List[str], seconds: float = 300) -> Dict[str, Dict[str, Any]]:
+        """
+        Get live quote statistics for symbols from the quote stream
+        
+        Args:
+            symbols: Stock symbols to include
+            seconds: Length of the trailing window to aggregate
+        
+        Returns:
+            Dictionary mapping symbols to their latest quote and trailing window statistics
+        """
+        snapshot = {}
+        for symbol in symbols:
+            latest = self.market_insights.get_latest_quote(symbol)
+            if latest:
+                snapshot[symbol] = {
+                    "latest": latest,
+                    "window": self.market_insights.get_quote_window(symbol, seconds=seconds)
+                }
+        return snapshot
+    
     def correlate_news_with_market(self, news_items: List[Dict[str, Any]], 
-                                  market_overview: Dict[str, Any]) -> Dict[str, Any]:
+                                  market_overview: Dict[str, Any],
+                                  index: Optional[MentionIndex] = None) -> Dict[str, Any]:
         """
         Correlate news with market data to identify relationships
         
         Args:
             news_items: List of news items
             market_overview: Market overview data
+            index: Optional mention index of news_items (built here if not given)
             
         Returns:
             Dictionary with correlation analysis
@@ -189,11 +390,14 @@ class MarketProcessor:
         # Analyze impact of news on market
         news_with_impact = self.analyze_news_market_impact(news_items)
         
+        # Company and sector mentions share one index of the news text
+        index = index or MentionIndex(news_items, self.entities)
+        
         # Extract company mentions
-        company_mentions = self.extract_company_mentions(news_items)
+        company_mentions = self.extract_company_mentions(news_items, index)
         
         # Get sector mentions
-        sector_mentions = self._extract_sector_mentions(news_items)
+        sector_mentions = self._extract_sector_mentions(news_items, index)
         
         # Correlate sectors with performance
         sector_performance = market_overview.get('sector_performance', [])
@@ -204,17 +408,69 @@ class MarketProcessor:
         top_mentioned_tickers = [ticker for ticker, _ in top_mentioned_companies]
         companies_data = self.get_companies_data(top_mentioned_tickers)
         
+        # Measure abnormal returns around the news about mentioned companies
+        event_study = self.run_event_study(company_mentions)
+        
         return {
             "news_with_impact": news_with_impact,
             "company_mentions": {ticker: len(mentions) for ticker, mentions in company_mentions.items()},
             "sector_mentions": sector_mentions,
             "sector_correlation": sector_correlation,
             "company_data": companies_data,
+            "event_study": event_study,
             "timestamp": datetime.now().isoformat(),
             "source": "market_processor"
         }
     
-    def _extract_sector_mentions(self, news_items: List[Dict[str, Any]]) -> Dict[str, int]:
+    def run_event_study(self, company_mentions: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        Run an event study on news mentioning companies
+        
+        Args:
+            company_mentions: Dictionary mapping company tickers to news items
+        
+        Returns:
+            Dictionary with abnormal return statistics by ticker and sector
+        """
+        events = [(ticker, item['timestamp'])
+                  for ticker, items in company_mentions.items()
+                  for item in items if item.get('timestamp')]
+        if not events:
+            return {}
+        
+        tickers = list(company_mentions)
+        stock_data = self.sync_stock_bars(tickers, days=self.event_study.history_days)
+        sectors = {ticker: self.company_monitor.reference.sector(ticker)
+                   for ticker in tickers}
+        
+        return self.event_study.run(stock_data, events, sectors)
+    
+    def close(self) -> None:
+        """Save state that is only written periodically and close the stores"""
+        self.sector_correlation.save()
+        self.insider_store.close()
+    
+    def _apply_local_sector_trends(self, sector_performance: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Record today's sector changes and derive weekly/monthly changes from the bar store"""
+        today = datetime.now().date().isoformat()
+        
+        result = []
+        for sector in sector_performance:
+            series = f"sector:{sector['sector']}"
+            self.bar_store.ingest_change(series, today, sector['daily_change_percent'])
+            
+            # Keep the API figures until enough local history has built up
+            local = {
+                "weekly_change_percent": self.bar_store.change_percent(series, "W"),
+                "monthly_change_percent": self.bar_store.change_percent(series, "M")
+            }
+            result.append({**sector, **{key: value for key, value in local.items() if value is not None}})
+        
+        self.bar_store.save()
+        return result
+    
+    def _extract_sector_mentions(self, news_items: List[Dict[str, Any]],
+                                 index: Optional[MentionIndex] = None) -> Dict[str, int]:
         """Extract sector mentions from news items"""
         # Common market sectors
         sectors = [
@@ -223,38 +479,51 @@ class MarketProcessor:
             "Energy", "Utilities", "Materials", "Real Estate"
         ]
         
-        # Initialize counts
-        sector_mentions = {sector: 0 for sector in sectors}
-        
-        # Count mentions in each news item
-        for item in news_items:
-            title = item.get('title', '')
-            content = item.get('content', '')
-            text = title + " " + content
-            
-            for sector in sectors:
-                if sector in text:
-                    sector_mentions[sector] += 1
+        # Count the news items mentioning each sector
+        index = index or MentionIndex(news_items, self.entities)
+        sector_mentions = {sector: index.count_items(sector, case_sensitive=True) for sector in sectors}
         
         # Return only sectors with mentions
         return {sector: count for sector, count in sector_mentions.items() if count > 0}
     
     def _correlate_sectors_performance(self, sector_mentions: Dict[str, int], 
                                       sector_performance: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Correlate sector mentions with sector performance"""
+        """
+        Correlate sector mentions with sector performance
+        
+        Today's mentions and returns are added to the rolling history, and each
+        mentioned sector is classified by the rolling correlation between its
+        daily mention count and daily return.
+        """
         # Create lookup for sector performance
         performance_lookup = {s['sector']: s for s in sector_performance}
         
+        # Add today's observations to the rolling window
+        self.sector_correlation.update(
+            datetime.now().date().isoformat(),
+            sector_mentions,
+            {sector: s['daily_change_percent'] for sector, s in performance_lookup.items()}
+        )
+        self.sector_correlation.save_if_due()
+        
+        pearson = self.sector_correlation.pearson()
+        spearman = self.sector_correlation.spearman()
+        observations = self.sector_correlation.observations()
+        
         # Correlate mentions with performance
         correlation = []
         for sector, mentions in sector_mentions.items():
             if sector in performance_lookup:
+                r = pearson.get(sector)
                 correlation.append({
                     "sector": sector,
                     "mentions": mentions,
                     "daily_change_percent": performance_lookup[sector]['daily_change_percent'],
-                    "correlation_type": "positive" if mentions > 3 and performance_lookup[sector]['daily_change_percent'] > 0 else 
-                                        "negative" if mentions > 3 and performance_lookup[sector]['daily_change_percent'] < 0 else
+                    "pearson": r,
+                    "spearman": spearman.get(sector),
+                    "observations": observations.get(sector, 0),
+                    "correlation_type": "positive" if r is not None and r >= 0.3 else
+                                        "negative" if r is not None and r <= -0.3 else
                                         "neutral"
                 })
         
@@ -2,61 +2,84 @@
 News Processor - Combines and processes news from multiple sources
 """
 import logging
+import os
 from typing import List, Dict, Any, Optional
-import nltk
-from nltk.sentiment import SentimentIntensityAnalyzer
 from datetime import datetime, timedelta
 
 # Local imports
 from ..interfaces.hackernews_interface import HackerNewsInterface
 from ..interfaces.reddit_interface import RedditInterface
 from ..interfaces.firecrawl_interface import FirecrawlInterface
-
-# Setup NLTK for sentiment analysis
-try:
-    nltk.data.find('vader_lexicon')
-except LookupError:
-    nltk.download('vader_lexicon')
+from .sentiment import BatchSentimentAnalyzer
+from .vector_sentiment import VectorSentimentScorer
+from .duplicate_detector import NearDuplicateDetector
+from .topic_classifier import TopicClassifier
+from ..storage.news_archive import NewsArchive, TimeBound
+from ..utils.streams import merge_top_k
+from ..utils.annotations import annotate
 
 logger = logging.getLogger(__name__)
 
 class NewsProcessor:
     """Processes and aggregates news from multiple sources"""
     
-    def __init__(self):
-        """Initialize news processor and its dependencies"""
+    def __init__(self, data_dir: str = 'data', sentiment_workers: int = 0):
+        """
+        Initialize news processor and its dependencies
+        
+        Args:
+            data_dir: Directory for the persisted sentiment cache and news archive
+            sentiment_workers: Worker processes for large sentiment batches (0 scores inline)
+        """
         self.hackernews = HackerNewsInterface()
         self.reddit = RedditInterface()
         self.firecrawl = FirecrawlInterface()
-        self.sentiment_analyzer = SentimentIntensityAnalyzer()
+        self.sentiment = BatchSentimentAnalyzer(
+            cache_path=os.path.join(data_dir, 'sentiment_cache.json'),
+            workers=sentiment_workers
+        )
+        self._body_sentiment: Optional[VectorSentimentScorer] = None
+        self.duplicates = NearDuplicateDetector()
+        self.topics = TopicClassifier()
+        self.archive = NewsArchive(path=os.path.join(data_dir, 'news_archive.db'))
     
-    def get_aggregated_news(self, topics: Optional[List[str]] = None, max_items: int = 50) -> List[Dict[str, Any]]:
+    def get_aggregated_news(self, topics: Optional[List[str]] = None, max_items: int = 50,
+                            timeout: Optional[float] = None, collapse_duplicates: bool = True) -> List[Dict[str, Any]]:
         """
         Aggregate news from all sources with optional topic filtering
         
+        Sources are read concurrently and only the top items by score are
+        kept as items arrive. Items about the same story (same canonical URL
+        or near-duplicate title and summary) are collapsed into the highest
+        scored one, and sentiment and timestamps are added to the survivors only.
+        
         Args:
             topics: Optional list of topics to filter news by
             max_items: Maximum number of news items to return
+            timeout: Optional seconds to wait for sources before ranking what has arrived
+            collapse_duplicates: Whether to return one item per story cluster
             
         Returns:
             List of aggregated news items
         """
-        # Get news from all sources
-        hackernews_items = self.hackernews.get_top_stories(filter_keywords=topics)
-        reddit_items = self.reddit.get_all_hot_posts(filter_keywords=topics)
+        sources = [
+            self.hackernews.iter_top_stories(filter_keywords=topics),
+            self.reddit.iter_hot_posts(filter_keywords=topics)
+        ]
         
-        # Combine all items
-        all_items = hackernews_items + reddit_items
+        # Top items by score/popularity; extra candidates make up for collapsed duplicates
+        candidates = max_items * 2 if collapse_duplicates else max_items
+        top_items = merge_top_k(sources, candidates, key=lambda x: x.get('score', 0), timeout=timeout)
         
-        # Sort by score/popularity
-        sorted_items = sorted(all_items, key=lambda x: x.get('score', 0), reverse=True)
+        if collapse_duplicates:
+            top_items = self.duplicates.collapse(top_items)
+        top_items = top_items[:max_items]
         
-        # Limit to max_items
-        top_items = sorted_items[:max_items]
+        # Add sentiment analysis to each item, scoring all titles in one batch
+        sentiments = self.analyze_sentiment_batch([item.get('title', '') for item in top_items])
         
-        # Add sentiment analysis to each item
-        for item in top_items:
-            item['sentiment'] = self._analyze_sentiment(item.get('title', ''))
+        for item, sentiment in zip(top_items, sentiments):
+            item['sentiment'] = sentiment
             
             # Get timestamp if available, otherwise use current time
             timestamp = item.get('time') or item.get('created_utc')
@@ -67,6 +90,10 @@ class NewsProcessor:
                 item['timestamp'] = datetime.now().timestamp()
                 item['datetime'] = datetime.now().isoformat()
         
+        # Keep the snapshot (and the scores observed now) for historical queries
+        added = self.archive.upsert(top_items)
+        logger.info(f"Archived {len(top_items)} news items ({added} new)")
+        
         return top_items
     
     def enrich_news_with_firecrawl(self, news_items: List[Dict[str, Any]], max_related: int = 2) -> List[Dict[str, Any]]:
@@ -109,6 +136,7 @@ class NewsProcessor:
             
             enriched_items.append(item)
         
+        self.analyze_article_sentiment(enriched_items)
         return enriched_items
     
     def filter_news_by_date(self, news_items: List[Dict[str, Any]], days: int = 1) -> List[Dict[str, Any]]:
@@ -127,44 +155,103 @@ class NewsProcessor:
         
         return [item for item in news_items if item.get('timestamp', 0) >= cutoff_timestamp]
     
+    def get_news_history(self, start: TimeBound = None, end: TimeBound = None,
+                         sources: Optional[List[str]] = None, url: Optional[str] = None,
+                         min_score: Optional[int] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get archived news items from earlier runs, newest first
+        
+        Unlike filter_news_by_date, this queries every item aggregated so far
+        (the filters run in the archive), not just the current list.
+        
+        Args:
+            start: Optional earliest publication time (Unix time, ISO string or datetime)
+            end: Optional latest publication time (a date-only end covers the whole day)
+            sources: Optional sources to include ("hackernews", "reddit")
+            url: Optional URL; items from any source linking to the same article are included
+            min_score: Optional minimum score
+            limit: Optional maximum number of items
+        
+        Returns:
+            List of news items
+        """
+        return self.archive.query(start, end, sources, url, min_score, limit)
+    
     def categorize_news(self, news_items: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
         """
         Categorize news items into topics
         
+        Titles are classified in one batch by TF-IDF similarity to each topic.
+        An item is listed under every matching topic as an annotated view
+        (the given items are not modified) whose 'topics' field holds the
+        (topic, confidence) pairs, most confident first.
+        
         Args:
             news_items: List of news items to categorize
             
         Returns:
             Dictionary mapping categories to news items
         """
-        categories = {
-            "technology": ["ai", "tech", "software", "programming", "hardware", "technology", "cyber", "data"],
-            "business": ["business", "economic", "market", "finance", "invest", "stock", "startup"],
-            "crypto": ["crypto", "bitcoin", "ethereum", "blockchain", "web3", "nft"],
-            "science": ["science", "research", "physics", "biology", "chemistry", "medicine"],
-            "policy": ["policy", "regulation", "government", "law", "legal", "compliance"]
-        }
-        
-        categorized = {category: [] for category in categories}
+        categorized = {category: [] for category in self.topics.topics}
         categorized["other"] = []  # For uncategorized items
         
-        for item in news_items:
-            title = item.get('title', '').lower()
+        labels = self.topics.classify([item.get('title', '') for item in news_items])
+        for item, topics in zip(news_items, labels):
+            item = annotate(item, topics=[{"category": category, "confidence": confidence}
+                                          for category, confidence in topics])
             
-            # Check each category
-            categorized_flag = False
-            for category, keywords in categories.items():
-                if any(keyword in title for keyword in keywords):
-                    categorized[category].append(item)
-                    categorized_flag = True
-                    break
+            for category, _ in topics:
+                categorized[category].append(item)
             
             # If not categorized, add to "other"
-            if not categorized_flag:
+            if not topics:
                 categorized["other"].append(item)
         
         return categorized
     
+    def analyze_sentiment_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """
+        Analyze the sentiment of many texts (titles, comments or article bodies)
+        
+        Results are cached across runs, so repeated texts are only scored once.
+        
+        Args:
+            texts: Texts to analyze
+        
+        Returns:
+            Sentiment results in the order of texts
+        """
+        results = self.sentiment.analyze_batch(texts)
+        self.sentiment.save()
+        return results
+    
+    def analyze_article_sentiment(self, news_items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Add the sentiment of expanded article bodies to news items
+        
+        Bodies are scored sentence by sentence with the vectorized scorer,
+        all items in one batch, and stored under 'content_sentiment'.
+        
+        Args:
+            news_items: News items, some with expanded content
+        
+        Returns:
+            The news items
+        """
+        with_content = [item for item in news_items
+                        if isinstance(item.get('expanded_content'), dict) and item['expanded_content'].get('content')]
+        if not with_content:
+            return news_items
+        
+        if self._body_sentiment is None:
+            self._body_sentiment = VectorSentimentScorer()
+        
+        scores = self._body_sentiment.score_documents([item['expanded_content']['content'] for item in with_content])
+        for item, sentiment in zip(with_content, scores):
+            item['content_sentiment'] = sentiment
+        
+        return news_items
+    
     def _analyze_sentiment(self, text: str) -> Dict[str, Any]:
         """
         Analyze sentiment of a text using NLTK's VADER
@@ -175,20 +262,4 @@ class NewsProcessor:
         Returns:
             Dictionary with sentiment scores and label
         """
-        scores = self.sentiment_analyzer.polarity_scores(text)
-        
-        # Determine sentiment label
-        if scores['compound'] >= 0.05:
-            label = "positive"
-        elif scores['compound'] <= -0.05:
-            label = "negative"
-        else:
-            label = "neutral"
-        
-        return {
-            "compound": round(scores['compound'], 3),
-            "positive": round(scores['pos'], 3),
-            "negative": round(scores['neg'], 3),
-            "neutral": round(scores['neu'], 3),
-            "label": label
-        }
+        return self.sentiment.analyze(text)
@@ -0,0 +1,249 @@
+"""
+Sector Correlation - Rolling correlation between sector news mentions and sector returns
+"""
+import logging
+import json
+import os
+import time
+from typing import List, Dict, Optional
+import numpy as np
+
+from ..utils.ranking import average_ranks
+
+logger = logging.getLogger(__name__)
+
+class RollingSectorCorrelation:
+    """
+    Rolling Pearson and Spearman correlation between daily sector mention
+    counts and daily sector returns
+    
+    Each sector's last `window` days are kept in fixed-size ring buffers along
+    with running sums (x, y, x^2, y^2, xy), so adding a day only touches one
+    column of the buffers and updates the sums in O(sectors). The sums are
+    recomputed from the buffers every `recompute_every` updates, so rounding
+    errors from adding and removing days don't accumulate. Pearson
+    correlation comes straight from the running sums; Spearman correlation
+    needs ranks and is computed from the buffers when requested.
+    """
+    
+    def __init__(self, window: int = 30, min_observations: int = 5,
+                 state_path: Optional[str] = None, recompute_every: int = 100,
+                 save_interval: float = 300.0):
+        """
+        Initialize the rolling correlation tracker
+        
+        Args:
+            window: Number of days in the rolling window
+            min_observations: Minimum days of history before a correlation is reported
+            state_path: Optional JSON file the history is loaded from and saved to
+            recompute_every: Number of updates between recomputations of the running sums
+            save_interval: Minimum seconds between saves by save_if_due
+        """
+        self.window = window
+        self.min_observations = min_observations
+        self.state_path = state_path
+        self.recompute_every = max(1, recompute_every)
+        self.save_interval = save_interval
+        
+        self._updates = 0  # Updates since the sums were last recomputed
+        self._dirty = False
+        self._last_saved = time.monotonic()
+        
+        self.sectors: List[str] = []
+        self._sector_index: Dict[str, int] = {}
+        self.days: List[Optional[str]] = [None] * window
+        self._head = 0  # Slot the next new day is written to
+        self._last_day: Optional[str] = None
+        
+        self._mentions = np.zeros((0, window))
+        self._returns = np.zeros((0, window))
+        self._valid = np.zeros((0, window), dtype=bool)
+        self._reset_sums()
+        
+        if state_path and os.path.exists(state_path):
+            self.load()
+            self._dirty = False
+    
+    def update(self, day: str, mentions: Dict[str, int], returns: Dict[str, float]) -> None:
+        """
+        Add one day of sector mentions and returns
+        
+        Updating the most recent day again replaces its values, so repeated
+        runs on the same day don't count twice.
+        
+        Args:
+            day: ISO date of the observations
+            mentions: Dictionary mapping sectors to mention counts (missing sectors count as 0)
+            returns: Dictionary mapping sectors to daily returns in percent
+        """
+        for sector in returns:
+            self._ensure_sector(sector)
+        
+        if day == self._last_day:
+            slot = (self._head - 1) % self.window
+        else:
+            slot = self._head
+            self._head = (self._head + 1) % self.window
+            self._last_day = day
+        
+        # Remove whatever currently occupies the slot from the running sums
+        self._apply(slot, -1.0)
+        
+        x = np.zeros(len(self.sectors))
+        y = np.zeros(len(self.sectors))
+        valid = np.zeros(len(self.sectors), dtype=bool)
+        for sector, change in returns.items():
+            code = self._sector_index[sector]
+            x[code] = mentions.get(sector, 0)
+            y[code] = change
+            valid[code] = True
+        
+        self._mentions[:, slot] = x
+        self._returns[:, slot] = y
+        self._valid[:, slot] = valid
+        self.days[slot] = day
+        
+        self._apply(slot, 1.0)
+        self._dirty = True
+        
+        self._updates += 1
+        if self._updates >= self.recompute_every:
+            self._recompute_sums()
+    
+    def pearson(self) -> Dict[str, Optional[float]]:
+        """
+        Get the rolling Pearson correlation for each sector
+        
+        Returns:
+            Dictionary mapping sectors to their correlation (None if undefined)
+        """
+        n = self._n
+        with np.errstate(divide='ignore', invalid='ignore'):
+            covariance = n * self._sxy - self._sx * self._sy
+            variance_x = n * self._sxx - self._sx ** 2
+            variance_y = n * self._syy - self._sy ** 2
+            r = covariance / np.sqrt(variance_x * variance_y)
+        
+        return self._to_dict(r)
+    
+    def spearman(self) -> Dict[str, Optional[float]]:
+        """
+        Get the rolling Spearman rank correlation for each sector
+        
+        Returns:
+            Dictionary mapping sectors to their correlation (None if undefined)
+        """
+        r = np.full(len(self.sectors), np.nan)
+        
+        for code in range(len(self.sectors)):
+            valid = self._valid[code]
+            if valid.sum() < 2:
+                continue
+            
+            x = average_ranks(self._mentions[code, valid])
+            y = average_ranks(self._returns[code, valid])
+            with np.errstate(divide='ignore', invalid='ignore'):
+                r[code] = np.corrcoef(x, y)[0, 1]
+        
+        return self._to_dict(r)
+    
+    def observations(self) -> Dict[str, int]:
+        """Get the number of days in the window for each sector"""
+        return {sector: int(self._n[code]) for code, sector in enumerate(self.sectors)}
+    
+    def load(self) -> None:
+        """Load the rolling window from state_path"""
+        try:
+            with open(self.state_path) as f:
+                state = json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading sector correlation state: {e}")
+            return
+        
+        # Replay the saved days oldest first; days beyond the window fall out
+        for day, mentions, returns in zip(state.get('days', []), state.get('mentions', []), state.get('returns', [])):
+            self.update(day, mentions, returns)
+    
+    def save_if_due(self) -> None:
+        """Save the rolling window if it changed and save_interval has passed since the last save"""
+        if time.monotonic() - self._last_saved >= self.save_interval:
+            self.save()
+    
+    def save(self) -> None:
+        """Save the rolling window to state_path if it changed"""
+        if not self.state_path or not self._dirty:
+            return
+        
+        slots = [(self._head + i) % self.window for i in range(self.window)]
+        slots = [slot for slot in slots if self.days[slot] is not None]
+        
+        state = {
+            "window": self.window,
+            "days": [self.days[slot] for slot in slots],
+            "mentions": [{sector: float(self._mentions[code, slot]) for code, sector in enumerate(self.sectors)
+                          if self._valid[code, slot]} for slot in slots],
+            "returns": [{sector: float(self._returns[code, slot]) for code, sector in enumerate(self.sectors)
+                         if self._valid[code, slot]} for slot in slots]
+        }
+        
+        try:
+            os.makedirs(os.path.dirname(self.state_path) or '.', exist_ok=True)
+            with open(self.state_path, 'w') as f:
+                json.dump(state, f)
+            self._dirty = False
+            self._last_saved = time.monotonic()
+        except Exception as e:
+            logger.error(f"Error saving sector correlation state: {e}")
+    
+    def _ensure_sector(self, sector: str) -> None:
+        """Add a row for a sector seen for the first time"""
+        if sector in self._sector_index:
+            return
+        
+        self._sector_index[sector] = len(self.sectors)
+        self.sectors.append(sector)
+        
+        self._mentions = np.vstack([self._mentions, np.zeros((1, self.window))])
+        self._returns = np.vstack([self._returns, np.zeros((1, self.window))])
+        self._valid = np.vstack([self._valid, np.zeros((1, self.window), dtype=bool)])
+        for name in ("_n", "_sx", "_sy", "_sxx", "_syy", "_sxy"):
+            setattr(self, name, np.append(getattr(self, name), 0.0))
+    
+    def _reset_sums(self) -> None:
+        """Zero the running sums"""
+        size = len(self.sectors)
+        self._n = np.zeros(size)
+        self._sx = np.zeros(size)
+        self._sy = np.zeros(size)
+        self._sxx = np.zeros(size)
+        self._syy = np.zeros(size)
+        self._sxy = np.zeros(size)
+    
+    def _recompute_sums(self) -> None:
+        """Rebuild the running sums from the buffers"""
+        self._reset_sums()
+        for slot in range(self.window):
+            self._apply(slot, 1.0)
+        self._updates = 0
+    
+    def _apply(self, slot: int, sign: float) -> None:
+        """Add (sign=1) or remove (sign=-1) one slot's observations from the running sums"""
+        valid = self._valid[:, slot]
+        x = np.where(valid, self._mentions[:, slot], 0.0)
+        y = np.where(valid, self._returns[:, slot], 0.0)
+        
+        self._n += sign * valid
+        self._sx += sign * x
+        self._sy += sign * y
+        self._sxx += sign * x * x
+        self._syy += sign * y * y
+        self._sxy += sign * x * y
+    
+    def _to_dict(self, values: np.ndarray) -> Dict[str, Optional[float]]:
+        """Map per-sector values to sectors, hiding those without enough history"""
+        result = {}
+        for code, sector in enumerate(self.sectors):
+            value = values[code]
+            enough = self._n[code] >= self.min_observations
+            result[sector] = round(float(value), 3) if enough and np.isfinite(value) else None
+        return result
@@ -0,0 +1,201 @@
+"""
+Sentiment - Batched, memoized VADER sentiment analysis
+"""
+import logging
+import gc
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional
+
+from .sentiment_lexicon import LexiconSentimentAnalyzer, preload, lexicon_loaded
+
+logger = logging.getLogger(__name__)
+
+# Analyzer of the current pool worker process
+_worker_analyzer: Optional[LexiconSentimentAnalyzer] = None
+
+
+def format_scores(scores: Dict[str, float]) -> Dict[str, Any]:
+    """
+    Convert VADER polarity scores into a sentiment result with a label
+    
+    Args:
+        scores: Result of SentimentIntensityAnalyzer.polarity_scores
+    
+    Returns:
+        Dictionary with sentiment scores and label
+    """
+    # Determine sentiment label
+    if scores['compound'] >= 0.05:
+        label = "positive"
+    elif scores['compound'] <= -0.05:
+        label = "negative"
+    else:
+        label = "neutral"
+    
+    return {
+        "compound": round(scores['compound'], 3),
+        "positive": round(scores['pos'], 3),
+        "negative": round(scores['neg'], 3),
+        "neutral": round(scores['neu'], 3),
+        "label": label
+    }
+
+
+def _init_worker() -> None:
+    """Create the analyzer of a pool worker process once (reusing the inherited lexicon)"""
+    global _worker_analyzer
+    # Objects inherited from the parent (the lexicon) are never garbage; keep
+    # the worker's collections from scanning them
+    gc.freeze()
+    _worker_analyzer = LexiconSentimentAnalyzer()
+
+
+def _score_chunk(texts: List[str]) -> List[Dict[str, Any]]:
+    """Score a chunk of texts in a pool worker"""
+    return [format_scores(_worker_analyzer.polarity_scores(text)) for text in texts]
+
+
+class BatchSentimentAnalyzer:
+    """
+    VADER sentiment analysis with a persistent memo cache
+    
+    Results are cached by a hash of the whitespace-normalized text (case is
+    kept, since VADER scores ALL CAPS words differently), so identical
+    titles from different sources and runs are scored once. Batches dedupe
+    their texts and only score cache misses; large batches of misses can be
+    spread over a process pool.
+    """
+    
+    def __init__(self, cache_path: Optional[str] = None, workers: int = 0,
+                 pool_threshold: int = 500, max_entries: int = 100000):
+        """
+        Initialize the analyzer
+        
+        Args:
+            cache_path: Optional JSON file the cache is loaded from and saved to
+            workers: Number of worker processes for large batches (0 or 1 scores inline)
+            pool_threshold: Minimum number of cache misses in a batch before the pool is used
+            max_entries: Maximum number of cached results (oldest are dropped first)
+        """
+        self.cache_path = cache_path
+        self.workers = workers
+        self.pool_threshold = pool_threshold
+        self.max_entries = max_entries
+        
+        self._cache: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._analyzer: Optional[LexiconSentimentAnalyzer] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._dirty = False
+        
+        if cache_path and os.path.exists(cache_path):
+            self.load()
+    
+    def analyze(self, text: str) -> Dict[str, Any]:
+        """
+        Analyze the sentiment of one text
+        
+        Args:
+            text: Text to analyze
+        
+        Returns:
+            Dictionary with sentiment scores and label
+        """
+        return self.analyze_batch([text])[0]
+    
+    def analyze_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """
+        Analyze the sentiment of many texts
+        
+        Args:
+            texts: Texts to analyze
+        
+        Returns:
+            Sentiment results in the order of texts (equal texts share a result)
+        """
+        keys = [self._key(text) for text in texts]
+        
+        with self._lock:
+            known = {key: self._cache[key] for key in keys if key in self._cache}
+        
+        # Unique texts not in the cache yet
+        missing = {key: text for key, text in zip(keys, texts) if key not in known}
+        if missing:
+            scored = dict(zip(missing, self._score(list(missing.values()))))
+            known.update(scored)
+            # Neutral placeholders from a missing lexicon are not cached
+            if not lexicon_loaded():
+                return [dict(known[key]) for key in keys]
+            with self._lock:
+                self._cache.update(scored)
+                self._dirty = True
+                self._trim()
+        
+        return [dict(known[key]) for key in keys]
+    
+    def load(self) -> None:
+        """Load cached results from cache_path"""
+        try:
+            with open(self.cache_path) as f:
+                self._cache = json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading sentiment cache: {e}")
+    
+    def save(self) -> None:
+        """Save cached results to cache_path if they changed"""
+        if not self.cache_path or not self._dirty:
+            return
+        
+        try:
+            os.makedirs(os.path.dirname(self.cache_path) or '.', exist_ok=True)
+            with self._lock:
+                with open(self.cache_path, 'w') as f:
+                    json.dump(self._cache, f)
+                self._dirty = False
+        except Exception as e:
+            logger.error(f"Error saving sentiment cache: {e}")
+    
+    def close(self) -> None:
+        """Shut down the process pool"""
+        if self._pool:
+            self._pool.shutdown()
+            self._pool = None
+    
+    def _score(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Score texts, in worker processes if the batch is large enough"""
+        if self.workers > 1 and len(texts) >= self.pool_threshold and (self._pool or lexicon_loaded()):
+            if self._pool is None:
+                # Forked workers share the lexicon loaded here rather than each loading a copy
+                preload()
+                context = (multiprocessing.get_context("fork")
+                           if "fork" in multiprocessing.get_all_start_methods() else None)
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                                 initializer=_init_worker)
+            
+            # A few chunks per worker keeps them busy without much IPC overhead
+            size = max(1, -(-len(texts) // (self.workers * 4)))
+            chunks = [texts[i:i + size] for i in range(0, len(texts), size)]
+            return [result for chunk in self._pool.map(_score_chunk, chunks) for result in chunk]
+        
+        # An analyzer created while the lexicon was unavailable is replaced once it loads
+        if self._analyzer is None or not self._analyzer.lexicon:
+            self._analyzer = LexiconSentimentAnalyzer()
+        return [format_scores(self._analyzer.polarity_scores(text)) for text in texts]
+    
+    def _trim(self) -> None:
+        """Drop the oldest results beyond max_entries (lock must be held)"""
+        excess = len(self._cache) - self.max_entries
+        if excess > 0:
+            for key in list(self._cache)[:excess]:
+                del self._cache[key]
+    
+    @staticmethod
+    def _key(text: str) -> str:
+        """Hash of the whitespace-normalized text"""
+        normalized = " ".join((text or "").split())
+        return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
@@ -0,0 +1,193 @@
+"""
+Sentiment Lexicon - Precompiled VADER lexicon, loaded lazily and offline
+"""
+import logging
+import os
+import pickle
+import sys
+import threading
+import time
+from typing import Dict, Optional
+from nltk.sentiment.vader import SentimentIntensityAnalyzer, VaderConstants
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'vader_lexicon.pkl')
+
+# Location of the lexicon text inside NLTK's data directories
+NLTK_LEXICON = "sentiment/vader_lexicon.zip/vader_lexicon/vader_lexicon.txt"
+
+FORMAT_VERSION = 1
+
+# Seconds to wait before trying to load an unavailable lexicon again
+RETRY_INTERVAL = 300.0
+
+_lexicon: Optional[Dict[str, float]] = None
+_retry_at = 0.0
+_lock = threading.Lock()
+
+
+def parse_lexicon(text: str) -> Dict[str, float]:
+    """
+    Parse VADER lexicon text (token, mean valence, ... per tab-separated line)
+    
+    Args:
+        text: Contents of vader_lexicon.txt
+    
+    Returns:
+        Dictionary mapping tokens to their valence
+    """
+    lexicon = {}
+    for line in text.split("\n"):
+        fields = line.strip().split("\t")
+        if len(fields) >= 2:
+            lexicon[fields[0]] = float(fields[1])
+    return lexicon
+
+
+def compile_lexicon(source: Optional[str] = None, path: str = DEFAULT_PATH) -> Dict[str, float]:
+    """
+    Compile the VADER lexicon text into the binary lexicon file
+    
+    Args:
+        source: Path of vader_lexicon.txt (defaults to the copy in NLTK's data directories)
+        path: Binary lexicon file to write
+    
+    Returns:
+        The compiled lexicon
+    """
+    if source:
+        with open(source, encoding="utf-8") as f:
+            text = f.read()
+    else:
+        import nltk.data
+        text = nltk.data.load(NLTK_LEXICON, format="text")
+    
+    lexicon = parse_lexicon(text)
+    _save_compiled(lexicon, path)
+    return lexicon
+
+
+def get_lexicon() -> Dict[str, float]:
+    """
+    Get the VADER lexicon, loading it on first use
+    
+    The binary lexicon file is loaded if present. Otherwise the lexicon text
+    is parsed from NLTK's data directories (downloading it there if needed)
+    and compiled for next time. If no lexicon can be found or downloaded,
+    an error is logged and an empty lexicon is returned, so texts score
+    neutral instead of the pipeline failing; loading is tried again on calls
+    made RETRY_INTERVAL seconds later. The lexicon is shared by every
+    analyzer in the process and is inherited by forked workers.
+    
+    Returns:
+        Dictionary mapping tokens to their valence (empty while unavailable)
+    """
+    global _lexicon, _retry_at
+    if _lexicon is not None:
+        return _lexicon
+    
+    with _lock:
+        if _lexicon is None and time.monotonic() >= _retry_at:
+            path = os.getenv('VADER_LEXICON_PATH', DEFAULT_PATH)
+            lexicon = _load_compiled(path)
+            if lexicon is None:
+                lexicon = _compile_from_nltk(path)
+            if lexicon is None:
+                _retry_at = time.monotonic() + RETRY_INTERVAL
+            _lexicon = lexicon
+    return _lexicon if _lexicon is not None else {}
+
+
+def lexicon_loaded() -> bool:
+    """Check whether the lexicon is loaded (False while it is unavailable)"""
+    return bool(get_lexicon())
+
+
+def preload() -> None:
+    """
+    Load the lexicon before forking worker processes
+    
+    Forked workers then inherit the loaded lexicon instead of loading their
+    own.
+    """
+    get_lexicon()
+
+
+class LexiconSentimentAnalyzer(SentimentIntensityAnalyzer):
+    """
+    VADER analyzer using the shared precompiled lexicon
+    
+    SentimentIntensityAnalyzer.__init__ reads and parses the lexicon text
+    from NLTK's data directories on every construction, which is what this
+    class avoids, so it is not called. Instead every attribute it sets is
+    set here, and make_lex_dict returns the shared lexicon.
+    """
+    
+    def __init__(self):
+        """Initialize the analyzer (loads the shared lexicon on first use)"""
+        self.lexicon_file = None
+        self.lexicon = self.make_lex_dict()
+        self.constants = VaderConstants()
+    
+    def make_lex_dict(self) -> Dict[str, float]:
+        """Get the shared lexicon instead of parsing lexicon_file"""
+        return get_lexicon()
+
+
+def _load_compiled(path: str) -> Optional[Dict[str, float]]:
+    """Load the binary lexicon file, or return None if it is missing or outdated"""
+    if not os.path.exists(path):
+        return None
+    
+    try:
+        with open(path, 'rb') as f:
+            data = pickle.load(f)
+    except Exception as e:
+        logger.warning(f"Error loading compiled sentiment lexicon: {e}")
+        return None
+    
+    if data.get("version") != FORMAT_VERSION:
+        logger.warning(f"Ignoring compiled sentiment lexicon with version {data.get('version')}")
+        return None
+    return data["lexicon"]
+
+
+def _save_compiled(lexicon: Dict[str, float], path: str) -> None:
+    """Write a parsed lexicon to the binary lexicon file"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'wb') as f:
+        pickle.dump({"version": FORMAT_VERSION, "lexicon": lexicon}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    
+    logger.info(f"Compiled {len(lexicon)} lexicon entries to {path}")
+
+
+def _compile_from_nltk(path: str) -> Optional[Dict[str, float]]:
+    """Parse the lexicon from NLTK's data directories and try to save it compiled (None if unavailable)"""
+    import nltk
+    try:
+        text = nltk.data.load(NLTK_LEXICON, format="text")
+    except LookupError:
+        logger.info("VADER lexicon not found, downloading it")
+        try:
+            nltk.download('vader_lexicon', quiet=True)
+            text = nltk.data.load(NLTK_LEXICON, format="text")
+        except Exception:
+            logger.error(
+                "VADER lexicon unavailable; sentiment scores will be neutral. Install it with "
+                "nltk.download('vader_lexicon') and run `python -m src.processors.sentiment_lexicon`, "
+                "or set VADER_LEXICON_PATH."
+            )
+            return None
+    
+    lexicon = parse_lexicon(text)
+    try:
+        _save_compiled(lexicon, path)
+    except OSError as e:
+        logger.warning(f"Could not save compiled sentiment lexicon: {e}")
+    return lexicon
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    compile_lexicon(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -0,0 +1,137 @@
+"""
+Topic Classifier - Multi-label TF-IDF classification of news items into topics
+"""
+import logging
+import re
+from itertools import chain
+from typing import List, Dict, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+class TopicClassifier:
+    """
+    Scores texts against topic centroids in a TF-IDF space
+    
+    Each topic is described by seed terms. A batch of texts is tokenized on
+    word boundaries into a sparse text x term matrix (coordinate arrays),
+    weighted by sublinear term frequency and by an IDF fitted on the batch
+    plus the seed descriptions, so terms common to most of the batch count
+    less. Cosine similarity to every topic centroid is computed with
+    np.bincount (only topic terms contribute to the dot products, but texts
+    are normalized by their full term vectors), and a text is labeled with
+    every topic it is similar enough to.
+    """
+    
+    DEFAULT_TOPICS = {
+        "technology": ["ai", "artificial", "intelligence", "tech", "technology", "software", "programming",
+                       "hardware", "cyber", "cybersecurity", "data", "chip", "semiconductor", "cloud",
+                       "computing", "robot", "robotic", "developer", "algorithm", "gpu", "llm", "app"],
+        "business": ["business", "economic", "economy", "market", "finance", "financial", "invest", "investing",
+                     "investment", "investor", "stock", "startup", "earning", "revenue", "profit", "ipo",
+                     "merger", "acquisition", "funding", "ceo", "company"],
+        "crypto": ["crypto", "cryptocurrency", "bitcoin", "ethereum", "blockchain", "web3", "nft", "defi",
+                   "stablecoin", "token", "btc", "eth", "coinbase", "binance"],
+        "science": ["science", "scientific", "scientist", "research", "researcher", "study", "physics",
+                    "biology", "chemistry", "medicine", "medical", "health", "space", "nasa", "climate",
+                    "quantum", "gene", "genetic"],
+        "policy": ["policy", "regulation", "regulator", "regulatory", "government", "law", "legal", "lawsuit",
+                   "court", "compliance", "congress", "senate", "antitrust", "ban", "tariff", "sanction",
+                   "election", "legislation"]
+    }
+    
+    def __init__(self, topics: Optional[Dict[str, List[str]]] = None, min_similarity: float = 0.05):
+        """
+        Initialize the classifier
+        
+        Args:
+            topics: Optional topic -> seed terms mapping (defaults to DEFAULT_TOPICS)
+            min_similarity: Minimum cosine similarity for a topic label
+        """
+        self.topics = topics or self.DEFAULT_TOPICS
+        self.min_similarity = min_similarity
+        
+        # Topic vocabulary: the seed terms get the first term IDs
+        self._seeds = [sorted(set(chain.from_iterable(map(self.terms, seeds)))) for seeds in self.topics.values()]
+        self._vocabulary: Dict[str, int] = {}
+        for seeds in self._seeds:
+            for term in seeds:
+                self._vocabulary.setdefault(term, len(self._vocabulary))
+        
+        self._seed_df = np.zeros(len(self._vocabulary))
+        for seeds in self._seeds:
+            self._seed_df[[self._vocabulary[term] for term in seeds]] += 1
+    
+    def similarities(self, texts: List[str]) -> np.ndarray:
+        """
+        Cosine similarity of each text to each topic centroid
+        
+        Args:
+            texts: Texts to score
+        
+        Returns:
+            Array of shape (texts, topics), in the order of self.topics
+        """
+        n, topic_terms = len(texts), len(self._vocabulary)
+        tokens = [self.terms(text) for text in texts]
+        vocabulary = dict(self._vocabulary)
+        term = np.fromiter((vocabulary.setdefault(t, len(vocabulary)) for t in chain.from_iterable(tokens)),
+                           dtype=np.int64)
+        doc = np.repeat(np.arange(n), np.fromiter(map(len, tokens), dtype=np.int64, count=n))
+        
+        # Sparse term counts as (doc, term, count) triples
+        size = max(len(vocabulary), 1)
+        cells, counts = np.unique(doc * size + term, return_counts=True)
+        doc, term = cells // size, cells % size
+        
+        df = np.bincount(term, minlength=len(vocabulary)).astype(float)
+        df[:topic_terms] += self._seed_df
+        idf = np.log((1 + n + len(self._seeds)) / (1 + df)) + 1
+        
+        # Norms cover every term of a text, so off-topic words dilute its similarity
+        weights = (1 + np.log(counts)) * idf[term]
+        norms = np.sqrt(np.bincount(doc, weights * weights, minlength=n))
+        
+        # Only the topic vocabulary can contribute to the dot products
+        topic = term < topic_terms
+        doc, term, weights = doc[topic], term[topic], weights[topic]
+        
+        scores = np.zeros((n, len(self._seeds)))
+        for k, seeds in enumerate(self._seeds):
+            centroid = np.zeros(topic_terms)
+            ids = [self._vocabulary[t] for t in seeds]
+            centroid[ids] = idf[ids]
+            centroid /= np.linalg.norm(centroid) or 1.0
+            
+            dots = np.bincount(doc, weights * centroid[term], minlength=n)
+            scores[:, k] = np.divide(dots, norms, out=np.zeros(n), where=norms > 0)
+        return scores
+    
+    def classify(self, texts: List[str]) -> List[List[Tuple[str, float]]]:
+        """
+        Label texts with topics
+        
+        Args:
+            texts: Texts to classify
+        
+        Returns:
+            Per text, (topic, confidence) pairs above min_similarity, most confident first
+        """
+        names = list(self.topics)
+        scores = self.similarities(texts)
+        labels = []
+        for row in scores.tolist():
+            matched = [(names[k], round(score, 3)) for k, score in enumerate(row) if score >= self.min_similarity]
+            labels.append(sorted(matched, key=lambda label: label[1], reverse=True))
+        return labels
+    
+    @staticmethod
+    def terms(text: str) -> List[str]:
+        """Lowercase words of a text, with plurals folded ("stocks" -> "stock")"""
+        words = _WORD.findall((text or "").lower())
+        return [word[:-1] if len(word) > 3 and word.endswith('s') and not word.endswith('ss') else word
+                for word in words]
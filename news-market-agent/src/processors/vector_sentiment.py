@@ -0,0 +1,293 @@
+"""
+Vector Sentiment - Vectorized VADER sentiment scoring for large batches of text
+"""
+import logging
+import re
+import string
+from itertools import chain
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+from nltk.sentiment.vader import VaderConstants
+
+from .sentiment import format_scores
+from .sentiment_lexicon import get_lexicon
+
+logger = logging.getLogger(__name__)
+
+# VADER strips one punctuation mark (or run such as "!!") from either end of a word
+_CORE = f"[^{re.escape(string.punctuation)}\\s]{{2,}}"
+_MARKS = "|".join(re.escape(mark) for mark in sorted(VaderConstants.PUNC_LIST, key=len, reverse=True))
+_PUNC_AFTER = re.compile(f"^({_CORE})(?:{_MARKS})$")
+_PUNC_BEFORE = re.compile(f"^(?:{_MARKS})({_CORE})$")
+
+# Sentence boundaries within article bodies
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+|\n+")
+
+# Scale of booster words 1, 2 and 3 tokens before a sentiment word
+_WINDOW_SCALES = (1.0, 0.95, 0.9)
+
+
+class _TokenCodes(dict):
+    """Token -> feature row mapping that adds the features of unseen tokens"""
+    
+    def __init__(self, scorer: "VectorSentimentScorer"):
+        super().__init__()
+        self.scorer = scorer
+    
+    def __missing__(self, token: str) -> int:
+        code = self[token] = self.scorer._add_token(token)
+        return code
+
+
+class VectorSentimentScorer:
+    """
+    Scores many texts at once with VADER's lexicon and rules, in NumPy
+    
+    A batch is split into whitespace tokens and each distinct token's
+    features (valence, booster, negation, caps, "but", ...) are computed
+    once. The batch then becomes a sparse text x term matrix in coordinate
+    form (segment and term index per token). Negation and booster windows
+    are shifted array operations, and per-text sums are np.bincount
+    reductions - a sparse matrix-vector product with the lexicon weights.
+    
+    Scores follow VADER's polarity_scores, except that its idiom rule is
+    not applied. Article bodies are scored per
+    sentence and averaged, as VADER is meant to be used on long text.
+    """
+    
+    # Feature column types (the others are flags)
+    _DTYPES = {"word": np.int64, "valence": float, "booster": float}
+    
+    def __init__(self, lexicon: Optional[Dict[str, float]] = None, max_tokens: int = 200000):
+        """
+        Initialize the scorer
+        
+        Args:
+            lexicon: Optional token -> valence mapping (defaults to the shared VADER lexicon)
+            max_tokens: Maximum number of distinct tokens whose features are kept between batches
+        """
+        self.lexicon = lexicon if lexicon is not None else get_lexicon()
+        self.constants = VaderConstants()
+        self.max_tokens = max_tokens
+        self._reset()
+    
+    def polarity_scores(self, texts: List[str]) -> Dict[str, np.ndarray]:
+        """
+        Score texts like VADER's polarity_scores, one text per row
+        
+        Args:
+            texts: Texts to score (e.g. titles)
+        
+        Returns:
+            Dictionary of "compound", "pos", "neg" and "neu" arrays
+        """
+        compound, pos, neg, neu, _ = self._score_segments(texts)
+        return {"compound": compound, "pos": pos, "neg": neg, "neu": neu}
+    
+    def score(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """
+        Analyze the sentiment of short texts
+        
+        Args:
+            texts: Texts to analyze (e.g. titles)
+        
+        Returns:
+            Sentiment results in the order of texts, formatted like BatchSentimentAnalyzer's
+        """
+        return self._format(self.polarity_scores(texts))
+    
+    def score_documents(self, documents: List[str]) -> List[Dict[str, Any]]:
+        """
+        Analyze the sentiment of long texts, averaging over their sentences
+        
+        Args:
+            documents: Texts to analyze (e.g. article bodies)
+        
+        Returns:
+            Sentiment results in the order of documents, with the number of
+            non-empty sentences under "sentences"
+        """
+        sentences = [[s for s in _SENTENCE_END.split(document or "") if s] for document in documents]
+        lengths = np.fromiter(map(len, sentences), dtype=np.int64, count=len(documents))
+        compound, pos, neg, neu, counts = self._score_segments(list(chain.from_iterable(sentences)))
+        
+        # Average over sentences with at least one token
+        document = np.repeat(np.arange(len(documents)), lengths)
+        weight = (counts > 0).astype(float)
+        total = np.bincount(document, weight, minlength=len(documents))
+        
+        scores = {}
+        for name, values in (("compound", compound), ("pos", pos), ("neg", neg), ("neu", neu)):
+            sums = np.bincount(document, values * weight, minlength=len(documents))
+            scores[name] = np.divide(sums, total, out=np.zeros(len(documents)), where=total > 0)
+        
+        results = self._format(scores)
+        for result, count in zip(results, total.astype(int).tolist()):
+            result["sentences"] = count
+        return results
+    
+    def _score_segments(self, segments: List[str]) -> tuple:
+        """Score each segment as one VADER text; returns score arrays and token counts"""
+        n = len(segments)
+        if len(self._codes) > self.max_tokens:
+            self._reset()
+        
+        split = [segment.split() for segment in segments]
+        lengths = np.fromiter(map(len, split), dtype=np.int64, count=n)
+        tokens = list(chain.from_iterable(split))
+        codes = np.fromiter(map(self._codes.__getitem__, tokens), dtype=np.int64, count=len(tokens))
+        features = self._feature_arrays()
+        
+        # Drop single-character tokens, as VADER does
+        segment = np.repeat(np.arange(n), lengths)
+        keep = ~features["skip"][codes]
+        codes, segment = codes[keep], segment[keep]
+        
+        counts = np.bincount(segment, minlength=n)
+        starts = np.cumsum(counts) - counts
+        position = np.arange(len(codes)) - starts[segment]
+        
+        # Some but not all tokens of the segment in ALL CAPS
+        upper = features["upper"][codes]
+        upper_counts = np.bincount(segment, upper, minlength=n)
+        cap_diff = ((upper_counts > 0) & (upper_counts < counts))[segment]
+        
+        c_incr, n_scalar = self.constants.C_INCR, self.constants.N_SCALAR
+        in_lexicon = features["in_lexicon"][codes]
+        valence = features["valence"][codes]
+        valence = np.where(in_lexicon & upper & cap_diff,
+                           valence + np.where(valence > 0, c_incr, -c_incr), valence)
+        
+        # Boosters and negations in the three preceding tokens (the nearest applies first)
+        index = np.arange(len(codes))
+        preceding = [codes[np.maximum(index - distance, 0)] for distance in (1, 2, 3)]
+        never, so_this = features["never"], features["so_this"]
+        for distance, scale in enumerate(_WINDOW_SCALES, start=1):
+            previous = preceding[distance - 1]
+            applies = in_lexicon & (position >= distance) & ~features["in_lexicon"][previous]
+            
+            boost = features["booster"][previous]
+            boost = np.where(valence < 0, -boost, boost)
+            capped = (boost != 0) & features["upper"][previous] & cap_diff
+            boost = np.where(capped, boost + np.where(valence > 0, c_incr, -c_incr), boost) * scale
+            
+            valence = np.where(applies, valence + boost, valence)
+            
+            # "never so/this" intensifies rather than negates
+            if distance == 1:
+                factor = np.where(features["negation"][previous], n_scalar, 1.0)
+            elif distance == 2:
+                factor = np.where(never[previous] & so_this[preceding[0]], 1.5,
+                                  np.where(features["negation"][previous], n_scalar, 1.0))
+            else:
+                factor = np.where((never[previous] & so_this[preceding[1]]) | so_this[preceding[0]], 1.25,
+                                  np.where(features["negation"][previous], n_scalar, 1.0))
+            valence = np.where(applies, valence * factor, valence)
+        
+        # "least" right before a sentiment word negates it, except in "at least" and "very least"
+        after_least = (in_lexicon & (position >= 1) & features["least"][preceding[0]]
+                       & ~features["in_lexicon"][preceding[0]])
+        after_least &= (position < 2) | ~features["at_very"][preceding[1]]
+        valence = np.where(after_least, valence * n_scalar, valence)
+        
+        # Boosters themselves and "kind" in "kind of" carry no sentiment
+        following = codes[np.minimum(index + 1, max(len(codes) - 1, 0))]
+        kind_of = (features["kind"][codes] & (position < counts[segment] - 1) & features["of"][following])
+        valence = np.where((features["booster"][codes] != 0) | kind_of, 0.0, valence)
+        
+        # VADER scores a repeated word in the context of its first occurrence in the text
+        occurrence = segment * len(features["word"]) + features["word"][codes]
+        _, first, inverse = np.unique(occurrence, return_index=True, return_inverse=True)
+        valence = valence[first][inverse]
+        
+        # Tokens before the first "but" count half, tokens after it count one and a half times
+        is_but = features["but"][codes]
+        first_but = np.full(n, np.iinfo(np.int64).max)
+        np.minimum.at(first_but, segment[is_but], position[is_but])
+        but_at = first_but[segment]
+        has_but = but_at < np.iinfo(np.int64).max
+        valence = valence * np.where(has_but & (position < but_at), 0.5,
+                                     np.where(has_but & (position > but_at), 1.5, 1.0))
+        
+        # Per-segment sums (the term matrix times the adjusted weights)
+        total = np.bincount(segment, valence, minlength=n)
+        pos_sum = np.bincount(segment, np.where(valence > 0, valence + 1, 0.0), minlength=n)
+        neg_sum = np.bincount(segment, np.where(valence < 0, valence - 1, 0.0), minlength=n)
+        neu_count = np.bincount(segment, valence == 0, minlength=n)
+        
+        emphasis = self._punctuation_emphasis(segments)
+        total = total + np.sign(total) * emphasis
+        compound = np.round(total / np.sqrt(total * total + 15), 4)
+        
+        pos_sum = np.where(pos_sum > -neg_sum, pos_sum + emphasis, pos_sum)
+        neg_sum = np.where(pos_sum < -neg_sum, neg_sum - emphasis, neg_sum)
+        denominator = pos_sum - neg_sum + neu_count
+        
+        empty = counts == 0
+        ratios = []
+        for part in (pos_sum, -neg_sum, neu_count):
+            ratio = np.divide(part, denominator, out=np.zeros(n), where=~empty)
+            ratios.append(np.round(np.abs(ratio), 3))
+        compound[empty] = 0.0
+        
+        return (compound, *ratios, counts)
+    
+    def _punctuation_emphasis(self, segments: List[str]) -> np.ndarray:
+        """Emphasis added by exclamation points (up to 4) and repeated question marks"""
+        exclamations = np.fromiter((s.count("!") for s in segments), dtype=float, count=len(segments))
+        questions = np.fromiter((s.count("?") for s in segments), dtype=float, count=len(segments))
+        
+        emphasis = np.minimum(exclamations, 4) * 0.292
+        emphasis += np.where(questions > 3, 0.96, np.where(questions > 1, questions * 0.18, 0.0))
+        return emphasis
+    
+    def _add_token(self, token: str) -> int:
+        """Compute the features of a token and return its feature row"""
+        word = token
+        match = _PUNC_AFTER.match(token) or _PUNC_BEFORE.match(token)
+        if match:
+            word = match.group(1)
+        lower = word.lower()
+        
+        features = self._features
+        features["word"].append(self._words.setdefault(word, len(self._words)))
+        features["skip"].append(len(token) <= 1)
+        features["valence"].append(self.lexicon.get(lower, 0.0))
+        features["in_lexicon"].append(lower in self.lexicon)
+        features["upper"].append(word.isupper())
+        features["booster"].append(self.constants.BOOSTER_DICT.get(lower, 0.0))
+        features["negation"].append(self.constants.negated([word]))
+        features["but"].append(lower == "but")
+        features["kind"].append(lower == "kind")
+        features["of"].append(lower == "of")
+        features["least"].append(lower == "least")
+        features["at_very"].append(lower in ("at", "very"))
+        features["never"].append(word == "never")
+        features["so_this"].append(word in ("so", "this"))
+        
+        self._arrays = None
+        return len(features["skip"]) - 1
+    
+    def _feature_arrays(self) -> Dict[str, np.ndarray]:
+        """Feature columns as arrays, rebuilt only when new tokens were added"""
+        if self._arrays is None:
+            self._arrays = {name: np.array(values, dtype=self._DTYPES.get(name, bool))
+                            for name, values in self._features.items()}
+        return self._arrays
+    
+    def _reset(self) -> None:
+        """Forget all token features"""
+        self._codes = _TokenCodes(self)
+        self._words: Dict[str, int] = {}  # Token without punctuation -> word ID
+        self._features: Dict[str, list] = {name: [] for name in (
+            "word", "skip", "valence", "in_lexicon", "upper", "booster", "negation", "but", "kind", "of", "least",
+            "at_very", "never", "so_this")}
+        self._arrays: Optional[Dict[str, np.ndarray]] = None
+    
+    @staticmethod
+    def _format(scores: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+        """Format score arrays as sentiment results"""
+        return [format_scores({"compound": c, "pos": p, "neg": ng, "neu": nu})
+                for c, p, ng, nu in zip(scores["compound"].tolist(), scores["pos"].tolist(),
+                                        scores["neg"].tolist(), scores["neu"].tolist())]
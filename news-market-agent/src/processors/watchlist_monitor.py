@@ -0,0 +1,250 @@
+"""
+Watchlist Monitor - Polls company data for a watchlist and emits only what changed
+"""
+import logging
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+from typing import List, Dict, Any, Optional
+
+from ..interfaces.company_monitor_interface import CompanyMonitorInterface
+
+logger = logging.getLogger(__name__)
+
+class WatchlistMonitor:
+    """
+    Polls profiles, financials, news and insider trades for a watchlist
+    
+    Each endpoint has its own cadence. Due tickers are fetched per endpoint
+    with one bulk request (which the interface batches or parallelizes).
+    Every payload is hashed; unchanged payloads are skipped without further
+    work. For changed payloads, lists (news, insider trades) yield their new
+    items by ID and dictionaries (profile, financials) yield their changed
+    fields. Changes are put on a queue and appended to a JSONL file, and the
+    last seen state is persisted so restarts don't re-emit old changes.
+    """
+    
+    # Seconds between polls of each endpoint
+    DEFAULT_CADENCES = {
+        "profile": 24 * 3600,
+        "financials": 6 * 3600,
+        "news": 5 * 60,
+        "insider_trading": 3600
+    }
+    
+    # Endpoints returning lists of items with IDs
+    LIST_ENDPOINTS = ("news", "insider_trading")
+    
+    # Fields that change on every response and don't count as changes
+    VOLATILE_FIELDS = ("last_updated",)
+    
+    def __init__(self, company_monitor: CompanyMonitorInterface, tickers: List[str],
+                 cadences: Optional[Dict[str, float]] = None, data_dir: str = 'data',
+                 changes_path: Optional[str] = None, emit_initial: bool = False):
+        """
+        Initialize the watchlist monitor
+        
+        Args:
+            company_monitor: Interface used to fetch company data
+            tickers: Watchlist tickers
+            cadences: Optional per-endpoint poll intervals in seconds
+                      (endpoints missing from DEFAULT_CADENCES are ignored)
+            data_dir: Directory for the monitor state and the changes file
+            changes_path: JSONL file changes are appended to
+                          (defaults to data_dir/watchlist_changes.jsonl)
+            emit_initial: Whether the first observation of a payload is emitted
+                          as a change, rather than only recorded
+        """
+        self.company_monitor = company_monitor
+        self.tickers = list(dict.fromkeys(ticker.upper() for ticker in tickers))
+        self.cadences = {endpoint: (cadences or {}).get(endpoint, cadence)
+                         for endpoint, cadence in self.DEFAULT_CADENCES.items()}
+        self.state_path = os.path.join(data_dir, 'watchlist_state.json')
+        self.changes_path = changes_path or os.path.join(data_dir, 'watchlist_changes.jsonl')
+        self.emit_initial = emit_initial
+        
+        self.changes: queue.Queue = queue.Queue()
+        
+        # endpoint -> ticker -> {"hash", "polled_at", and "items" or "fields"}
+        self._state: Dict[str, Dict[str, Dict[str, Any]]] = {endpoint: {} for endpoint in self.cadences}
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        
+        if os.path.exists(self.state_path):
+            self.load()
+    
+    def poll(self, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Poll every endpoint that is due for some tickers and emit the changes
+        
+        Args:
+            now: Unix time to check cadences against (defaults to now)
+        
+        Returns:
+            List of changes emitted by this poll
+        """
+        now = time.time() if now is None else now
+        emitted = []
+        
+        for endpoint, cadence in self.cadences.items():
+            seen = self._state[endpoint]
+            due = [ticker for ticker in self.tickers
+                   if ticker not in seen or now - seen[ticker]["polled_at"] >= cadence]
+            if not due:
+                continue
+            
+            payloads = self.company_monitor.get_companies_bulk(due, fields=[endpoint])
+            for ticker in due:
+                data = payloads.get(ticker, {})
+                if endpoint not in data:
+                    # Failed requests are left out of the bulk result; try again next tick
+                    continue
+                payload = data[endpoint]
+                if payload is None:
+                    continue
+                change = self._detect_change(endpoint, ticker, payload, now)
+                if change:
+                    emitted.append(change)
+        
+        if emitted:
+            self._emit(emitted)
+        self.save()
+        return emitted
+    
+    def run(self, tick: float = 30.0) -> None:
+        """
+        Poll until stopped
+        
+        Args:
+            tick: Seconds between checks for due endpoints
+        """
+        logger.info(f"Monitoring {len(self.tickers)} tickers (changes go to {self.changes_path})")
+        while not self._stop.is_set():
+            try:
+                changes = self.poll()
+                if changes:
+                    logger.info(f"Detected {len(changes)} watchlist changes")
+            except Exception as e:
+                logger.error(f"Error polling watchlist: {e}")
+            self._stop.wait(tick)
+    
+    def start(self, tick: float = 30.0) -> None:
+        """Start polling in a background thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, args=(tick,), name="watchlist-monitor", daemon=True)
+        self._thread.start()
+    
+    def stop(self) -> None:
+        """Stop polling"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+    
+    def load(self) -> None:
+        """Load the last seen state from state_path"""
+        try:
+            with open(self.state_path) as f:
+                state = json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading watchlist state: {e}")
+            return
+        
+        for endpoint in self._state:
+            self._state[endpoint] = state.get(endpoint, {})
+    
+    def save(self) -> None:
+        """Save the last seen state to state_path"""
+        try:
+            os.makedirs(os.path.dirname(self.state_path) or '.', exist_ok=True)
+            with open(self.state_path, 'w') as f:
+                json.dump(self._state, f)
+        except Exception as e:
+            logger.error(f"Error saving watchlist state: {e}")
+    
+    def _detect_change(self, endpoint: str, ticker: str, payload: Any, now: float) -> Optional[Dict[str, Any]]:
+        """Compare a payload with the last one seen and record it; returns the change, if any"""
+        previous = self._state[endpoint].get(ticker)
+        digest = self._hash(payload)
+        
+        if previous is not None and previous["hash"] == digest:
+            previous["polled_at"] = now
+            return None
+        
+        if endpoint in self.LIST_ENDPOINTS:
+            ids = [self._item_id(item) for item in payload]
+            self._state[endpoint][ticker] = {"hash": digest, "polled_at": now, "items": ids}
+            if previous is None and not self.emit_initial:
+                return None
+            
+            known = set((previous or {}).get("items", []))
+            new_items = [item for item, item_id in zip(payload, ids) if item_id not in known]
+            if not new_items:
+                return None
+            return {"ticker": ticker, "endpoint": endpoint, "type": "new_items",
+                    "items": new_items, "detected_at": now}
+        
+        fields = self._flatten(payload)
+        self._state[endpoint][ticker] = {"hash": digest, "polled_at": now, "fields": fields}
+        if previous is None and not self.emit_initial:
+            return None
+        
+        old_fields = (previous or {}).get("fields", {})
+        changes = {field: {"old": old_fields.get(field), "new": value}
+                   for field, value in fields.items() if old_fields.get(field) != value}
+        changes.update({field: {"old": value, "new": None}
+                        for field, value in old_fields.items() if field not in fields})
+        if not changes:
+            return None
+        return {"ticker": ticker, "endpoint": endpoint, "type": "changed_fields",
+                "changes": changes, "detected_at": now}
+    
+    def _emit(self, changes: List[Dict[str, Any]]) -> None:
+        """Put changes on the queue and append them to the changes file"""
+        for change in changes:
+            self.changes.put(change)
+        
+        try:
+            os.makedirs(os.path.dirname(self.changes_path) or '.', exist_ok=True)
+            with open(self.changes_path, 'a') as f:
+                for change in changes:
+                    f.write(json.dumps(change, default=str) + "\n")
+        except Exception as e:
+            logger.error(f"Error writing watchlist changes: {e}")
+    
+    def _item_id(self, item: Dict[str, Any]) -> str:
+        """Identify a list item by its ID, or by its content if it has none"""
+        return str(item.get("id") or self._hash(item))
+    
+    def _hash(self, payload: Any) -> str:
+        """Hash a payload, ignoring volatile fields"""
+        encoded = json.dumps(self._strip_volatile(payload), sort_keys=True, default=str)
+        return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+    
+    def _strip_volatile(self, payload: Any) -> Any:
+        """Drop volatile fields from a payload, recursively"""
+        if isinstance(payload, dict):
+            return {key: self._strip_volatile(value) for key, value in payload.items()
+                    if key not in self.VOLATILE_FIELDS}
+        if isinstance(payload, list):
+            return [self._strip_volatile(value) for value in payload]
+        return payload
+    
+    def _flatten(self, payload: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+        """Flatten nested dictionaries into dotted field names"""
+        fields = {}
+        for key, value in payload.items():
+            if key in self.VOLATILE_FIELDS:
+                continue
+            name = f"{prefix}{key}"
+            if isinstance(value, dict):
+                fields.update(self._flatten(value, f"{name}."))
+            else:
+                fields[name] = value
+        return fields
@@ -0,0 +1,290 @@
+"""
+Columnar Export - Arrow and Parquet snapshots of a pipeline run
+"""
+import logging
+import os
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Optional dependency, only needed for columnar exports
+    pa = None
+    pq = None
+
+# Local imports
+from ..storage.mention_index import MentionIndex
+from ..utils.items import item_key
+
+logger = logging.getLogger(__name__)
+
+# Bumped whenever a table's columns change
+SCHEMA_VERSION = 1
+
+FORMATS = ("arrow", "parquet")
+
+class SnapshotExporter:
+    """
+    Writes the data of one run as flat tables with a fixed schema
+    
+    Each run becomes a directory of tables - news, sentiment, impact,
+    mentions, market and run_info - joined on the item key column rather
+    than nested. The "arrow" format writes uncompressed Arrow IPC files,
+    which readers can memory-map without copying or parsing (see
+    read_snapshot); "parquet" writes smaller Parquet files for archiving.
+    Requires pyarrow.
+    """
+    
+    TABLES = ("news", "sentiment", "impact", "mentions", "market", "run_info")
+    
+    def __init__(self, output_dir: str = 'reports', file_format: str = "arrow"):
+        """
+        Initialize the exporter
+        
+        Args:
+            output_dir: Directory under which each run's tables are written
+            file_format: "arrow" (memory-mappable IPC files) or "parquet"
+        """
+        if pa is None:
+            raise ImportError("pyarrow is required for columnar exports (pip install pyarrow)")
+        if file_format not in FORMATS:
+            raise ValueError(f"file_format must be one of {FORMATS}")
+        
+        self.output_dir = output_dir
+        self.file_format = file_format
+    
+    @staticmethod
+    def available() -> bool:
+        """Check whether pyarrow is installed"""
+        return pa is not None
+    
+    @staticmethod
+    def schemas() -> Dict[str, 'pa.Schema']:
+        """Get the schema of every table"""
+        return {
+            "news": pa.schema([
+                ("key", pa.string()),
+                ("source", pa.string()),
+                ("id", pa.string()),
+                ("title", pa.string()),
+                ("url", pa.string()),
+                ("score", pa.int64()),
+                ("comments", pa.int64()),
+                ("published_at", pa.timestamp("ms", tz="UTC")),
+                ("topics", pa.list_(pa.string())),
+                ("cluster_size", pa.int32())
+            ]),
+            "sentiment": pa.schema([
+                ("key", pa.string()),
+                ("target", pa.string()),  # "title" or "content"
+                ("label", pa.string()),
+                ("negative", pa.float64()),
+                ("neutral", pa.float64()),
+                ("positive", pa.float64()),
+                ("compound", pa.float64())
+            ]),
+            "impact": pa.schema([
+                ("key", pa.string()),
+                ("impact_level", pa.string()),
+                ("direction", pa.string()),
+                ("affected_sectors", pa.list_(pa.string())),
+                ("confidence_score", pa.float64()),
+                ("timeframe", pa.string())
+            ]),
+            "mentions": pa.schema([
+                ("key", pa.string()),
+                ("ticker", pa.string()),
+                ("mentions", pa.int32()),
+                ("in_title", pa.bool_())
+            ]),
+            "market": pa.schema([
+                ("category", pa.string()),  # "index", "sector", "mood" or "indicator"
+                ("name", pa.string()),
+                ("metric", pa.string()),
+                ("value", pa.float64())
+            ]),
+            "run_info": pa.schema([
+                ("name", pa.string()),
+                ("value", pa.string())
+            ])
+        }
+    
+    def export(self, run_id: str, news_items: List[Dict[str, Any]],
+               market_data: Optional[Dict[str, Any]] = None,
+               correlation_data: Optional[Dict[str, Any]] = None,
+               mention_index: Optional[MentionIndex] = None,
+               run_info: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Write the tables of a run
+        
+        Args:
+            run_id: Run identifier (e.g. the report ID); names the run's directory
+            news_items: Processed news items
+            market_data: Optional market overview
+            correlation_data: Optional correlation data (with news_with_impact)
+            mention_index: Optional mention index of news_items (built here if not given)
+            run_info: Optional run-level values stored in the run_info table
+        
+        Returns:
+            Directory the tables were written to
+        """
+        correlation_data = correlation_data or {}
+        tables = {
+            "news": self._news_rows(news_items),
+            "sentiment": self._sentiment_rows(news_items),
+            "impact": self._impact_rows(correlation_data.get('news_with_impact', [])),
+            "mentions": self._mention_rows(mention_index or MentionIndex(news_items)),
+            "market": self._market_rows(market_data or {}),
+            "run_info": self._run_info_rows(run_id, news_items, run_info or {})
+        }
+        
+        directory = os.path.join(self.output_dir, run_id)
+        os.makedirs(directory, exist_ok=True)
+        
+        schemas = self.schemas()
+        for name, rows in tables.items():
+            table = pa.Table.from_pylist(rows, schema=schemas[name])
+            path = os.path.join(directory, f"{name}.{self.file_format}")
+            if self.file_format == "parquet":
+                pq.write_table(table, path)
+            else:
+                with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+        
+        logger.info(f"Exported {len(tables['news'])} news items as {self.file_format} tables to {directory}")
+        return directory
+    
+    def _news_rows(self, news_items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """One row per news item"""
+        rows = []
+        for position, item in enumerate(news_items):
+            timestamp = item.get('timestamp')
+            rows.append({
+                "key": item_key(item, fallback=position),
+                "source": item.get('source'),
+                "id": str(item['id']) if item.get('id') is not None else None,
+                "title": item.get('title'),
+                "url": item.get('url'),
+                "score": item.get('score'),
+                "comments": item.get('comments', item.get('descendants')),
+                "published_at": int(timestamp * 1000) if timestamp else None,
+                "topics": [topic['category'] for topic in item.get('topics', [])],
+                "cluster_size": item.get('cluster_size', 1)
+            })
+        return rows
+    
+    def _sentiment_rows(self, news_items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """One row per scored title or article body"""
+        rows = []
+        for position, item in enumerate(news_items):
+            key = item_key(item, fallback=position)
+            for target, field in (("title", 'sentiment'), ("content", 'content_sentiment')):
+                scores = item.get(field)
+                if isinstance(scores, dict):
+                    rows.append({
+                        "key": key,
+                        "target": target,
+                        "label": scores.get('label'),
+                        "negative": scores.get('negative'),
+                        "neutral": scores.get('neutral'),
+                        "positive": scores.get('positive'),
+                        "compound": scores.get('compound')
+                    })
+        return rows
+    
+    def _impact_rows(self, news_with_impact: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """One row per item with a market impact analysis"""
+        rows = []
+        for position, item in enumerate(news_with_impact):
+            impact = item.get('market_impact')
+            if impact:
+                rows.append({
+                    "key": item_key(item, fallback=position),
+                    "impact_level": impact.get('impact_level'),
+                    "direction": impact.get('direction'),
+                    "affected_sectors": impact.get('affected_sectors', []),
+                    "confidence_score": impact.get('confidence_score'),
+                    "timeframe": impact.get('timeframe')
+                })
+        return rows
+    
+    def _mention_rows(self, index: MentionIndex) -> List[Dict[str, Any]]:
+        """One row per item and mentioned company"""
+        keys = [item_key(item, fallback=doc) for doc, item in enumerate(index.items)]
+        rows = []
+        for ticker in index.company_mentions():
+            for doc, offsets in index.company_postings(ticker).items():
+                rows.append({
+                    "key": keys[doc],
+                    "ticker": ticker,
+                    "mentions": len(offsets),
+                    "in_title": offsets[0] < index.title_length(doc)
+                })
+        return rows
+    
+    def _market_rows(self, market_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Numeric market values in long form (category, name, metric, value)"""
+        rows = []
+        
+        def add(category: str, name: str, values: Dict[str, Any]) -> None:
+            for metric, value in values.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    rows.append({"category": category, "name": name, "metric": metric, "value": float(value)})
+        
+        summary = market_data.get('summary', {})
+        for name, values in summary.get('indices', {}).items():
+            add("index", name, values)
+        add("mood", "market_mood", summary.get('market_mood', {}))
+        
+        for sector in market_data.get('sector_performance', []):
+            add("sector", sector.get('sector'), sector)
+        
+        # Indicators are nested one or two levels deep (e.g. interest_rates.fed_funds_rate)
+        for name, values in market_data.get('economic_indicators', {}).items():
+            if isinstance(values, dict):
+                add("indicator", name, values)
+                for subname, subvalues in values.items():
+                    if isinstance(subvalues, dict):
+                        add("indicator", f"{name}.{subname}", subvalues)
+        return rows
+    
+    def _run_info_rows(self, run_id: str, news_items: List[Dict[str, Any]],
+                       run_info: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Run-level values as strings"""
+        values = {
+            "run_id": run_id,
+            "schema_version": SCHEMA_VERSION,
+            "exported_at": datetime.now().isoformat(),
+            "news_items": len(news_items),
+            **run_info
+        }
+        return [{"name": name, "value": None if value is None else str(value)} for name, value in values.items()]
+
+
+def read_snapshot(directory: str, tables: Optional[List[str]] = None) -> Dict[str, 'pa.Table']:
+    """
+    Read the tables of an exported run
+    
+    Arrow IPC files are memory-mapped, so the returned tables reference the
+    files' pages instead of copies (table.to_pandas() still copies).
+    
+    Args:
+        directory: Directory of the run, as returned by SnapshotExporter.export
+        tables: Optional table names to read (defaults to all that exist)
+    
+    Returns:
+        Dictionary mapping table names to Arrow tables
+    """
+    if pa is None:
+        raise ImportError("pyarrow is required for columnar exports (pip install pyarrow)")
+    
+    result = {}
+    for name in tables or SnapshotExporter.TABLES:
+        arrow_path = os.path.join(directory, f"{name}.arrow")
+        parquet_path = os.path.join(directory, f"{name}.parquet")
+        if os.path.exists(arrow_path):
+            result[name] = pa.ipc.open_file(pa.memory_map(arrow_path, "r")).read_all()
+        elif os.path.exists(parquet_path):
+            result[name] = pq.read_table(parquet_path, memory_map=True)
+    return result
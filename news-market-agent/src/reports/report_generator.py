@@ -2,35 +2,49 @@
 Report Generator - Generates structured reports from processed data
 """
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import json
 from datetime import datetime
 import os
 import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
-from collections import Counter
+
+# Local imports
+from ..utils.annotations import to_serializable
+from ..storage.mention_index import MentionIndex
+from .columnar_export import SnapshotExporter
 
 logger = logging.getLogger(__name__)
 
 class ReportGenerator:
     """Generates reports from processed news and market data"""
     
-    def __init__(self, output_dir: str = 'reports'):
+    def __init__(self, output_dir: str = 'reports', columnar_format: Optional[str] = "arrow"):
         """
         Initialize the report generator
         
         Args:
             output_dir: Directory to save generated reports
+            columnar_format: Format of the columnar snapshot exported with each daily
+                             digest ("arrow" or "parquet"; None disables the export)
         """
         self.output_dir = output_dir
         
         # Create output directory if it doesn't exist
         os.makedirs(output_dir, exist_ok=True)
+        
+        # Columnar snapshots need the optional pyarrow dependency
+        self.exporter = None
+        if columnar_format and SnapshotExporter.available():
+            self.exporter = SnapshotExporter(output_dir, columnar_format)
+        elif columnar_format:
+            logger.info("pyarrow not installed, columnar snapshots disabled")
     
     def generate_daily_digest(self, news_data: List[Dict[str, Any]], 
                              market_data: Dict[str, Any],
-                             correlation_data: Dict[str, Any]) -> Dict[str, Any]:
+                             correlation_data: Dict[str, Any],
+                             mention_index: Optional[MentionIndex] = None) -> Dict[str, Any]:
         """
         Generate a daily digest report
         
@@ -38,6 +52,7 @@ class ReportGenerator:
             news_data: Processed news data
             market_data: Processed market data
             correlation_data: Data correlating news and market
+            mention_index: Optional mention index of news_data (built here if not given)
             
         Returns:
             Report data
@@ -52,9 +67,13 @@ class ReportGenerator:
         news_with_impact = correlation_data.get('news_with_impact', [])
         company_mentions = correlation_data.get('company_mentions', {})
         
+        # Trending topics from the mention index
+        mention_index = mention_index or MentionIndex(news_data)
+        trending_topics = self._extract_trending_topics(news_data, mention_index)
+        
         # Generate insights
         market_insights = self._generate_market_insights(market_data)
-        news_insights = self._generate_news_insights(news_data)
+        news_insights = self._generate_news_insights(news_data, trending_topics)
         correlation_insights = self._generate_correlation_insights(correlation_data)
         
         # Compile the report
@@ -68,7 +87,7 @@ class ReportGenerator:
             },
             "news_summary": {
                 "top_stories": news_data[:5] if news_data else [],
-                "trending_topics": self._extract_trending_topics(news_data),
+                "trending_topics": trending_topics,
                 "sentiment_overview": self._analyze_overall_sentiment(news_data)
             },
             "key_companies": {
@@ -89,6 +108,10 @@ class ReportGenerator:
         # Save the report
         self._save_report(report, f"{report_id}.json")
         
+        # Export the run's data as flat tables for analytics
+        if self.exporter:
+            self._export_snapshot(report, news_data, market_data, correlation_data, mention_index)
+        
         return report
     
     def generate_company_report(self, ticker: str, company_data: Dict[str, Any],
@@ -259,7 +282,8 @@ class ReportGenerator:
         
         return insights
     
-    def _generate_news_insights(self, news_data: List[Dict[str, Any]]) -> List[str]:
+    def _generate_news_insights(self, news_data: List[Dict[str, Any]],
+                                trending_topics: Optional[List[tuple]] = None) -> List[str]:
         """Generate insights from news data"""
         insights = []
         
@@ -283,7 +307,8 @@ class ReportGenerator:
                 insights.append("News sentiment is mixed with no clear direction.")
         
         # Extract trending topics
-        trending_topics = self._extract_trending_topics(news_data)
+        if trending_topics is None:
+            trending_topics = self._extract_trending_topics(news_data)
         if trending_topics:
             top_topics = [topic for topic, _ in trending_topics[:3]]
             insights.append(f"Trending topics in the news: {', '.join(top_topics)}.")
@@ -354,6 +379,19 @@ class ReportGenerator:
             sectors_str = ', '.join(sectors)
             insights.append(f"Negative correlation between news mentions and performance in the {sectors_str} sector(s).")
         
+        # Report the strongest statistically significant abnormal return around news
+        significant = []
+        for ticker, windows in correlation_data.get('event_study', {}).get('by_ticker', {}).items():
+            for window, stats in windows.items():
+                t_stat = stats.get('t_stat')
+                if t_stat is not None and abs(t_stat) >= 2:
+                    significant.append((ticker, window, stats))
+        
+        if significant:
+            ticker, window, stats = max(significant, key=lambda x: abs(x[2]['mean_car_percent']))
+            insights.append(f"News about {ticker} was followed by a {stats['mean_car_percent']}% abnormal return "
+                            f"({window.replace('_', ' ')} window, {stats['events']} events).")
+        
         return insights
     
     def _generate_company_insights(self, ticker: str, company_data: Dict[str, Any], 
@@ -467,36 +505,15 @@ class ReportGenerator:
         
         return insights
     
-    def _extract_trending_topics(self, news_data: List[Dict[str, Any]]) -> List[tuple]:
+    def _extract_trending_topics(self, news_data: List[Dict[str, Any]],
+                                 index: Optional[MentionIndex] = None) -> List[tuple]:
         """Extract trending topics from news data"""
-        # Extract keywords and entities
-        keywords = []
-        
-        for item in news_data:
-            # Extract from title and content
-            title = item.get('title', '')
-            content = item.get('content', '')
-            
-            # Simple keyword extraction by splitting and filtering
-            title_words = title.lower().split()
-            title_words = [word for word in title_words if len(word) > 3]
-            
-            keywords.extend(title_words)
-            
-            # Extract entities if available
-            entities = item.get('entities', [])
-            for entity in entities:
-                if entity.get('type') in ['product', 'technology', 'topic']:
-                    keywords.append(entity.get('name', '').lower())
-        
-        # Count occurrences
-        keyword_counts = Counter(keywords)
+        # Title words longer than three letters plus tagged product, technology and topic entities
+        index = index or MentionIndex(news_data)
         
         # Filter out common stop words
         stop_words = ['this', 'that', 'with', 'from', 'have', 'has', 'had', 'are', 'were', 'what', 'when', 'while']
-        for word in stop_words:
-            if word in keyword_counts:
-                del keyword_counts[word]
+        keyword_counts = index.term_counts(titles_only=True, min_length=4, stop_words=stop_words)
         
         # Return top keywords
         return keyword_counts.most_common(10)
@@ -572,12 +589,30 @@ class ReportGenerator:
         # # Plot data
         # plt.savefig(f"{self.output_dir}/{report.get('report_id')}_chart.png")
     
+    def _export_snapshot(self, report: Dict[str, Any], news_data: List[Dict[str, Any]],
+                         market_data: Dict[str, Any], correlation_data: Dict[str, Any],
+                         mention_index: MentionIndex) -> None:
+        """Export the data behind a report as columnar tables next to it"""
+        sentiment = report['news_summary']['sentiment_overview']
+        try:
+            self.exporter.export(
+                report['report_id'], news_data, market_data, correlation_data, mention_index,
+                run_info={
+                    "report_type": report['report_type'],
+                    "generated_at": report['timestamp'],
+                    "sentiment_label": sentiment.get('label'),
+                    "sentiment_score": sentiment.get('score')
+                }
+            )
+        except Exception as e:
+            logger.error(f"Error exporting columnar snapshot: {e}")
+    
     def _save_report(self, report: Dict[str, Any], filename: str) -> None:
         """Save the report to disk"""
         try:
             filepath = os.path.join(self.output_dir, filename)
             with open(filepath, 'w') as f:
-                json.dump(report, f, indent=2)
+                json.dump(report, f, indent=2, default=to_serializable)
             logger.info(f"Report saved to {filepath}")
         except Exception as e:
             logger.error(f"Error saving report: {e}")
@@ -0,0 +1,307 @@
+"""
+Bar Store - Multi-resolution OHLC bar storage with incremental rollups
+"""
+import logging
+import os
+from typing import List, Dict, Any, Optional
+from datetime import date
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+class BarStore:
+    """
+    Stores daily OHLC bars per symbol and maintains weekly and monthly rollups
+    
+    Bars are kept as NumPy column arrays. Ingesting new daily bars only
+    resamples from the first week/month they touch onward; earlier rollup
+    bars are left as they are. Resampling is vectorized with ufunc.reduceat
+    over period boundaries. Weekly bars start on Monday; rollup bars are dated
+    by the first day of their period.
+    """
+    
+    FIELDS = ("open", "high", "low", "close", "volume")
+    ROLLUPS = ("W", "M")
+    
+    # A Monday, used to align weekly periods
+    _MONDAY = np.datetime64('1970-01-05', 'D')
+    
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the bar store
+        
+        Args:
+            path: Optional .npz file daily bars are loaded from and saved to
+        """
+        self.path = path
+        # symbol -> resolution ("D", "W", "M") -> column arrays including "date"
+        self._bars: Dict[str, Dict[str, Dict[str, np.ndarray]]] = {}
+        
+        if path and os.path.exists(path):
+            self.load()
+    
+    @property
+    def symbols(self) -> List[str]:
+        """Symbols with stored bars"""
+        return list(self._bars)
+    
+    def ingest(self, symbol: str, bars: List[Dict[str, Any]]) -> int:
+        """
+        Add or correct daily bars for a symbol
+        
+        Args:
+            symbol: Symbol the bars belong to
+            bars: Daily bars with date, open, high, low, close and volume
+                  (as returned by get_stock_data); a missing open, high or low
+                  defaults to the close and a missing volume to 0
+        
+        Returns:
+            Number of bars ingested
+        """
+        if not bars:
+            return 0
+        
+        columns = {"date": np.array([bar['date'] for bar in bars], dtype='datetime64[D]')}
+        for field in self.FIELDS:
+            columns[field] = np.array([bar.get(field, 0.0 if field == "volume" else bar['close'])
+                                       for bar in bars], dtype=float)
+        
+        self._ingest_columns(symbol, columns)
+        return len(bars)
+    
+    def ingest_ticks(self, symbol: str, timestamps: np.ndarray, prices: np.ndarray,
+                     sizes: Optional[np.ndarray] = None) -> int:
+        """
+        Aggregate intraday ticks (e.g. a QuoteRingBuffer snapshot) into daily bars
+        
+        A day covered only partially by the ticks replaces the stored bar for
+        that day, so only pass ticks for days whose stored bar they should
+        replace.
+        
+        Args:
+            symbol: Symbol the ticks belong to
+            timestamps: Unix timestamps in ascending order
+            prices: Tick prices
+            sizes: Optional tick sizes
+        
+        Returns:
+            Number of daily bars produced
+        """
+        if len(timestamps) == 0:
+            return 0
+        
+        days = np.asarray(timestamps, dtype=float).astype('datetime64[s]').astype('datetime64[D]')
+        prices = np.asarray(prices, dtype=float)
+        sizes = np.zeros(len(prices)) if sizes is None else np.asarray(sizes, dtype=float)
+        
+        columns = self._resample({"date": days, "open": prices, "high": prices, "low": prices,
+                                  "close": prices, "volume": sizes}, days)
+        self._ingest_columns(symbol, columns)
+        return len(columns["date"])
+    
+    def ingest_change(self, symbol: str, day: str, change_percent: float) -> None:
+        """
+        Extend a synthetic index series (e.g. a sector) by one day's percent change
+        
+        Each day opens at the previous day's close. Re-ingesting an earlier
+        day replaces it and re-chains the following days from its new close,
+        keeping their own percent changes.
+        
+        Args:
+            symbol: Series name
+            day: ISO date of the change
+            change_percent: Daily change in percent
+        """
+        day = np.datetime64(day, 'D')
+        daily = self._bars.get(symbol, {}).get("D")
+        
+        previous_close = 100.0
+        later = None
+        if daily is not None and len(daily["date"]):
+            # Chain from the last close before this day, so re-ingesting a day replaces it
+            position = np.searchsorted(daily["date"], day, side='left')
+            if position > 0:
+                previous_close = float(daily["close"][position - 1])
+            following = np.searchsorted(daily["date"], day, side='right')
+            if following < len(daily["date"]):
+                later = {field: values[following:] for field, values in daily.items()}
+        
+        close = previous_close * (1 + change_percent / 100)
+        columns = {
+            "date": np.array([day]),
+            "open": np.array([previous_close]),
+            "high": np.array([max(previous_close, close)]),
+            "low": np.array([min(previous_close, close)]),
+            "close": np.array([close]),
+            "volume": np.zeros(1)
+        }
+        
+        # Later days were chained from the old close; rescale them to open at the new one
+        if later is not None and later["open"][0]:
+            factor = close / later["open"][0]
+            for field in columns:
+                scaled = later[field] * factor if field in ("open", "high", "low", "close") else later[field]
+                columns[field] = np.concatenate([columns[field], scaled])
+        
+        self._ingest_columns(symbol, columns)
+    
+    def get_bars(self, symbol: str, resolution: str = "D", start: Optional[str] = None,
+                 end: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get stored bars for a symbol
+        
+        Args:
+            symbol: Symbol to get bars for
+            resolution: "D", "W" or "M"
+            start: Optional first ISO date to include
+            end: Optional last ISO date to include
+        
+        Returns:
+            List of bars, oldest first
+        """
+        columns = self._bars.get(symbol, {}).get(resolution)
+        if columns is None:
+            return []
+        
+        dates = columns["date"]
+        first = np.searchsorted(dates, np.datetime64(start, 'D'), side='left') if start else 0
+        last = np.searchsorted(dates, np.datetime64(end, 'D'), side='right') if end else len(dates)
+        
+        return [
+            {"date": str(dates[i]), **{field: float(columns[field][i]) for field in self.FIELDS}}
+            for i in range(first, last)
+        ]
+    
+    def last_date(self, symbol: str) -> Optional[date]:
+        """Get the date of the most recent daily bar for a symbol"""
+        daily = self._bars.get(symbol, {}).get("D")
+        if daily is None or not len(daily["date"]):
+            return None
+        return daily["date"][-1].astype(date)
+    
+    def change_percent(self, symbol: str, resolution: str = "D") -> Optional[float]:
+        """
+        Get the change of the latest close against the previous period's close
+        
+        Args:
+            symbol: Symbol to compute the change for
+            resolution: "D", "W" or "M"
+        
+        Returns:
+            Change in percent, or None without a previous period
+        """
+        columns = self._bars.get(symbol, {}).get(resolution)
+        if columns is None or len(columns["close"]) < 2:
+            return None
+        
+        previous, latest = columns["close"][-2], columns["close"][-1]
+        return round(float((latest - previous) / previous * 100), 2) if previous else None
+    
+    def load(self) -> None:
+        """Load daily bars from path and rebuild the rollups"""
+        try:
+            with np.load(self.path) as data:
+                grouped: Dict[str, Dict[str, np.ndarray]] = {}
+                for key in data.files:
+                    symbol, _, field = key.rpartition("|")
+                    grouped.setdefault(symbol, {})[field] = data[key]
+        except Exception as e:
+            logger.error(f"Error loading bar store: {e}")
+            return
+        
+        for symbol, columns in grouped.items():
+            self._bars[symbol] = {"D": columns}
+            for resolution in self.ROLLUPS:
+                self._bars[symbol][resolution] = self._resample(
+                    columns, self._period_start(columns["date"], resolution)
+                )
+    
+    def save(self) -> None:
+        """Save daily bars to path (rollups are rebuilt on load)"""
+        if not self.path:
+            return
+        
+        arrays = {f"{symbol}|{field}": values
+                  for symbol, resolutions in self._bars.items()
+                  for field, values in resolutions["D"].items()}
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            # Write through a file object so numpy doesn't append another .npz suffix
+            with open(self.path, 'wb') as f:
+                np.savez(f, **arrays)
+        except Exception as e:
+            logger.error(f"Error saving bar store: {e}")
+    
+    def _ingest_columns(self, symbol: str, columns: Dict[str, np.ndarray]) -> None:
+        """Merge daily bar columns into the store and update the rollups they touch"""
+        # Sort the incoming bars and keep the last bar for duplicate dates
+        order = np.argsort(columns["date"], kind='stable')
+        columns = {field: values[order] for field, values in columns.items()}
+        last_of_date = np.r_[columns["date"][1:] != columns["date"][:-1], True]
+        columns = {field: values[last_of_date] for field, values in columns.items()}
+        
+        resolutions = self._bars.setdefault(symbol, {})
+        daily = resolutions.get("D")
+        first_changed = columns["date"][0]
+        
+        if daily is None or not len(daily["date"]):
+            merged = columns
+        elif first_changed > daily["date"][-1]:
+            # Common case: new days after the stored history
+            merged = {field: np.concatenate([daily[field], columns[field]]) for field in daily}
+        else:
+            # Corrections or backfill: replace matching days and re-sort
+            keep = ~np.isin(daily["date"], columns["date"])
+            merged = {field: np.concatenate([daily[field][keep], columns[field]]) for field in daily}
+            order = np.argsort(merged["date"], kind='stable')
+            merged = {field: values[order] for field, values in merged.items()}
+        
+        resolutions["D"] = merged
+        
+        for resolution in self.ROLLUPS:
+            self._update_rollup(resolutions, resolution, first_changed)
+    
+    def _update_rollup(self, resolutions: Dict[str, Dict[str, np.ndarray]], resolution: str,
+                       first_changed: np.datetime64) -> None:
+        """Resample daily bars into a rollup from the period containing first_changed onward"""
+        daily = resolutions["D"]
+        rollup = resolutions.get(resolution)
+        period = self._period_start(np.array([first_changed]), resolution)[0]
+        
+        start = np.searchsorted(daily["date"], period, side='left')
+        tail = {field: values[start:] for field, values in daily.items()}
+        resampled = self._resample(tail, self._period_start(tail["date"], resolution))
+        
+        if rollup is None:
+            resolutions[resolution] = resampled
+            return
+        
+        keep = np.searchsorted(rollup["date"], period, side='left')
+        resolutions[resolution] = {field: np.concatenate([rollup[field][:keep], resampled[field]])
+                                   for field in rollup}
+    
+    def _resample(self, columns: Dict[str, np.ndarray], keys: np.ndarray) -> Dict[str, np.ndarray]:
+        """Aggregate consecutive bars sharing a key into one OHLC bar per key"""
+        if not len(keys):
+            return {"date": keys.astype('datetime64[D]'), **{field: np.zeros(0) for field in self.FIELDS}}
+        
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        ends = np.r_[starts[1:], len(keys)] - 1
+        
+        return {
+            "date": keys[starts].astype('datetime64[D]'),
+            "open": columns["open"][starts],
+            "high": np.maximum.reduceat(columns["high"], starts),
+            "low": np.minimum.reduceat(columns["low"], starts),
+            "close": columns["close"][ends],
+            "volume": np.add.reduceat(columns["volume"], starts)
+        }
+    
+    def _period_start(self, dates: np.ndarray, resolution: str) -> np.ndarray:
+        """Map dates to the first day of their period"""
+        if resolution == "W":
+            offset = (dates - self._MONDAY).astype(np.int64) % 7
+            return dates - offset.astype('timedelta64[D]')
+        if resolution == "M":
+            return dates.astype('datetime64[M]').astype('datetime64[D]')
+        return dates
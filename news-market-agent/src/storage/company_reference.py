@@ -0,0 +1,157 @@
+"""
+Company Reference - Static company reference data indexed by ticker
+"""
+import logging
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional
+
+from .peer_graph import PeerGraph
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'company_reference.json')
+
+# Profile fields (besides ticker and exchange) every record carries
+PROFILE_FIELDS = ("name", "sector", "industry", "description", "ceo", "employees",
+                  "founded", "headquarters", "website")
+
+class CompanyReference:
+    """
+    Company reference table loaded once from a JSON data file
+    
+    Each record holds the company's profile, sector and exchange, keyed by
+    upper-case ticker. Listed competitors are loaded into a shared
+    PeerGraph. Records for tickers missing from the file are built on first
+    lookup and kept in a least-recently-used cache of max_unlisted records.
+    Records are shared; callers copy a profile before changing it.
+    """
+    
+    def __init__(self, path: str = DEFAULT_PATH, max_unlisted: int = 1024):
+        """
+        Initialize the reference table
+        
+        Args:
+            path: JSON file with a "companies" object keyed by ticker
+            max_unlisted: Maximum number of cached records for tickers missing from the file
+        """
+        self.path = path
+        self.default_exchange = "NASDAQ"
+        self.max_unlisted = max(1, max_unlisted)
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._unlisted: OrderedDict = OrderedDict()
+        self.peer_graph = PeerGraph()
+        self._lock = threading.Lock()
+        
+        self.load()
+    
+    @property
+    def tickers(self) -> List[str]:
+        """Tickers listed in the data file"""
+        return list(self._records)
+    
+    def __contains__(self, ticker: str) -> bool:
+        return ticker.upper() in self._records
+    
+    def get(self, ticker: str) -> Dict[str, Any]:
+        """
+        Get the reference record for a ticker
+        
+        Args:
+            ticker: Company stock ticker symbol
+        
+        Returns:
+            Record with ticker, sector, exchange, mega_cap, listed and profile
+        """
+        key = ticker.upper()
+        record = self._records.get(key)
+        if record is not None:
+            return record
+        
+        with self._lock:
+            record = self._unlisted.get(key)
+            if record is None:
+                record = self._unlisted[key] = self._build_record(key, {})
+                if len(self._unlisted) > self.max_unlisted:
+                    self._unlisted.popitem(last=False)
+            else:
+                self._unlisted.move_to_end(key)
+        return record
+    
+    @staticmethod
+    def seed(ticker: str) -> int:
+        """Get the seed for generated demo data (from the ticker as given, so "aapl" and "AAPL" differ)"""
+        return sum(ord(c) for c in ticker)
+    
+    def sector(self, ticker: str) -> str:
+        """Get the ticker's sector"""
+        return self.get(ticker)["sector"]
+    
+    def exchange(self, ticker: str) -> str:
+        """Get the exchange the ticker is listed on"""
+        return self.get(ticker)["exchange"]
+    
+    def profile(self, ticker: str) -> Dict[str, Any]:
+        """Get the ticker's profile (shared; copy before changing it)"""
+        return self.get(ticker)["profile"]
+    
+    def load(self) -> None:
+        """Load the reference table from path"""
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading company reference data: {e}")
+            return
+        
+        self.default_exchange = data.get("default_exchange", self.default_exchange)
+        self._records = {
+            ticker.upper(): self._build_record(ticker.upper(), entry)
+            for ticker, entry in data.get("companies", {}).items()
+        }
+        self.peer_graph = PeerGraph({
+            ticker: entry.get("competitors", [])
+            for ticker, entry in data.get("companies", {}).items()
+            if entry.get("competitors")
+        })
+        logger.info(f"Loaded reference data for {len(self._records)} companies")
+    
+    def _build_record(self, ticker: str, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a record from a data file entry (empty for unlisted tickers)"""
+        # Defaults for tickers not in the data file
+        profile = {
+            "name": f"{ticker} Corporation",
+            "sector": "Unknown",
+            "industry": "Unknown",
+            "description": f"A company trading under the ticker {ticker}.",
+            "ceo": "Unknown",
+            "employees": 0,
+            "founded": 0,
+            "headquarters": "Unknown",
+            "website": f"https://www.{ticker.lower()}.com"
+        }
+        profile.update({field: entry[field] for field in PROFILE_FIELDS if field in entry})
+        
+        return {
+            "ticker": ticker,
+            "sector": profile["sector"],
+            "exchange": entry.get("exchange", self.default_exchange),
+            "mega_cap": entry.get("mega_cap", False),
+            "listed": bool(entry),
+            "profile": profile
+        }
+
+
+_shared: Optional[CompanyReference] = None
+_shared_lock = threading.Lock()
+
+def get_company_reference() -> CompanyReference:
+    """Get the process-wide reference table, loading it on first use"""
+    global _shared
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                _shared = CompanyReference(os.getenv('COMPANY_REFERENCE_PATH', DEFAULT_PATH))
+    return _shared
@@ -0,0 +1,167 @@
+"""
+Entity Dictionary - Company alias dictionary compiled into a token trie
+"""
+import logging
+import json
+import os
+import re
+import threading
+from typing import List, Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'company_aliases.json')
+
+# Word tokens; aliases only match whole tokens ("Mac" doesn't match "Machine")
+_TOKEN = re.compile(r"\w+")
+
+# Trie key holding the entities ending at a node ("" is never a token)
+_END = ""
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Split a text into the word tokens aliases are matched against"""
+    return _TOKEN.findall(text or "")
+
+class EntityDictionary:
+    """
+    Finds company mentions in text with a multi-pattern token automaton
+    
+    Aliases from the data file are tokenized and inserted into a trie keyed
+    by lowercase tokens. Each alias is either case-insensitive ("aliases",
+    for distinctive names such as "Microsoft") or case-sensitive ("exact",
+    for tickers and common words such as "Apple" or "Office"). A text is
+    tokenized once and the trie is walked from every token, so matching
+    costs time linear in the text length (times the longest alias) whatever
+    the number of aliases.
+    """
+    
+    def __init__(self, path: str = DEFAULT_PATH):
+        """
+        Initialize the dictionary
+        
+        Args:
+            path: JSON file with a "companies" object mapping tickers to
+                  "aliases" (case-insensitive) and "exact" (case-sensitive) lists
+        """
+        self.path = path
+        self._trie: Dict[str, Any] = {}
+        self._order: Dict[str, int] = {}  # Ticker -> position in the data file
+        self._aliases = 0
+        
+        self.load()
+    
+    @property
+    def tickers(self) -> List[str]:
+        """Tickers in the dictionary, in data file order"""
+        return list(self._order)
+    
+    def __contains__(self, ticker: str) -> bool:
+        return ticker.upper() in self._order
+    
+    def __len__(self) -> int:
+        return self._aliases
+    
+    def add(self, ticker: str, alias: str, case_sensitive: bool = False) -> None:
+        """
+        Add an alias for a ticker
+        
+        Args:
+            ticker: Company stock ticker symbol
+            alias: Name, product, person or other phrase identifying the company
+            case_sensitive: Whether the alias only matches with the same case
+        """
+        tokens = tokenize(alias)
+        if not tokens:
+            return
+        
+        ticker = ticker.upper()
+        self._order.setdefault(ticker, len(self._order))
+        
+        node = self._trie
+        for token in tokens:
+            node = node.setdefault(token.lower(), {})
+        node.setdefault(_END, []).append((ticker, tuple(tokens) if case_sensitive else None))
+        self._aliases += 1
+    
+    def find(self, text: Optional[str]) -> List[Tuple[str, int, int]]:
+        """
+        Find all alias occurrences in a text
+        
+        Args:
+            text: Text to search
+        
+        Returns:
+            (ticker, start offset, end offset) triples, in text order
+        """
+        if not text:
+            return []
+        
+        matches = list(_TOKEN.finditer(text))
+        return [(ticker, matches[start].start(), matches[end - 1].end())
+                for ticker, start, end in self.find_tokens([match.group() for match in matches])]
+    
+    def find_tokens(self, tokens: List[str]) -> List[Tuple[str, int, int]]:
+        """
+        Find all alias occurrences in an already tokenized text
+        
+        Args:
+            tokens: Word tokens (as produced by tokenize)
+        
+        Returns:
+            (ticker, first token, end token) triples, in token order
+        """
+        lower = [token.lower() for token in tokens]
+        
+        found = []
+        for i in range(len(tokens)):
+            node = self._trie
+            j = i
+            while j < len(tokens):
+                node = node.get(lower[j])
+                if node is None:
+                    break
+                j += 1
+                for ticker, exact in node.get(_END, ()):
+                    if exact is None or exact == tuple(tokens[i:j]):
+                        found.append((ticker, i, j))
+        return found
+    
+    def entities(self, text: Optional[str]) -> List[str]:
+        """Get the tickers mentioned in a text, in order of first mention"""
+        return list(dict.fromkeys(ticker for ticker, _, _ in self.find(text)))
+    
+    def order(self, ticker: str) -> int:
+        """Get a ticker's position in the data file (for stable result ordering)"""
+        return self._order.get(ticker.upper(), len(self._order))
+    
+    def load(self) -> None:
+        """Load the aliases from path"""
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except Exception as e:
+            # The bundled file ships with the package, so losing it is a broken install
+            if self.path == DEFAULT_PATH:
+                raise RuntimeError(f"Bundled company aliases could not be loaded from {self.path}: {e}") from e
+            logger.error(f"Error loading company aliases: {e}")
+            return
+        
+        for ticker, entry in data.get("companies", {}).items():
+            for alias in entry.get("aliases", []):
+                self.add(ticker, alias)
+            for alias in entry.get("exact", []):
+                self.add(ticker, alias, case_sensitive=True)
+        logger.info(f"Loaded {self._aliases} aliases for {len(self._order)} companies")
+
+
+_shared: Optional[EntityDictionary] = None
+_shared_lock = threading.Lock()
+
+def get_entity_dictionary() -> EntityDictionary:
+    """Get the process-wide alias dictionary, loading it on first use"""
+    global _shared
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                _shared = EntityDictionary(os.getenv('COMPANY_ALIASES_PATH', DEFAULT_PATH))
+    return _shared
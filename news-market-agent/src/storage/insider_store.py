@@ -0,0 +1,220 @@
+"""
+Insider Store - Persistent history of insider trading transactions
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import List, Dict, Any, Optional
+from datetime import date, timedelta
+
+logger = logging.getLogger(__name__)
+
+class InsiderTradingStore:
+    """
+    Append-only SQLite store of insider transactions
+    
+    Transactions are deduplicated on their ID, so syncing overlapping
+    windows only adds new ones. The table is indexed by ticker and date,
+    and filters and aggregates run inside SQLite rather than over Python
+    lists. Each ticker's last sync time is kept for incremental syncing.
+    """
+    
+    COLUMNS = ("id", "ticker", "date", "insider_name", "title", "transaction_type", "shares",
+               "price_per_share", "total_value", "shares_owned_after", "form_type", "source")
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS insider_transactions (
+            id TEXT PRIMARY KEY,
+            ticker TEXT NOT NULL,
+            date TEXT NOT NULL,
+            insider_name TEXT,
+            title TEXT,
+            transaction_type TEXT,
+            shares INTEGER,
+            price_per_share REAL,
+            total_value REAL,
+            shares_owned_after INTEGER,
+            form_type TEXT,
+            source TEXT,
+            ingested_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_insider_ticker_date ON insider_transactions (ticker, date);
+        CREATE INDEX IF NOT EXISTS idx_insider_date ON insider_transactions (date);
+        CREATE TABLE IF NOT EXISTS insider_sync (
+            ticker TEXT PRIMARY KEY,
+            synced_at REAL NOT NULL
+        );
+    """
+    
+    def __init__(self, path: str = os.path.join('data', 'insider_trading.db')):
+        """
+        Initialize the store
+        
+        Args:
+            path: SQLite database file (":memory:" for a temporary store)
+        """
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._conn:
+            self._conn.executescript(self.SCHEMA)
+    
+    def add(self, ticker: str, transactions: List[Dict[str, Any]]) -> int:
+        """
+        Add transactions for a ticker, skipping IDs already stored
+        
+        The ticker is also recorded as synced now, so only pass the result of
+        a successful fetch (an empty list is one).
+        
+        Args:
+            ticker: Company stock ticker symbol
+            transactions: Transactions as returned by get_insider_trading
+        
+        Returns:
+            Number of new transactions stored
+        """
+        ticker = ticker.upper()
+        now = time.time()
+        rows = [
+            tuple(ticker if column == "ticker" else tx.get(column) for column in self.COLUMNS) + (now,)
+            for tx in transactions if tx.get("id") and tx.get("date")
+        ]
+        
+        placeholders = ", ".join("?" for _ in range(len(self.COLUMNS) + 1))
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                f"INSERT OR IGNORE INTO insider_transactions ({', '.join(self.COLUMNS)}, ingested_at) "
+                f"VALUES ({placeholders})",
+                rows
+            )
+            added = self._conn.total_changes - before
+            self._conn.execute(
+                "INSERT OR REPLACE INTO insider_sync (ticker, synced_at) VALUES (?, ?)", (ticker, now)
+            )
+        
+        return added
+    
+    def last_synced(self, ticker: str) -> Optional[float]:
+        """Get the Unix time a ticker was last synced, or None if never"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT synced_at FROM insider_sync WHERE ticker = ?", (ticker.upper(),)
+            ).fetchone()
+        return row["synced_at"] if row else None
+    
+    def latest_date(self, ticker: str) -> Optional[str]:
+        """Get the date of a ticker's most recent stored transaction"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MAX(date) AS latest FROM insider_transactions WHERE ticker = ?", (ticker.upper(),)
+            ).fetchone()
+        return row["latest"]
+    
+    def query(self, tickers: Optional[List[str]] = None, start: Optional[str] = None,
+              end: Optional[str] = None, transaction_type: Optional[str] = None,
+              min_value: Optional[float] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get stored transactions matching all given filters, newest first
+        
+        Args:
+            tickers: Optional tickers to include
+            start: Optional first ISO date to include
+            end: Optional last ISO date to include
+            transaction_type: Optional type to include ("Buy" or "Sell")
+            min_value: Optional minimum total value
+            limit: Optional maximum number of transactions
+        
+        Returns:
+            List of transactions
+        """
+        where, params = self._where(tickers, start, end, transaction_type, min_value)
+        sql = f"SELECT {', '.join(self.COLUMNS)} FROM insider_transactions{where} ORDER BY date DESC, id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [dict(row) for row in rows]
+    
+    def net_activity(self, tickers: Optional[List[str]] = None, start: Optional[str] = None,
+                     end: Optional[str] = None, min_value: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Aggregate buy and sell activity per ticker over a date window
+        
+        Args:
+            tickers: Optional tickers to include
+            start: Optional first ISO date to include
+            end: Optional last ISO date to include
+            min_value: Optional minimum total value of transactions to count
+        
+        Returns:
+            Dictionary mapping tickers to buy/sell counts, shares and values and the net value
+        """
+        where, params = self._where(tickers, start, end, None, min_value)
+        sql = f"""
+            SELECT ticker,
+                   SUM(transaction_type = 'Buy') AS buys,
+                   SUM(transaction_type = 'Sell') AS sells,
+                   SUM(CASE WHEN transaction_type = 'Buy' THEN shares ELSE 0 END) AS shares_bought,
+                   SUM(CASE WHEN transaction_type = 'Sell' THEN shares ELSE 0 END) AS shares_sold,
+                   SUM(CASE WHEN transaction_type = 'Buy' THEN total_value ELSE 0 END) AS buy_value,
+                   SUM(CASE WHEN transaction_type = 'Sell' THEN total_value ELSE 0 END) AS sell_value,
+                   MIN(date) AS first_date,
+                   MAX(date) AS last_date
+            FROM insider_transactions{where}
+            GROUP BY ticker
+            ORDER BY ticker
+        """
+        
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        
+        result = {}
+        for row in rows:
+            activity = dict(row)
+            ticker = activity.pop("ticker")
+            activity["buy_value"] = round(activity["buy_value"], 2)
+            activity["sell_value"] = round(activity["sell_value"], 2)
+            activity["net_value"] = round(activity["buy_value"] - activity["sell_value"], 2)
+            result[ticker] = activity
+        return result
+    
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+    
+    def _where(self, tickers: Optional[List[str]], start: Optional[str], end: Optional[str],
+               transaction_type: Optional[str], min_value: Optional[float]) -> tuple:
+        """Build a WHERE clause and its parameters from query filters"""
+        clauses, params = [], []
+        if tickers is not None:
+            clauses.append(f"ticker IN ({', '.join('?' for _ in tickers)})")
+            params.extend(ticker.upper() for ticker in tickers)
+        if start:
+            clauses.append("date >= ?")
+            params.append(start)
+        if end:
+            # Dates are stored as ISO timestamps, so a date-only end covers the whole day
+            if len(end) == 10:
+                end = (date.fromisoformat(end) + timedelta(days=1)).isoformat()
+                clauses.append("date < ?")
+            else:
+                clauses.append("date <= ?")
+            params.append(end)
+        if transaction_type:
+            clauses.append("transaction_type = ?")
+            params.append(transaction_type)
+        if min_value is not None:
+            clauses.append("total_value >= ?")
+            params.append(min_value)
+        
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
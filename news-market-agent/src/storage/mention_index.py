@@ -0,0 +1,189 @@
+"""
+Mention Index - Inverted index of terms and company mentions in a news snapshot
+"""
+import logging
+from collections import Counter
+from typing import List, Dict, Any, Optional, Iterable
+
+from .entity_dictionary import EntityDictionary, get_entity_dictionary, tokenize
+from ..utils.items import item_key
+
+logger = logging.getLogger(__name__)
+
+# Token separating title and content (never produced by tokenize)
+_GAP = " "
+
+class MentionIndex:
+    """
+    Postings of terms and companies for one snapshot of news items
+    
+    Built once per snapshot, by tokenizing each item's title and content a
+    single time. Lowercase terms and company tickers (from the alias
+    dictionary) map to posting lists of item positions with token offsets,
+    and every analysis of the snapshot - company, sector and topic mentions
+    or ad-hoc phrases - is answered from the postings instead of rescanning
+    the text. Items are deduplicated by item key.
+    """
+    
+    def __init__(self, news_items: Iterable[Dict[str, Any]], entities: Optional[EntityDictionary] = None):
+        """
+        Build the index
+        
+        Args:
+            news_items: News items of the snapshot
+            entities: Alias dictionary for company mentions (defaults to the shared one)
+        """
+        self.entities = entities or get_entity_dictionary()
+        self.items: List[Dict[str, Any]] = []
+        
+        self._tokens: List[List[str]] = []  # Original tokens per item (title, gap, content)
+        self._title_lengths: List[int] = []
+        self._terms: Dict[str, Dict[int, List[int]]] = {}
+        self._companies: Dict[str, Dict[int, List[int]]] = {}
+        self._tags: Dict[str, Dict[int, int]] = {}  # Entity names tagged on items (e.g. by Firecrawl)
+        
+        keys = set()
+        for position, item in enumerate(news_items):
+            key = item_key(item, fallback=position)
+            if key not in keys:
+                keys.add(key)
+                self._add(item)
+    
+    def __len__(self) -> int:
+        return len(self.items)
+    
+    def postings(self, term: str) -> Dict[int, List[int]]:
+        """Get the item positions and token offsets of a term (case-insensitive)"""
+        return self._terms.get(term.lower(), {})
+    
+    def phrase(self, phrase: str, case_sensitive: bool = False) -> Dict[int, List[int]]:
+        """
+        Find a phrase as consecutive whole words
+        
+        Args:
+            phrase: Word or phrase to find
+            case_sensitive: Whether the phrase must match with the same case
+        
+        Returns:
+            Dictionary mapping item positions to the token offsets the phrase starts at
+        """
+        words = tokenize(phrase)
+        if not words:
+            return {}
+        
+        # Intersect the postings of each word shifted by its place in the phrase
+        matches = {doc: list(offsets) for doc, offsets in self.postings(words[0]).items()}
+        for shift, word in enumerate(words[1:], start=1):
+            postings = self.postings(word)
+            narrowed = {}
+            for doc, offsets in matches.items():
+                if doc in postings:
+                    following = set(postings[doc])
+                    offsets = [offset for offset in offsets if offset + shift in following]
+                    if offsets:
+                        narrowed[doc] = offsets
+            matches = narrowed
+        
+        if case_sensitive:
+            length = len(words)
+            matches = {doc: [offset for offset in offsets if self._tokens[doc][offset:offset + length] == words]
+                       for doc, offsets in matches.items()}
+            matches = {doc: offsets for doc, offsets in matches.items() if offsets}
+        return matches
+    
+    def items_matching(self, phrases: Iterable[str], case_sensitive: bool = False) -> List[Dict[str, Any]]:
+        """
+        Get the items containing any of the phrases, in snapshot order
+        
+        Args:
+            phrases: Words or phrases to find
+            case_sensitive: Whether phrases must match with the same case
+        
+        Returns:
+            List of news items
+        """
+        if isinstance(phrases, str):
+            phrases = [phrases]
+        docs = set()
+        for phrase in phrases:
+            docs.update(self.phrase(phrase, case_sensitive))
+        return [self.items[doc] for doc in sorted(docs)]
+    
+    def count_items(self, phrase: str, case_sensitive: bool = False) -> int:
+        """Count the items containing a phrase"""
+        return len(self.phrase(phrase, case_sensitive))
+    
+    def company_mentions(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get the items mentioning each company
+        
+        Returns:
+            Dictionary mapping tickers (in alias dictionary order) to news items in snapshot order
+        """
+        return {
+            ticker: [self.items[doc] for doc in self._companies[ticker]]
+            for ticker in sorted(self._companies, key=self.entities.order)
+        }
+    
+    def company_postings(self, ticker: str) -> Dict[int, List[int]]:
+        """Get the item positions and token offsets of a company's mentions"""
+        return self._companies.get(ticker.upper(), {})
+    
+    def title_length(self, doc: int) -> int:
+        """Get the number of title tokens of an item (offsets below it are in the title)"""
+        return self._title_lengths[doc]
+    
+    def term_counts(self, titles_only: bool = True, min_length: int = 1,
+                    stop_words: Iterable[str] = ()) -> Counter:
+        """
+        Count term occurrences (plus tagged entity names) over the snapshot
+        
+        Args:
+            titles_only: Whether to count title occurrences only
+            min_length: Minimum term length
+            stop_words: Terms not to count
+        
+        Returns:
+            Counter of lowercase terms
+        """
+        stop_words = set(stop_words)
+        counts = Counter()
+        for term, postings in self._terms.items():
+            if len(term) < min_length or term in stop_words:
+                continue
+            if titles_only:
+                count = sum(1 for doc, offsets in postings.items()
+                            for offset in offsets if offset < self._title_lengths[doc])
+            else:
+                count = sum(len(offsets) for offsets in postings.values())
+            if count:
+                counts[term] = count
+        
+        for name, postings in self._tags.items():
+            counts[name] += sum(postings.values())
+        return counts
+    
+    def _add(self, item: Dict[str, Any]) -> None:
+        """Tokenize an item once and add it to the postings"""
+        doc = len(self.items)
+        title = tokenize(item.get('title', ''))
+        content = tokenize(item.get('content', ''))
+        
+        # A gap between title and content keeps phrases from spanning both
+        tokens = title + [_GAP] + content
+        self.items.append(item)
+        self._tokens.append(tokens)
+        self._title_lengths.append(len(title))
+        
+        for offset, token in enumerate(tokens):
+            if token != _GAP:
+                self._terms.setdefault(token.lower(), {}).setdefault(doc, []).append(offset)
+        
+        for ticker, start, _ in self.entities.find_tokens(tokens):
+            self._companies.setdefault(ticker, {}).setdefault(doc, []).append(start)
+        
+        for entity in item.get('entities', []) or []:
+            if entity.get('type') in ('product', 'technology', 'topic') and entity.get('name'):
+                name = entity['name'].lower()
+                self._tags.setdefault(name, {})
+                self._tags[name][doc] = self._tags[name].get(doc, 0) + 1
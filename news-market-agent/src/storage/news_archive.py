@@ -0,0 +1,335 @@
+"""
+News Archive - Persistent time-indexed history of aggregated news items
+"""
+import logging
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import List, Dict, Any, Optional, Iterator, Union
+from datetime import date, datetime, timedelta
+
+from ..utils.items import item_key, canonical_url
+
+logger = logging.getLogger(__name__)
+
+# Timestamps accepted by queries: Unix time, ISO date or datetime string, or datetime
+TimeBound = Union[float, int, str, datetime, None]
+
+class NewsArchive:
+    """
+    SQLite archive of news items across runs
+    
+    Items are keyed by source and ID, so storing the same item again in a
+    later run updates it in place (its stored fields are merged with the new
+    ones) and records its score and comment count in a score history when
+    they changed. The table is indexed by publication time, source and
+    canonical URL, and range filters, ordering and aggregates run inside
+    SQLite, so queries over weeks of news only read the matching rows.
+    """
+    
+    COLUMNS = ("key", "source", "item_id", "canonical_url", "url", "title", "timestamp",
+               "score", "comments", "sentiment")
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS news_items (
+            key TEXT PRIMARY KEY,
+            source TEXT NOT NULL,
+            item_id TEXT,
+            canonical_url TEXT,
+            url TEXT,
+            title TEXT,
+            timestamp REAL NOT NULL,
+            score INTEGER,
+            comments INTEGER,
+            sentiment REAL,
+            first_seen REAL NOT NULL,
+            last_seen REAL NOT NULL,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_news_timestamp ON news_items (timestamp);
+        CREATE INDEX IF NOT EXISTS idx_news_source_timestamp ON news_items (source, timestamp);
+        CREATE INDEX IF NOT EXISTS idx_news_canonical_url ON news_items (canonical_url);
+        CREATE TABLE IF NOT EXISTS news_scores (
+            key TEXT NOT NULL,
+            observed_at REAL NOT NULL,
+            score INTEGER,
+            comments INTEGER,
+            PRIMARY KEY (key, observed_at)
+        ) WITHOUT ROWID;
+    """
+    
+    def __init__(self, path: str = os.path.join('data', 'news_archive.db')):
+        """
+        Initialize the archive
+        
+        Args:
+            path: SQLite database file (":memory:" for a temporary archive)
+        """
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._conn:
+            self._conn.executescript(self.SCHEMA)
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM news_items").fetchone()[0]
+    
+    def upsert(self, news_items: List[Dict[str, Any]], observed_at: Optional[float] = None) -> int:
+        """
+        Store news items, updating the ones already archived
+        
+        Args:
+            news_items: News items (with 'timestamp' set, as by get_aggregated_news)
+            observed_at: Unix time the scores were observed (defaults to now)
+        
+        Returns:
+            Number of new items stored
+        """
+        now = observed_at if observed_at is not None else time.time()
+        rows = {}
+        for position, item in enumerate(news_items):
+            row = self._row(item, position)
+            if row is not None:
+                rows[row["key"]] = row
+        if not rows:
+            return 0
+        
+        columns = ", ".join(self.COLUMNS)
+        placeholders = ", ".join("?" for _ in range(len(self.COLUMNS) + 3))
+        with self._lock, self._conn:
+            existing = self._existing(list(rows))
+            
+            # Score observations first, while news_items still holds the previous values
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO news_scores (key, observed_at, score, comments) "
+                "SELECT ?, ?, ?, ? WHERE NOT EXISTS "
+                "(SELECT 1 FROM news_items WHERE key = ? AND score IS ? AND comments IS ?)",
+                [(key, now, row["score"], row["comments"], key, row["score"], row["comments"])
+                 for key, row in rows.items()]
+            )
+            self._conn.executemany(
+                f"INSERT INTO news_items ({columns}, first_seen, last_seen, data) VALUES ({placeholders}) "
+                "ON CONFLICT (key) DO UPDATE SET "
+                "canonical_url = excluded.canonical_url, url = excluded.url, title = excluded.title, "
+                "score = excluded.score, comments = excluded.comments, "
+                "sentiment = COALESCE(excluded.sentiment, sentiment), "
+                "last_seen = MAX(last_seen, excluded.last_seen), data = json_patch(data, excluded.data)",
+                [tuple(row[column] for column in self.COLUMNS) + (now, now, row["data"]) for row in rows.values()]
+            )
+        
+        return len(rows) - len(existing)
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get an archived item by item key ("<source>:<id>")"""
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM news_items WHERE key = ?", (key,)).fetchone()
+        return json.loads(row["data"]) if row else None
+    
+    def query(self, start: TimeBound = None, end: TimeBound = None, sources: Optional[List[str]] = None,
+              url: Optional[str] = None, min_score: Optional[int] = None,
+              limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get archived items matching all given filters, newest first
+        
+        For example, last week's HackerNews stories with at least 100 points:
+        query(start=time.time() - 7 * 86400, sources=["hackernews"], min_score=100)
+        
+        Args:
+            start: Optional earliest publication time to include
+            end: Optional latest publication time to include (a date-only end covers the whole day)
+            sources: Optional sources to include
+            url: Optional URL; items linking to the same article are included
+            min_score: Optional minimum score
+            limit: Optional maximum number of items
+        
+        Returns:
+            List of news items
+        """
+        where, params = self._where(start, end, sources, url, min_score)
+        sql = f"SELECT data FROM news_items{where} ORDER BY timestamp DESC, key"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [json.loads(row["data"]) for row in rows]
+    
+    def iterate(self, start: TimeBound = None, end: TimeBound = None, sources: Optional[List[str]] = None,
+                url: Optional[str] = None, min_score: Optional[int] = None,
+                batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """
+        Stream archived items matching all given filters, oldest first
+        
+        Items are read one batch at a time (continuing from the last item
+        read), so a long history can be processed without loading it all.
+        
+        Args:
+            start: Optional earliest publication time to include
+            end: Optional latest publication time to include (a date-only end covers the whole day)
+            sources: Optional sources to include
+            url: Optional URL; items linking to the same article are included
+            min_score: Optional minimum score
+            batch_size: Number of items read per query
+        
+        Yields:
+            News items
+        """
+        where, params = self._where(start, end, sources, url, min_score)
+        after = None
+        while True:
+            sql, batch_params = f"SELECT key, timestamp, data FROM news_items{where}", list(params)
+            if after is not None:
+                sql += (" AND" if where else " WHERE") + " (timestamp > ? OR (timestamp = ? AND key > ?))"
+                batch_params.extend((after[0], after[0], after[1]))
+            sql += " ORDER BY timestamp, key LIMIT ?"
+            batch_params.append(batch_size)
+            
+            with self._lock:
+                rows = self._conn.execute(sql, batch_params).fetchall()
+            for row in rows:
+                yield json.loads(row["data"])
+            
+            if len(rows) < batch_size:
+                return
+            after = (rows[-1]["timestamp"], rows[-1]["key"])
+    
+    def score_history(self, item: Union[Dict[str, Any], str]) -> List[Dict[str, Any]]:
+        """
+        Get the recorded scores of an item, oldest first
+        
+        Args:
+            item: News item or item key
+        
+        Returns:
+            List of observations with observed_at (Unix time), score and comments
+        """
+        key = item if isinstance(item, str) else item_key(item)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT observed_at, score, comments FROM news_scores WHERE key = ? ORDER BY observed_at", (key,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+    
+    def source_activity(self, start: TimeBound = None, end: TimeBound = None,
+                        sources: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Aggregate archived items per source over a time window
+        
+        Args:
+            start: Optional earliest publication time to include
+            end: Optional latest publication time to include
+            sources: Optional sources to include
+        
+        Returns:
+            Dictionary mapping sources to item counts, score statistics,
+            average title sentiment and first/last publication times
+        """
+        where, params = self._where(start, end, sources, None, None)
+        sql = f"""
+            SELECT source,
+                   COUNT(*) AS items,
+                   COUNT(DISTINCT canonical_url) AS articles,
+                   SUM(score) AS total_score,
+                   MAX(score) AS max_score,
+                   AVG(sentiment) AS avg_sentiment,
+                   MIN(timestamp) AS first_timestamp,
+                   MAX(timestamp) AS last_timestamp
+            FROM news_items{where}
+            GROUP BY source
+            ORDER BY source
+        """
+        
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        
+        result = {}
+        for row in rows:
+            activity = dict(row)
+            source = activity.pop("source")
+            if activity["avg_sentiment"] is not None:
+                activity["avg_sentiment"] = round(activity["avg_sentiment"], 3)
+            result[source] = activity
+        return result
+    
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+    
+    def _row(self, item: Dict[str, Any], position: int) -> Optional[Dict[str, Any]]:
+        """Get the column values of an item, or None if it has no publication time"""
+        timestamp = item.get('timestamp') or item.get('time') or item.get('created_utc')
+        if not timestamp:
+            return None
+        
+        sentiment = item.get('sentiment')
+        url = item.get('url')
+        return {
+            "key": item_key(item, fallback=f"{timestamp}:{position}"),
+            "source": item.get('source', 'unknown'),
+            "item_id": str(item['id']) if item.get('id') is not None else None,
+            "canonical_url": canonical_url(url) if url else None,
+            "url": url,
+            "title": item.get('title'),
+            "timestamp": float(timestamp),
+            "score": item.get('score'),
+            "comments": item.get('comments', item.get('descendants')),
+            "sentiment": sentiment.get('compound') if isinstance(sentiment, dict) else None,
+            "data": json.dumps(dict(item), default=str)
+        }
+    
+    def _existing(self, keys: List[str]) -> set:
+        """Get which of the keys are already archived (caller holds the lock)"""
+        existing = set()
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            rows = self._conn.execute(
+                f"SELECT key FROM news_items WHERE key IN ({', '.join('?' for _ in chunk)})", chunk
+            ).fetchall()
+            existing.update(row["key"] for row in rows)
+        return existing
+    
+    def _where(self, start: TimeBound, end: TimeBound, sources: Optional[List[str]],
+               url: Optional[str], min_score: Optional[int]) -> tuple:
+        """Build a WHERE clause and its parameters from query filters"""
+        clauses, params = [], []
+        if start is not None:
+            clauses.append("timestamp >= ?")
+            params.append(self._timestamp(start))
+        if end is not None:
+            # A date-only end covers the whole day
+            if isinstance(end, str) and len(end) == 10:
+                clauses.append("timestamp < ?")
+                params.append(datetime.combine(date.fromisoformat(end) + timedelta(days=1),
+                                               datetime.min.time()).timestamp())
+            else:
+                clauses.append("timestamp <= ?")
+                params.append(self._timestamp(end))
+        if sources is not None:
+            clauses.append(f"source IN ({', '.join('?' for _ in sources)})")
+            params.extend(sources)
+        if url:
+            clauses.append("canonical_url = ?")
+            params.append(canonical_url(url))
+        if min_score is not None:
+            clauses.append("score >= ?")
+            params.append(min_score)
+        
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+    
+    @staticmethod
+    def _timestamp(value: TimeBound) -> float:
+        """Convert a time bound to Unix time (naive times are local, like item timestamps)"""
+        if isinstance(value, datetime):
+            return value.timestamp()
+        if isinstance(value, str):
+            return datetime.fromisoformat(value).timestamp()
+        return float(value)
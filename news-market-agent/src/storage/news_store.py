@@ -0,0 +1,135 @@
+"""
+News Store - Shared store of company news articles referenced by ticker
+"""
+import logging
+import threading
+from typing import List, Dict, Any, Optional, Callable
+
+from ..utils.items import article_key
+
+logger = logging.getLogger(__name__)
+
+class CompanyNewsStore:
+    """
+    Stores each company news article once, keyed by canonical URL (or ID)
+    
+    An article listed for several tickers is kept as a single dictionary and
+    a ticker -> article index references it from every related ticker, so it
+    is scored and held in memory once. Receiving an article again updates
+    the stored dictionary in place (rescoring it only if its text changed).
+    When the store is full, the articles added longest ago are evicted along
+    with their index entries.
+    """
+    
+    # Fields whose text is scored for sentiment
+    TEXT_FIELDS = ("title", "summary")
+    
+    def __init__(self, scorer: Optional[Callable[[List[str]], List[Dict[str, Any]]]] = None,
+                 max_articles: int = 10000):
+        """
+        Initialize the news store
+        
+        Args:
+            scorer: Optional batch function returning the sentiment of each of a
+                    list of texts (e.g. BatchSentimentAnalyzer.analyze_batch);
+                    called once per add for the new and changed articles
+            max_articles: Maximum number of articles kept
+        """
+        self.scorer = scorer
+        self.max_articles = max_articles
+        
+        self._articles: Dict[str, Dict[str, Any]] = {}  # In insertion order
+        self._tickers: Dict[str, Dict[str, None]] = {}  # article key -> tickers (ordered set)
+        self._by_ticker: Dict[str, Dict[str, None]] = {}  # ticker -> article keys (ordered set)
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._articles)
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self._articles
+    
+    def add(self, ticker: str, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Store articles listed for a ticker and link them to it
+        
+        Args:
+            ticker: Ticker the articles were retrieved for
+            articles: News articles
+        
+        Returns:
+            The stored articles, in the given order; an article stored before
+            (e.g. for another ticker) is returned as that stored dictionary
+        """
+        ticker = ticker.upper()
+        result = []
+        to_score = {}
+        
+        with self._lock:
+            for article in articles:
+                key = article_key(article)
+                stored = self._articles.get(key)
+                if stored is None:
+                    stored = self._articles[key] = article
+                    self._tickers[key] = {}
+                    to_score[key] = stored
+                else:
+                    # Keep the shared dictionary but take the latest field values
+                    text_changed = self._text(stored) != self._text(article)
+                    updates = {field: value for field, value in article.items()
+                               if not (self.scorer and field == "sentiment")}
+                    stored.update(updates)
+                    if text_changed:
+                        to_score[key] = stored
+                
+                self._tickers[key][ticker] = None
+                self._by_ticker.setdefault(ticker, {})[key] = None
+                result.append(stored)
+            
+            if self.scorer and to_score:
+                scored = list(to_score.values())
+                for stored, sentiment in zip(scored, self.scorer([self._text(article) for article in scored])):
+                    stored["sentiment"] = sentiment
+            
+            self._evict()
+        
+        return result
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a stored article by key"""
+        with self._lock:
+            return self._articles.get(key)
+    
+    def for_ticker(self, ticker: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get the stored articles linked to a ticker, in the order they were linked
+        
+        Args:
+            ticker: Company stock ticker symbol
+            limit: Optional maximum number of articles (the most recently linked are kept)
+        
+        Returns:
+            List of articles
+        """
+        with self._lock:
+            keys = list(self._by_ticker.get(ticker.upper(), {}))
+            if limit is not None:
+                keys = keys[-limit:]
+            return [self._articles[key] for key in keys]
+    
+    def tickers_for(self, article: Dict[str, Any]) -> List[str]:
+        """Get the tickers an article is linked to"""
+        with self._lock:
+            return list(self._tickers.get(article_key(article), {}))
+    
+    def _text(self, article: Dict[str, Any]) -> str:
+        """Text of an article that is scored for sentiment"""
+        return " ".join(str(article[field]) for field in self.TEXT_FIELDS if article.get(field))
+    
+    def _evict(self) -> None:
+        """Drop the oldest articles beyond max_articles (lock must be held)"""
+        while len(self._articles) > self.max_articles:
+            key = next(iter(self._articles))
+            del self._articles[key]
+            for ticker in self._tickers.pop(key, {}):
+                self._by_ticker.get(ticker, {}).pop(key, None)
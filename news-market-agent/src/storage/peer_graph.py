@@ -0,0 +1,105 @@
+"""
+Peer Graph - Competitor relationships between companies as an adjacency list
+"""
+import logging
+import threading
+from collections import deque
+from typing import List, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class PeerGraph:
+    """
+    Directed competitor graph with N-hop peer queries
+    
+    Each ticker keeps its competitors in listed order (out-edges) and the
+    tickers that list it as a competitor (in-edges). Competitor lookups are
+    O(degree); peer queries walk the relationships in both directions with a
+    breadth-first search and are cached until the graph changes.
+    """
+    
+    def __init__(self, adjacency: Optional[Dict[str, List[str]]] = None):
+        """
+        Initialize the peer graph
+        
+        Args:
+            adjacency: Optional dictionary mapping tickers to their competitors
+        """
+        self._out: Dict[str, List[str]] = {}
+        self._in: Dict[str, List[str]] = {}
+        self._peer_cache: Dict[tuple, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+        
+        for ticker, competitors in (adjacency or {}).items():
+            self.set_competitors(ticker, competitors)
+    
+    @property
+    def tickers(self) -> List[str]:
+        """Tickers with at least one relationship"""
+        return list(dict.fromkeys([*self._out, *self._in]))
+    
+    def __contains__(self, ticker: str) -> bool:
+        return ticker.upper() in self._out
+    
+    def set_competitors(self, ticker: str, competitors: List[str]) -> None:
+        """
+        Set (or replace) a ticker's competitors
+        
+        Args:
+            ticker: Company stock ticker symbol
+            competitors: Competitor tickers, most relevant first
+        """
+        ticker = ticker.upper()
+        competitors = [c.upper() for c in dict.fromkeys(competitors) if c.upper() != ticker]
+        
+        with self._lock:
+            for previous in self._out.get(ticker, []):
+                self._in[previous].remove(ticker)
+            self._out[ticker] = competitors
+            for competitor in competitors:
+                self._in.setdefault(competitor, []).append(ticker)
+            self._peer_cache.clear()
+    
+    def competitors(self, ticker: str) -> List[str]:
+        """
+        Get a ticker's competitors in listed order
+        
+        Returns:
+            Competitor tickers (empty if the ticker has none listed)
+        """
+        return list(self._out.get(ticker.upper(), []))
+    
+    def peers(self, ticker: str, hops: int = 1) -> Dict[str, int]:
+        """
+        Get all tickers within a number of competitor relationships of a ticker
+        
+        Relationships count in both directions, so a company listed as a
+        competitor is a peer even if it lists no competitors itself.
+        
+        Args:
+            ticker: Company stock ticker symbol
+            hops: Maximum number of relationships between the ticker and a peer
+        
+        Returns:
+            Dictionary mapping peers to their distance in hops, closest first
+        """
+        ticker = ticker.upper()
+        key = (ticker, hops)
+        cached = self._peer_cache.get(key)
+        if cached is not None:
+            return dict(cached)
+        
+        distances = {ticker: 0}
+        queue = deque([ticker])
+        while queue:
+            current = queue.popleft()
+            if distances[current] == hops:
+                continue
+            for neighbor in (*self._out.get(current, ()), *self._in.get(current, ())):
+                if neighbor not in distances:
+                    distances[neighbor] = distances[current] + 1
+                    queue.append(neighbor)
+        
+        del distances[ticker]
+        self._peer_cache[key] = distances
+        return dict(distances)
@@ -0,0 +1,206 @@
+"""
+Quote Buffer - Fixed-size in-memory storage for streaming quote ticks
+"""
+import logging
+import threading
+from typing import List, Dict, Any, Optional
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+class QuoteRingBuffer:
+    """
+    Stores the last `capacity` ticks per symbol in preallocated NumPy ring buffers
+    
+    Alongside each tick the buffer keeps running totals of price, size and
+    price * size, so the latest quote and tick-count windows (mean price, VWAP,
+    volume) are O(1) lookups. Time windows locate their first tick with a
+    binary search over the ring. The ring has one slot more than `capacity` so
+    the totals before a full-length window are still available.
+    """
+    
+    def __init__(self, symbols: Optional[List[str]] = None, capacity: int = 4096):
+        """
+        Initialize the ring buffers
+        
+        Args:
+            symbols: Symbols to preallocate buffers for (others are added on first tick)
+            capacity: Number of ticks kept per symbol
+        """
+        self.capacity = capacity
+        self._slots = capacity + 1
+        self._index: Dict[str, int] = {symbol: row for row, symbol in enumerate(dict.fromkeys(symbols or []))}
+        self._lock = threading.Lock()
+        
+        rows = len(self._index)
+        self._timestamps = np.zeros((rows, self._slots))
+        self._prices = np.zeros((rows, self._slots))
+        self._sizes = np.zeros((rows, self._slots))
+        # Running totals up to and including each tick
+        self._cum_price = np.zeros((rows, self._slots))
+        self._cum_size = np.zeros((rows, self._slots))
+        self._cum_value = np.zeros((rows, self._slots))
+        self._head = np.zeros(rows, dtype=np.int64)  # Slot of the next tick
+        self._count = np.zeros(rows, dtype=np.int64)  # Ticks received in total
+    
+    @property
+    def symbols(self) -> List[str]:
+        """Symbols with a buffer"""
+        return list(self._index)
+    
+    def add_symbol(self, symbol: str) -> None:
+        """Allocate a buffer for a symbol"""
+        with self._lock:
+            self._add_symbol(symbol)
+    
+    def append(self, symbol: str, price: float, size: float = 0, timestamp: float = 0) -> None:
+        """
+        Store one tick
+        
+        Args:
+            symbol: Ticker symbol
+            price: Trade or quote price
+            size: Trade size (0 for quotes without size)
+            timestamp: Unix timestamp of the tick
+        """
+        with self._lock:
+            row = self._index.get(symbol)
+            if row is None:
+                row = self._add_symbol(symbol)
+            
+            slot = self._head[row]
+            previous = (slot - 1) % self._slots
+            has_previous = self._count[row] > 0
+            
+            self._timestamps[row, slot] = timestamp
+            self._prices[row, slot] = price
+            self._sizes[row, slot] = size
+            self._cum_price[row, slot] = price + (self._cum_price[row, previous] if has_previous else 0.0)
+            self._cum_size[row, slot] = size + (self._cum_size[row, previous] if has_previous else 0.0)
+            self._cum_value[row, slot] = price * size + (self._cum_value[row, previous] if has_previous else 0.0)
+            
+            self._head[row] = (slot + 1) % self._slots
+            self._count[row] += 1
+    
+    def latest(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the most recent tick for a symbol
+        
+        Returns:
+            Dictionary with price, size and timestamp, or None if no ticks were received
+        """
+        with self._lock:
+            row = self._index.get(symbol)
+            if row is None or self._count[row] == 0:
+                return None
+            
+            slot = (self._head[row] - 1) % self._slots
+            return {
+                "symbol": symbol,
+                "price": float(self._prices[row, slot]),
+                "size": float(self._sizes[row, slot]),
+                "timestamp": float(self._timestamps[row, slot])
+            }
+    
+    def window(self, symbol: str, ticks: Optional[int] = None,
+               seconds: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Aggregate the most recent ticks for a symbol
+        
+        Args:
+            symbol: Ticker symbol
+            ticks: Number of most recent ticks to include
+            seconds: Include ticks within this many seconds of the latest tick
+        
+        Returns:
+            Dictionary with tick count, mean price, VWAP, volume and price change,
+            or None if no ticks were received
+        """
+        with self._lock:
+            row = self._index.get(symbol)
+            if row is None or self._count[row] == 0:
+                return None
+            
+            available = int(min(self._count[row], self.capacity))
+            last = (self._head[row] - 1) % self._slots
+            
+            size = available if ticks is None else max(1, min(ticks, available))
+            if seconds is not None:
+                size = min(size, self._ticks_since(row, available, self._timestamps[row, last] - seconds))
+            
+            first = (last - size + 1) % self._slots
+            before = (first - 1) % self._slots
+            # The slot before the window holds the totals to subtract, unless
+            # the window starts at the very first tick received
+            has_before = size < self._count[row]
+            
+            price_total = self._cum_price[row, last] - (self._cum_price[row, before] if has_before else 0.0)
+            size_total = self._cum_size[row, last] - (self._cum_size[row, before] if has_before else 0.0)
+            value_total = self._cum_value[row, last] - (self._cum_value[row, before] if has_before else 0.0)
+            
+            first_price = self._prices[row, first]
+            last_price = self._prices[row, last]
+            
+            return {
+                "symbol": symbol,
+                "ticks": size,
+                "mean_price": float(price_total / size),
+                "vwap": float(value_total / size_total) if size_total > 0 else None,
+                "volume": float(size_total),
+                "first_price": float(first_price),
+                "last_price": float(last_price),
+                "change_percent": round(float((last_price - first_price) / first_price * 100), 3) if first_price else None,
+                "start": float(self._timestamps[row, first]),
+                "end": float(self._timestamps[row, last])
+            }
+    
+    def snapshot(self, symbol: str) -> Dict[str, np.ndarray]:
+        """
+        Copy a symbol's stored ticks in arrival order
+        
+        Returns:
+            Dictionary of timestamp, price and size arrays
+        """
+        with self._lock:
+            row = self._index.get(symbol)
+            if row is None:
+                return {"timestamp": np.zeros(0), "price": np.zeros(0), "size": np.zeros(0)}
+            
+            order = self._ordered_slots(row)
+            return {
+                "timestamp": self._timestamps[row, order].copy(),
+                "price": self._prices[row, order].copy(),
+                "size": self._sizes[row, order].copy()
+            }
+    
+    def _add_symbol(self, symbol: str) -> int:
+        """Grow the buffers by one row for a new symbol (lock must be held)"""
+        if symbol in self._index:
+            return self._index[symbol]
+        
+        row = len(self._index)
+        self._index[symbol] = row
+        empty = np.zeros((1, self._slots))
+        for name in ("_timestamps", "_prices", "_sizes", "_cum_price", "_cum_size", "_cum_value"):
+            setattr(self, name, np.vstack([getattr(self, name), empty]))
+        self._head = np.append(self._head, 0)
+        self._count = np.append(self._count, 0)
+        return row
+    
+    def _ordered_slots(self, row: int) -> np.ndarray:
+        """Slots of a symbol's stored ticks, oldest first"""
+        available = int(min(self._count[row], self.capacity))
+        return (self._head[row] - available + np.arange(available)) % self._slots
+    
+    def _ticks_since(self, row: int, available: int, cutoff: float) -> int:
+        """Number of stored ticks with a timestamp at or after cutoff"""
+        # Binary search over the ring in arrival order
+        oldest = self._head[row] - available
+        low, high = 0, available
+        while low < high:
+            middle = (low + high) // 2
+            if self._timestamps[row, (oldest + middle) % self._slots] < cutoff:
+                low = middle + 1
+            else:
+                high = middle
+        return available - low
@@ -0,0 +1,283 @@
+"""
+Screening Table - Columnar cross-sectional financial metrics for screening tickers
+"""
+import logging
+import os
+import time
+from typing import List, Dict, Any, Optional, Tuple, Union
+import numpy as np
+
+from ..utils.ranking import average_ranks
+
+logger = logging.getLogger(__name__)
+
+class ScreeningTable:
+    """
+    Cross-sectional table of financial metrics, one row per ticker
+    
+    Metrics are stored as a single float matrix (tickers x metrics) with NaN
+    for missing values, so filters, rankings and percentiles are vectorized
+    over whole columns. Updating a ticker overwrites its row in place; the
+    matrix grows by doubling when it runs out of rows.
+    """
+    
+    # Metric name -> (section, key) in get_financial_metrics results
+    METRICS = {
+        "pe_ratio": ("financial_ratios", "pe_ratio"),
+        "price_to_sales": ("financial_ratios", "price_to_sales"),
+        "price_to_book": ("financial_ratios", "price_to_book"),
+        "debt_to_equity": ("financial_ratios", "debt_to_equity"),
+        "current_ratio": ("financial_ratios", "current_ratio"),
+        "roe": ("financial_ratios", "roe"),
+        "roa": ("financial_ratios", "roa"),
+        "revenue_billions": ("revenue", "annual_revenue_billions"),
+        "revenue_growth_yoy": ("revenue", "revenue_growth_yoy"),
+        "profit_margin": ("profitability", "profit_margin"),
+        "operating_margin": ("profitability", "operating_margin"),
+        "gross_margin": ("profitability", "gross_margin"),
+        "free_cash_flow_billions": ("cash_flow", "free_cash_flow_billions"),
+        "ev_to_ebitda": ("valuation", "ev_to_ebitda")
+    }
+    
+    def __init__(self, path: Optional[str] = None, capacity: int = 1024):
+        """
+        Initialize the screening table
+        
+        Args:
+            path: Optional .npz file the table is loaded from and saved to
+            capacity: Number of rows to preallocate
+        """
+        self.path = path
+        self.metrics = list(self.METRICS)
+        self._column = {metric: code for code, metric in enumerate(self.metrics)}
+        
+        self.tickers: List[str] = []
+        self._row: Dict[str, int] = {}
+        self._values = np.full((max(1, capacity), len(self.metrics)), np.nan)
+        self._updated = np.zeros(max(1, capacity))
+        
+        if path and os.path.exists(path):
+            self.load()
+    
+    def __len__(self) -> int:
+        return len(self.tickers)
+    
+    def __contains__(self, ticker: str) -> bool:
+        return ticker.upper() in self._row
+    
+    def update(self, ticker: str, financials: Dict[str, Any], updated_at: Optional[float] = None) -> None:
+        """
+        Set a ticker's row from its financial metrics
+        
+        Args:
+            ticker: Company stock ticker symbol
+            financials: Result of get_financial_metrics for the ticker
+            updated_at: Unix time of the data (defaults to now)
+        """
+        row = self._ensure_row(ticker.upper())
+        
+        values = np.full(len(self.metrics), np.nan)
+        for code, (section, key) in enumerate(self.METRICS.values()):
+            value = financials.get(section, {}).get(key)
+            if isinstance(value, (int, float)):
+                values[code] = value
+        
+        self._values[row] = values
+        self._updated[row] = time.time() if updated_at is None else updated_at
+    
+    def remove(self, ticker: str) -> None:
+        """Remove a ticker's row, moving the last row into its place"""
+        row = self._row.pop(ticker.upper(), None)
+        if row is None:
+            return
+        
+        last = len(self.tickers) - 1
+        if row != last:
+            moved = self.tickers[last]
+            self.tickers[row] = moved
+            self._row[moved] = row
+            self._values[row] = self._values[last]
+            self._updated[row] = self._updated[last]
+        
+        self.tickers.pop()
+        self._values[last] = np.nan
+        self._updated[last] = 0.0
+    
+    def stale(self, tickers: List[str], max_age: float) -> List[str]:
+        """
+        Get the tickers that are missing or older than max_age seconds
+        
+        Args:
+            tickers: Tickers to check
+            max_age: Maximum age of a row in seconds
+        
+        Returns:
+            Tickers that need refreshing, in the given order
+        """
+        cutoff = time.time() - max_age
+        return [ticker for ticker in tickers
+                if self._row.get(ticker.upper()) is None or self._updated[self._row[ticker.upper()]] < cutoff]
+    
+    def column(self, metric: str) -> np.ndarray:
+        """Get a metric's values for all tickers, in the order of self.tickers"""
+        return self._values[:len(self.tickers), self._column[metric]]
+    
+    def percentiles(self, metric: str, ascending: bool = True) -> np.ndarray:
+        """
+        Get each ticker's percentile score (0-100) on a metric
+        
+        Tied values share their average rank; missing values get NaN.
+        
+        Args:
+            metric: Metric to score
+            ascending: Whether higher values score higher (False for e.g. P/E)
+        
+        Returns:
+            Scores in the order of self.tickers
+        """
+        values = self.column(metric)
+        if not ascending:
+            values = -values
+        
+        scores = np.full(len(values), np.nan)
+        present = np.flatnonzero(~np.isnan(values))
+        if len(present) == 1:
+            scores[present] = 100.0
+        elif len(present) > 1:
+            scores[present] = (average_ranks(values[present]) - 1) / (len(present) - 1) * 100
+        return scores
+    
+    def screen(self, filters: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None,
+               rank_by: Optional[Union[str, Dict[str, float]]] = None, ascending: bool = False,
+               limit: Optional[int] = None, tickers: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Screen tickers by metric ranges and rank the matches
+        
+        Args:
+            filters: Dictionary mapping metrics to (minimum, maximum) bounds,
+                     inclusive; None leaves a side open. Tickers missing a
+                     filtered metric never match.
+            rank_by: Metric to sort by, or dictionary mapping metrics to weights
+                     for a composite percentile score (negative weights favour
+                     lower values)
+            ascending: Sort order for rank_by
+            limit: Maximum number of results
+            tickers: Optional universe to restrict the screen to
+        
+        Returns:
+            List of matching tickers with their metrics and, when ranking, their score
+        """
+        count = len(self.tickers)
+        mask = np.ones(count, dtype=bool)
+        
+        if tickers is not None:
+            universe = np.zeros(count, dtype=bool)
+            rows = [self._row[t.upper()] for t in tickers if t.upper() in self._row]
+            universe[rows] = True
+            mask &= universe
+        
+        with np.errstate(invalid='ignore'):
+            for metric, (minimum, maximum) in (filters or {}).items():
+                values = self.column(metric)
+                mask &= ~np.isnan(values)
+                if minimum is not None:
+                    mask &= values >= minimum
+                if maximum is not None:
+                    mask &= values <= maximum
+        
+        rows = np.flatnonzero(mask)
+        scores = None
+        if isinstance(rank_by, dict):
+            scores = self._composite_score(rank_by)
+        elif rank_by:
+            scores = self.column(rank_by)
+        
+        if scores is not None:
+            # Missing scores sort last in either direction
+            keys = scores[rows] if ascending else -scores[rows]
+            rows = rows[np.argsort(np.where(np.isnan(keys), np.inf, keys), kind='stable')]
+        if limit is not None:
+            rows = rows[:limit]
+        
+        # Convert the selected rows in one go; NaN (missing) becomes None
+        selected = self._values[rows]
+        values = np.where(np.isnan(selected), None, selected).tolist()
+        if scores is not None:
+            selected_scores = np.round(scores[rows], 3)
+            row_scores = np.where(np.isnan(selected_scores), None, selected_scores).tolist()
+        
+        results = []
+        for i, row in enumerate(rows):
+            result = {"ticker": self.tickers[row], **dict(zip(self.metrics, values[i]))}
+            if scores is not None:
+                result["score"] = row_scores[i]
+            results.append(result)
+        return results
+    
+    def load(self) -> None:
+        """Load the table from path"""
+        try:
+            with np.load(self.path) as data:
+                tickers = [str(ticker) for ticker in data["tickers"]]
+                metrics = [str(metric) for metric in data["metrics"]]
+                values = data["values"]
+                updated = data["updated"]
+        except Exception as e:
+            logger.error(f"Error loading screening table: {e}")
+            return
+        
+        self.tickers = []
+        self._row = {}
+        self._values = np.full((max(len(tickers), len(self._updated)), len(self.metrics)), np.nan)
+        self._updated = np.zeros(len(self._values))
+        
+        # Map saved columns by name, so added or removed metrics load cleanly
+        for ticker in tickers:
+            self._ensure_row(ticker)
+        for saved, metric in enumerate(metrics):
+            if metric in self._column:
+                self._values[:len(tickers), self._column[metric]] = values[:, saved]
+        self._updated[:len(tickers)] = updated
+    
+    def save(self) -> None:
+        """Save the table to path"""
+        if not self.path:
+            return
+        
+        count = len(self.tickers)
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            # Write through a file object so numpy doesn't append another .npz suffix
+            with open(self.path, 'wb') as f:
+                np.savez(f, tickers=np.array(self.tickers, dtype=str), metrics=np.array(self.metrics, dtype=str),
+                         values=self._values[:count], updated=self._updated[:count])
+        except Exception as e:
+            logger.error(f"Error saving screening table: {e}")
+    
+    def _ensure_row(self, ticker: str) -> int:
+        """Get a ticker's row, appending one (and growing the matrix) if needed"""
+        row = self._row.get(ticker)
+        if row is not None:
+            return row
+        
+        row = len(self.tickers)
+        if row == len(self._values):
+            self._values = np.vstack([self._values, np.full_like(self._values, np.nan)])
+            self._updated = np.concatenate([self._updated, np.zeros_like(self._updated)])
+        
+        self.tickers.append(ticker)
+        self._row[ticker] = row
+        return row
+    
+    def _composite_score(self, weights: Dict[str, float]) -> np.ndarray:
+        """Weighted mean of percentile scores, ignoring metrics a ticker is missing"""
+        total = np.zeros(len(self.tickers))
+        weight_sum = np.zeros(len(self.tickers))
+        for metric, weight in weights.items():
+            scores = self.percentiles(metric, ascending=weight >= 0)
+            present = ~np.isnan(scores)
+            total[present] += abs(weight) * scores[present]
+            weight_sum[present] += abs(weight)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(weight_sum > 0, total / weight_sum, np.nan)
@@ -0,0 +1,107 @@
+"""
+Annotations - Copy-on-write views for attaching analysis results to records
+"""
+from collections.abc import Mapping, MutableMapping
+from typing import Dict, Any, Iterator, Optional
+
+# Marks a base field deleted from a view
+_DELETED = object()
+
+
+class AnnotatedItem(MutableMapping):
+    """
+    Copy-on-write view of a record with annotation fields layered on top
+    
+    Pipeline stages attach fields such as market_impact or sentiment to the
+    annotation layer instead of copying the whole record. Lookups check the
+    annotations first and fall back to the shared base record, which is never
+    modified: writes go to the annotation layer, and deleting a base field
+    only hides it in this view.
+    
+    A view supports the full MutableMapping interface (get, items, update,
+    pop, ...), but it is not a dict: isinstance(item, dict) is False. Check
+    for Mapping instead, and call to_dict() before handing the record to
+    code that needs a real dict (json.dump can use to_serializable).
+    """
+    
+    __slots__ = ("base", "annotations")
+    
+    def __init__(self, base: Mapping, annotations: Optional[Dict[str, Any]] = None):
+        """
+        Create an annotated view of a record
+        
+        Args:
+            base: Record to annotate (shared, not copied)
+            annotations: Fields to attach to the record
+        """
+        # Annotating a view adds to its layer rather than stacking views
+        if isinstance(base, AnnotatedItem):
+            annotations = {**base.annotations, **(annotations or {})}
+            base = base.base
+        
+        self.base = base
+        self.annotations = annotations if annotations is not None else {}
+    
+    def __getitem__(self, key: str) -> Any:
+        if key in self.annotations:
+            value = self.annotations[key]
+            if value is _DELETED:
+                raise KeyError(key)
+            return value
+        return self.base[key]
+    
+    def __setitem__(self, key: str, value: Any) -> None:
+        # Writes go to the annotation layer so the base record stays shared
+        self.annotations[key] = value
+    
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        if key in self.base:
+            self.annotations[key] = _DELETED
+        else:
+            del self.annotations[key]
+    
+    def __iter__(self) -> Iterator[str]:
+        # Same key order as a copy of the base record updated with the annotations
+        for key in self.base:
+            if self.annotations.get(key, key) is not _DELETED:
+                yield key
+        for key in self.annotations:
+            if key not in self.base:
+                yield key
+    
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+    
+    def __repr__(self) -> str:
+        return f"AnnotatedItem({self.to_dict()!r})"
+    
+    def copy(self) -> 'AnnotatedItem':
+        """Copy the annotation layer, still sharing the base record"""
+        return AnnotatedItem(self.base, dict(self.annotations))
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Materialize the view as a plain dictionary"""
+        return {key: self[key] for key in self}
+
+
+def annotate(item: Mapping, **annotations: Any) -> AnnotatedItem:
+    """
+    Attach annotation fields to a record without copying it
+    
+    Args:
+        item: Record to annotate
+        **annotations: Fields to attach
+        
+    Returns:
+        Annotated view of the record
+    """
+    return AnnotatedItem(item, annotations)
+
+
+def to_serializable(obj: Any) -> Any:
+    """json.dump default hook that materializes annotated views"""
+    if isinstance(obj, AnnotatedItem):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
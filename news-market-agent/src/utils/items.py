@@ -0,0 +1,88 @@
+"""
+Item Utilities - Helpers shared by components that handle news items
+"""
+from typing import Dict, Any, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+
+def item_key(item: Dict[str, Any], fallback: Optional[Any] = None) -> str:
+    """
+    Get a stable key identifying a news item across sources
+    
+    IDs are only unique within a source (HackerNews IDs are integers, Reddit
+    IDs are base-36 strings), so the source is part of the key.
+    
+    Args:
+        item: News item
+        fallback: Value to use when the item has neither an ID nor a URL (e.g. its position)
+        
+    Returns:
+        Key of the form "<source>:<id>"
+    """
+    source = item.get('source', 'unknown')
+    
+    if item.get('id') is not None:
+        return f"{source}:{item['id']}"
+    if item.get('url'):
+        return f"{source}:{item['url']}"
+    return f"{source}:#{fallback}"
+
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = ("utm_source", "utm_medium", "utm_campaign", "utm_term", "utm_content",
+                   "fbclid", "gclid", "mc_cid", "mc_eid", "ref", "ref_src", "cmpid")
+
+
+def canonical_url(url: str) -> str:
+    """
+    Normalize a URL so that links to the same article compare equal
+    
+    Lowercases the scheme and host, drops "www.", default ports, fragments,
+    tracking parameters and trailing slashes, and sorts the remaining query
+    parameters.
+    
+    Args:
+        url: URL to normalize
+        
+    Returns:
+        Canonical form of the URL
+    """
+    parts = urlsplit(url.strip())
+    scheme = (parts.scheme or "http").lower()
+    if scheme == "http":
+        # Treat http and https links to the same page as the same article
+        scheme = "https"
+    
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS
+    ))
+    path = parts.path.rstrip("/") or "/"
+    
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+def article_key(item: Dict[str, Any], fallback: Optional[Any] = None) -> str:
+    """
+    Get a key identifying an article regardless of where it was found
+    
+    Articles are keyed by canonical URL when they have one, so the same
+    article listed for several tickers or sources gets one key. Otherwise
+    the item key is used.
+    
+    Args:
+        item: News item
+        fallback: Value to use when the item has neither an ID nor a URL
+        
+    Returns:
+        Key of the form "url:<canonical url>" or "<source>:<id>"
+    """
+    if item.get('url'):
+        return f"url:{canonical_url(item['url'])}"
+    return item_key(item, fallback)
@@ -0,0 +1,103 @@
+"""
+Keyword Matcher - Compiled whole-word matching of keyword sets
+"""
+import re
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Iterable, Tuple
+
+# Shared matchers by (folded keyword set, case_sensitive), least recently used first
+_MAX_MATCHERS = 256
+_matchers: "OrderedDict[Tuple[Tuple[str, ...], bool], KeywordMatcher]" = OrderedDict()
+_matchers_lock = threading.Lock()
+
+
+class KeywordMatcher:
+    """
+    Matches any of a set of keywords as whole words in one regex pass
+    
+    The keywords are compiled into a single alternation (longest first)
+    bounded by non-word lookarounds, so "ai" matches "AI chips" but not
+    "said", and keywords starting or ending in punctuation ("C++") still
+    work. Use get_matcher() to share compiled matchers between call sites.
+    """
+    
+    def __init__(self, keywords: Iterable[str], case_sensitive: bool = False):
+        """
+        Compile a matcher
+        
+        Args:
+            keywords: Keywords or phrases to match
+            case_sensitive: Whether matching respects case
+        """
+        self.case_sensitive = case_sensitive
+        self.keywords: Tuple[str, ...] = tuple(dict.fromkeys(k.strip() for k in keywords if k and k.strip()))
+        
+        # Matched text -> keyword, for reporting which keyword matched
+        self._lookup = {self._fold(keyword): keyword for keyword in self.keywords}
+        
+        alternation = "|".join(re.escape(keyword) for keyword in sorted(self.keywords, key=len, reverse=True))
+        flags = 0 if case_sensitive else re.IGNORECASE
+        self._pattern = re.compile(f"(?<!\\w)(?:{alternation})(?!\\w)", flags) if self.keywords else None
+    
+    def matches(self, text: Optional[str]) -> bool:
+        """Check whether a text contains any of the keywords"""
+        return bool(self._pattern and text and self._pattern.search(text))
+    
+    def find(self, text: Optional[str]) -> List[Tuple[str, int]]:
+        """
+        Find all keyword occurrences in a text
+        
+        Args:
+            text: Text to search
+        
+        Returns:
+            (keyword, start offset) pairs, in text order
+        """
+        if not self._pattern or not text:
+            return []
+        return [(self._lookup.get(self._fold(match.group()), match.group()), match.start())
+                for match in self._pattern.finditer(text)]
+    
+    def _fold(self, text: str) -> str:
+        return text if self.case_sensitive else text.lower()
+
+
+def get_matcher(keywords: Optional[Iterable[str]], case_sensitive: bool = False) -> Optional[KeywordMatcher]:
+    """
+    Get the shared compiled matcher for a keyword set
+    
+    Matchers are cached per set of keywords (case-folded unless
+    case_sensitive), so filters applied to every item of every request
+    compile their pattern once. find() reports keywords as spelled by the
+    first call that built the matcher.
+    
+    Args:
+        keywords: Keywords or phrases to match (order and duplicates don't matter)
+        case_sensitive: Whether matching respects case
+    
+    Returns:
+        The matcher, or None if there are no keywords
+    """
+    if not keywords:
+        return None
+    
+    keywords = [keyword for keyword in keywords if keyword]
+    folded = tuple(sorted({keyword if case_sensitive else keyword.lower() for keyword in keywords}))
+    if not folded:
+        return None
+    
+    key = (folded, case_sensitive)
+    with _matchers_lock:
+        matcher = _matchers.get(key)
+        if matcher is not None:
+            _matchers.move_to_end(key)
+            return matcher
+    
+    # Built from the keywords as given, so find() reports their original spelling
+    matcher = KeywordMatcher(sorted(keywords), case_sensitive)
+    with _matchers_lock:
+        matcher = _matchers.setdefault(key, matcher)
+        if len(_matchers) > _MAX_MATCHERS:
+            _matchers.popitem(last=False)
+    return matcher
@@ -0,0 +1,30 @@
+"""
+Ranking - Rank helpers shared by the statistics modules
+"""
+import numpy as np
+
+
+def average_ranks(values: np.ndarray) -> np.ndarray:
+    """
+    Rank values from 1, giving tied values their average rank
+    
+    Equivalent to scipy.stats.rankdata(values, method='average').
+    
+    Args:
+        values: One-dimensional array of values
+    
+    Returns:
+        Array of ranks in the order of values
+    """
+    order = np.argsort(values, kind='mergesort')
+    sorted_values = values[order]
+    
+    # Average the ordinal ranks within each run of equal values
+    boundaries = np.concatenate([[True], sorted_values[1:] != sorted_values[:-1]])
+    group = np.cumsum(boundaries) - 1
+    ordinal = np.arange(1, len(values) + 1)
+    average = np.bincount(group, weights=ordinal) / np.bincount(group)
+    
+    ranks = np.empty(len(values))
+    ranks[order] = average[group]
+    return ranks
@@ -0,0 +1,96 @@
+"""
+Stream Utilities - Merge item streams from several sources
+"""
+import heapq
+import logging
+import queue
+import threading
+import time
+from typing import List, Dict, Any, Optional, Iterable, Callable
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of a source on the queue
+_DONE = object()
+
+
+def merge_top_k(sources: List[Iterable[Dict[str, Any]]], k: int,
+                key: Callable[[Dict[str, Any]], float], timeout: Optional[float] = None,
+                buffer_size: int = 64) -> List[Dict[str, Any]]:
+    """
+    Keep the k highest-ranked items of several sources as they arrive
+    
+    Each source is consumed by its own thread, so slow sources overlap, and
+    feeds a bounded queue. A min-heap of size k holds the best items so far,
+    so memory stays bounded by k and buffer_size however much the sources
+    yield. Ties are broken by source order, then by position within the
+    source, like a stable sort of the concatenated sources.
+    
+    Args:
+        sources: Iterables of items (e.g. generators fetching from an API)
+        k: Maximum number of items to keep
+        key: Function returning an item's rank (higher is better)
+        timeout: Optional seconds after which the items received so far are
+                 ranked and the remaining sources are abandoned
+        buffer_size: Maximum number of items waiting on the queue
+    
+    Returns:
+        Up to k items, highest ranked first
+    """
+    if k <= 0 or not sources:
+        return []
+    
+    items: queue.Queue = queue.Queue(maxsize=buffer_size)
+    stop = threading.Event()
+    
+    def put(entry: tuple) -> bool:
+        # Wait for room on the queue, unless the merge was abandoned
+        while not stop.is_set():
+            try:
+                items.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def feed(index: int, source: Iterable[Dict[str, Any]]) -> None:
+        try:
+            for position, item in enumerate(source):
+                if not put((index, position, item)):
+                    return
+        except Exception as e:
+            logger.error(f"Error reading source {index}: {e}")
+        put((index, None, _DONE))
+    
+    for index, source in enumerate(sources):
+        threading.Thread(target=feed, args=(index, source), name=f"merge-source-{index}", daemon=True).start()
+    
+    # Entries are (rank, -source index, -position, item); the first three are unique
+    heap: List[tuple] = []
+    remaining = len(sources)
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    
+    try:
+        while remaining:
+            wait = None if deadline is None else deadline - time.monotonic()
+            try:
+                if wait is not None and wait <= 0:
+                    raise queue.Empty
+                index, position, item = items.get(timeout=wait)
+            except queue.Empty:
+                logger.warning(f"Merge timed out with {remaining} sources still running")
+                break
+            
+            if item is _DONE:
+                remaining -= 1
+                continue
+            
+            entry = (key(item), -index, -position, item)
+            if len(heap) < k:
+                heapq.heappush(heap, entry)
+            elif entry[:3] > heap[0][:3]:
+                heapq.heapreplace(heap, entry)
+    finally:
+        stop.set()
+    
+    return [entry[3] for entry in sorted(heap, key=lambda entry: entry[:3], reverse=True)]
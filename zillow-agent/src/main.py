@@ -16,6 +16,7 @@ from dotenv import load_dotenv
 from interfaces.zillow_interface import ZillowInterface
 from interfaces.weather_interface import WeatherInterface
 from processors.property_processor import PropertyProcessor
+from utils.annotations import to_serializable
 
 # Load environment variables
 load_dotenv()
@@ -238,7 +239,7 @@ class ZillowAgent:
         try:
             filepath = os.path.join(self.output_dir, filename)
             with open(filepath, 'w') as f:
-                json.dump(results, f, indent=2)
+                json.dump(results, f, indent=2, default=to_serializable)
             logger.info(f"Results saved to {filepath}")
         except Exception as e:
             logger.error(f"Error saving results: {e}")
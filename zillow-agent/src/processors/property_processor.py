@@ -8,6 +8,7 @@ from datetime import datetime
 # Local imports
 from ..interfaces.zillow_interface import ZillowInterface
 from ..interfaces.weather_interface import WeatherInterface
+from ..utils.annotations import annotate
 
 logger = logging.getLogger(__name__)
 
@@ -140,19 +141,16 @@ class PropertyProcessor:
             appreciation_rate = market_trends.get('median_home_price', {}).get('yoy_change', 3) / 100
             estimated_5yr_value = price * (1 + appreciation_rate) ** 5
             
-            # Add analysis to property
-            property_with_analysis = property.copy()
-            property_with_analysis.update({
-                "investment_analysis": {
-                    "estimated_monthly_rent": int(estimated_rent),
-                    "annual_rental_income": int(annual_rental_income),
-                    "annual_expenses": int(annual_expenses),
-                    "net_annual_income": int(net_income),
-                    "cap_rate": round(cap_rate, 2),
-                    "estimated_5yr_value": int(estimated_5yr_value),
-                    "estimated_5yr_appreciation": round((estimated_5yr_value - price) / price * 100, 1),
-                    "investment_rating": self._get_investment_rating(cap_rate, appreciation_rate)
-                }
+            # Attach analysis to property without copying it
+            property_with_analysis = annotate(property, investment_analysis={
+                "estimated_monthly_rent": int(estimated_rent),
+                "annual_rental_income": int(annual_rental_income),
+                "annual_expenses": int(annual_expenses),
+                "net_annual_income": int(net_income),
+                "cap_rate": round(cap_rate, 2),
+                "estimated_5yr_value": int(estimated_5yr_value),
+                "estimated_5yr_appreciation": round((estimated_5yr_value - price) / price * 100, 1),
+                "investment_rating": self._get_investment_rating(cap_rate, appreciation_rate)
             })
             
             analyzed_properties.append(property_with_analysis)
@@ -244,12 +242,10 @@ class PropertyProcessor:
             elif 'property_type' in preferences:
                 match_details['property_type'] = "Exact match"
             
-            # Add match score to property
-            prop_with_score = prop.copy()
-            prop_with_score.update({
-                "match_score": max(0, round(score)),
-                "match_details": match_details
-            })
+            # Attach match score to property without copying it
+            prop_with_score = annotate(prop,
+                                       match_score=max(0, round(score)),
+                                       match_details=match_details)
             
             scored_properties.append(prop_with_score)
         